@@ -0,0 +1,181 @@
+# analytics/app/src/dashboard.py
+"""
+VisionDrive analytics dashboard.
+
+Reads only the small pre-aggregated documents in `analytics_rollups` (maintained
+incrementally by the backend's RollupService) and never aggregates the raw
+operational collections, so page loads do not compete with API queries.
+Drill-downs over raw prediction history use the Parquet snapshots written by
+the backend's export job (EXPORT_DIR), memory-mapped, instead of MongoDB.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pyarrow.parquet as pq
+import streamlit as st
+from dotenv import load_dotenv
+from pymongo import MongoClient
+from pymongo.read_preferences import SecondaryPreferred
+
+load_dotenv()
+
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/visiondrive")
+ROLLUP_COLLECTION = "analytics_rollups"
+CACHE_TTL_SEC = int(os.getenv("ROLLUP_CACHE_TTL_SEC", "60"))
+LOOKBACK = {"hour": timedelta(days=2), "day": timedelta(days=90)}
+EXPORT_DIR = os.getenv("EXPORT_DIR", "/app/exports")
+# Rollups tolerate lag; MongoDB requires -1 (no bound) or >= 90
+MAX_STALENESS_SEC = int(os.getenv("MONGO_MAX_STALENESS_SEC", "90"))
+
+
+@st.cache_resource
+def get_collection():
+    """One pooled client per dashboard process, preferring secondaries."""
+    client = MongoClient(MONGO_URI, maxPoolSize=4, serverSelectionTimeoutMS=5000)
+    database = client.get_default_database()
+    return database.get_collection(
+        ROLLUP_COLLECTION,
+        read_preference=SecondaryPreferred(max_staleness=MAX_STALENESS_SEC),
+    )
+
+
+def _since(granularity: str) -> datetime:
+    """
+    Start of the lookback window, computed inside the cached loaders (not
+    passed in) so the cache key stays stable between reruns.
+    """
+    now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    return now - LOOKBACK[granularity]
+
+
+@st.cache_data(ttl=CACHE_TTL_SEC, show_spinner=False)
+def load_rollups(granularity: str) -> pd.DataFrame:
+    """
+    Cached rollup query; served by the (granularity, bucket_start) index.
+    """
+    since = _since(granularity)
+    cursor = get_collection().find(
+        {"granularity": granularity, "bucket_start": {"$gte": since}},
+        projection={"_id": 0, "granularity": 0, "updated_at": 0},
+        sort=[("bucket_start", 1)],
+    )
+    frame = pd.json_normalize(list(cursor))
+    if frame.empty:
+        return frame
+    frame = frame.set_index("bucket_start")
+    # Status counts are absolute and only written when they change: carry
+    # them forward (gaps before the first snapshot stay empty, not zero)
+    levels = [c for c in frame.columns if c.startswith("projects_by_status.")]
+    frame[levels] = frame[levels].ffill()
+    flows = frame.columns.difference(levels)
+    frame[flows] = frame[flows].fillna(0)
+    return frame
+
+
+@st.cache_data(ttl=CACHE_TTL_SEC, show_spinner=False)
+def load_project_totals() -> pd.Series:
+    """Current projects per status (the single `totals` rollup document)."""
+    totals = get_collection().find_one(
+        {"_id": "totals"}, projection={"projects_by_status": 1}
+    )
+    return pd.Series((totals or {}).get("projects_by_status") or {}, dtype="int64")
+
+
+@st.cache_data(ttl=CACHE_TTL_SEC, show_spinner=False)
+def load_prediction_snapshot(granularity: str) -> pd.DataFrame:
+    """
+    Per-vehicle daily stats from the predictions snapshot; only the needed
+    columns and date partitions are read (memory-mapped).
+    """
+    since = _since(granularity)
+    path = os.path.join(EXPORT_DIR, "predictions")
+    if not os.path.isdir(path):
+        return pd.DataFrame()
+    table = pq.read_table(
+        path,
+        columns=["date", "vehicle_id", "score", "prediction"],
+        filters=[("date", ">=", f"{since:%Y-%m-%d}")],
+        memory_map=True,
+        partitioning="hive",
+    )
+    frame = table.to_pandas()
+    if frame.empty:
+        return frame
+    frame["high"] = frame["prediction"] == "high"
+    return frame.groupby(["vehicle_id", "date"], observed=True).agg(
+        predictions=("score", "size"),
+        score_sum=("score", "sum"),
+        high=("high", "sum"),
+    )
+
+
+def _columns(frame: pd.DataFrame, prefix: str) -> pd.DataFrame:
+    columns = [c for c in frame.columns if c.startswith(prefix + ".")]
+    return frame[columns].rename(columns=lambda c: c[len(prefix) + 1 :])
+
+
+def main():
+    st.set_page_config(page_title="VisionDrive Analytics", layout="wide")
+    st.title("VisionDrive Analytics")
+
+    granularity = st.sidebar.radio("Granularity", ["hour", "day"], index=1)
+    if st.sidebar.button("Refresh now"):
+        load_rollups.clear()
+        load_project_totals.clear()
+
+    frame = load_rollups(granularity)
+    if frame.empty:
+        st.info("No rollups yet for this period.")
+        return
+
+    predictions = _columns(frame, "predictions")
+    alerts = _columns(frame, "alerts_sent")
+    total, col2, col3 = st.columns(3)
+    total.metric("Users created", int(frame.get("users_created", pd.Series()).sum()))
+    col2.metric("Predictions", int(predictions.get("total", pd.Series()).sum()))
+    col3.metric("Alerts sent", int(alerts.sum().sum()) if not alerts.empty else 0)
+
+    st.subheader("Users created")
+    if "users_created" in frame:
+        st.bar_chart(frame["users_created"])
+
+    st.subheader("Predictions")
+    st.line_chart(predictions.drop(columns=["total"], errors="ignore"))
+
+    st.subheader("Score distribution (deciles)")
+    histogram = _columns(frame, "score_histogram").sum()
+    histogram.index = [
+        f"{int(i) / 10:.1f}-{(int(i) + 1) / 10:.1f}" for i in histogram.index
+    ]
+    st.bar_chart(histogram.sort_index())
+
+    st.subheader("Projects by status")
+    st.bar_chart(load_project_totals())
+    st.line_chart(_columns(frame, "projects_by_status"))
+
+    st.subheader("Alerts sent by type")
+    st.bar_chart(alerts)
+
+    st.subheader("Riskiest vehicles (Parquet snapshot)")
+    vehicles = load_prediction_snapshot(granularity)
+    if vehicles.empty:
+        st.caption(f"No prediction snapshots in {EXPORT_DIR} yet.")
+    else:
+        totals = vehicles.groupby(level="vehicle_id").sum()
+        totals["mean_score"] = totals["score_sum"] / totals["predictions"]
+        totals["high_share"] = totals["high"] / totals["predictions"]
+        st.dataframe(
+            totals[["predictions", "mean_score", "high_share"]]
+            .sort_values("high_share", ascending=False)
+            .head(20)
+        )
+
+    st.caption(
+        f"Rollups cached for {CACHE_TTL_SEC}s; "
+        f"last loaded {datetime.utcnow():%Y-%m-%d %H:%M:%S} UTC."
+    )
+
+
+main()
@@ -1,13 +1,34 @@
 # backend/app/src/api/v1/admin.py (NEW FILE)
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+from core.config import settings
+from core.profiling import request_profiler
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
 from services.admin import admin_service
+from services.prediction_cache import prediction_cache
+from services.user import user_service
 
 router = APIRouter()
 
 
+class ProfilingConfig(BaseModel):
+    enabled: Optional[bool] = None
+    sample_rate: Optional[float] = Field(None, ge=0.0, le=1.0)
+
+
+class UserImportEntry(BaseModel):
+    email: str  # Validated per row, so one bad email does not reject the batch
+    username: Optional[str] = None
+    password: str
+
+
+class UserImport(BaseModel):
+    users: List[UserImportEntry] = Field(..., min_length=1, max_length=1000)
+
+
 # Dependency Placeholder for Admin Authorization (Simulating Role-Based Access)
 def require_admin_role():
     """Placeholder: Checks JWT token for 'admin' role."""
@@ -34,7 +55,9 @@ async def get_system_metrics():
     """
     Provides key operational metrics for system monitoring (Prometheus data simulation).
     """
-    return admin_service.get_operational_metrics()
+    metrics = admin_service.get_operational_metrics()
+    metrics["recycle_events"] = await admin_service.get_recycle_events()
+    return metrics
 
 
 @router.get("/tasks", tags=["Admin"], dependencies=[Depends(require_admin_role)])
@@ -46,6 +69,24 @@ async def get_active_tasks():
     return {"current_time": datetime.utcnow(), "active_tasks": tasks}
 
 
+@router.post(
+    "/users/import", tags=["Admin"], dependencies=[Depends(require_admin_role)]
+)
+async def import_users(payload: UserImport):
+    """
+    Bulk registration for fleet onboarding. All rows are attempted; duplicates
+    and invalid rows are reported per row index instead of failing the batch.
+    """
+    report = await user_service.create_users_bulk(
+        [entry.model_dump() for entry in payload.users]
+    )
+    return {
+        "inserted_count": len(report["inserted"]),
+        "conflict_count": len(report["conflicts"]),
+        **report,
+    }
+
+
 @router.post(
     "/management/cache-clear",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -56,6 +97,48 @@ async def clear_system_cache():
     """
     Provides an API for operational management (e.g., clearing Redis cache).
     """
-    # NOTE: Actual Redis client logic would be implemented here.
-    # logger.info("Admin initiated cache flush.")
+    # Local entries only; shared Redis entries expire via PREDICTION_CACHE_TTL_SEC
+    prediction_cache.clear()
+    return
+
+
+@router.get("/profile", tags=["Admin"], dependencies=[Depends(require_admin_role)])
+async def get_request_profiles(format: str = "json", limit: int = 50):
+    """
+    Returns recent request profiles of this worker.
+    `format=folded` returns flamegraph-compatible folded stacks (weights in microseconds).
+    """
+    if format == "folded":
+        return PlainTextResponse(request_profiler.folded_stacks(limit))
+    return {
+        "enabled": request_profiler.enabled,
+        "sample_rate": request_profiler.sample_rate,
+        "header": settings.PROFILING_HEADER,
+        "profiles": request_profiler.get_profiles(limit),
+    }
+
+
+@router.post("/profile", tags=["Admin"], dependencies=[Depends(require_admin_role)])
+async def configure_request_profiling(config: ProfilingConfig):
+    """
+    Enables/disables profiling or changes the sample rate without redeploying.
+    """
+    request_profiler.configure(enabled=config.enabled, sample_rate=config.sample_rate)
+    return {
+        "enabled": request_profiler.enabled,
+        "sample_rate": request_profiler.sample_rate,
+    }
+
+
+@router.delete(
+    "/profile",
+    status_code=status.HTTP_204_NO_CONTENT,
+    tags=["Admin"],
+    dependencies=[Depends(require_admin_role)],
+)
+async def clear_request_profiles():
+    """
+    Discards collected profiles.
+    """
+    request_profiler.clear()
     return
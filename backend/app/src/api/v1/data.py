@@ -1,10 +1,12 @@
 # backend/app/src/api/v1/data.py (NEW FILE)
-from typing import Any, Dict, List
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 
+from core.conditional import etag_matches, not_modified, set_etag
 from db.models import (
     PydanticObjectId,
 )  # Use this type for MongoDB IDs in Pydantic models
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from pydantic import BaseModel, Field
 from services.data import data_service
 
@@ -64,9 +66,24 @@ async def create_new_project(
 
 
 @router.get("/projects", response_model=List[ProjectResponse])
-async def list_user_projects(owner_id: PydanticObjectId = Depends(get_current_user_id)):
-    """Retrieves all projects owned by the current user."""
-    return await data_service.get_projects_by_owner(owner_id)
+async def list_user_projects(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    owner_id: PydanticObjectId = Depends(get_current_user_id),
+):
+    """
+    Retrieves all projects owned by the current user.
+    Conditional: a matching If-None-Match gets a 304, checked against an
+    (_id, updated_at) projection without loading or serializing projects.
+    """
+    if if_none_match:
+        etag = await data_service.get_projects_etag(owner_id)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    projects = await data_service.get_projects_by_owner(owner_id)
+    set_etag(response, data_service.projects_etag(owner_id, projects))
+    return projects
 
 
 @router.patch("/projects/{project_id}", response_model=ProjectResponse)
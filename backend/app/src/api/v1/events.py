@@ -0,0 +1,64 @@
+# backend/app/src/api/v1/events.py
+import asyncio
+from typing import AsyncIterator, Optional
+
+from api.v1.data import get_current_user_id
+from core.config import settings
+from db.models import PydanticObjectId
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+from services.change_feed import FeedUnavailable, change_feed
+
+router = APIRouter()
+
+
+async def _event_stream(
+    user_id: str, last_event_id: Optional[str]
+) -> AsyncIterator[bytes]:
+    # Subscribed inside the generator so `finally` always unsubscribes
+    subscription, backlog = change_feed.subscribe(user_id, last_event_id)
+    try:
+        yield f"retry: {settings.CHANGE_FEED_RETRY_MS}\n\n".encode()
+        for frame in backlog:
+            yield frame
+        while True:
+            try:
+                frame = await asyncio.wait_for(
+                    subscription.queue.get(), settings.CHANGE_FEED_HEARTBEAT_SEC
+                )
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if frame is None:
+                return  # Slow consumer or shutdown: the client reconnects
+            yield frame
+    finally:
+        change_feed.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def stream_changes(
+    last_event_id: Optional[str] = Header(None),
+    user_id: PydanticObjectId = Depends(get_current_user_id),
+):
+    """
+    Server-Sent Events of the current user's project changes (`project`) and
+    new alerts (`alert`), replacing polling of GET /data/projects. Browsers
+    reconnect with Last-Event-ID and receive the events they missed when
+    the serving worker still has them; otherwise (another or a freshly
+    recycled worker) a `resync` event asks the client to refetch once.
+    503 when this deployment cannot stream (clients fall back to polling).
+    """
+    try:
+        change_feed.ensure_available()
+    except FeedUnavailable as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "30"},
+        )
+    return StreamingResponse(
+        _event_stream(str(user_id), last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,10 +1,22 @@
 # backend/app/src/api/v1/ml.py
-from typing import List
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, status
+from core.config import settings
+from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel
+from services.alerts import alert_engine
+from services.executor import (
+    InferenceOverloaded,
+    InferenceTimeout,
+    inference_executor,
+)
+from services.features import feature_engine
 from services.ml import ml_service
+from services.prediction_cache import content_hash, prediction_cache
+from services.rollup import rollup_service
 from services.task import task_service
+from services.telemetry import telemetry_service
 
 router = APIRouter()
 
@@ -12,6 +24,59 @@ router = APIRouter()
 class PredictionInput(BaseModel):
     features: List[float]
     metadata: str = ""
+    vehicle_id: Optional[str] = None  # Enables prediction history for the vehicle
+    user_id: Optional[str] = None
+    # Per-frame driver signals (see services.features.SIGNALS); with a session_id
+    # they are folded into rolling windows whose features are fed to the model
+    session_id: Optional[str] = None
+    signals: Optional[Dict[str, float]] = None
+    timestamp: Optional[float] = None  # Frame capture time (epoch seconds)
+
+
+def _is_retry_key(input: PredictionInput) -> bool:
+    """
+    A client timestamp on an identified frame makes a repeated submission a
+    retry of the same frame, which must not be recorded or alerted twice.
+    """
+    return input.timestamp is not None and bool(
+        input.vehicle_id or input.user_id or input.session_id
+    )
+
+
+def _frame_time(input: PredictionInput) -> Optional[datetime]:
+    """The frame's capture time for telemetry (None if absent or out of range)."""
+    if input.timestamp is None:
+        return None
+    try:
+        return datetime.utcfromtimestamp(input.timestamp)
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+def _cache_digest(input: PredictionInput) -> Optional[str]:
+    """
+    Memoization key for a request, or None when it must not be cached.
+    Stateful (session) frames are only cacheable as retries, since their model
+    input depends on the session window. Other requests are keyed by content
+    alone: the same reading from a vehicle reuses the inference result but is
+    still a new event for history, rollups and alert rules.
+    """
+    if not settings.PREDICTION_CACHE_ENABLED:
+        return None
+    if input.session_id and input.signals and input.timestamp is None:
+        return None
+    scope = ""
+    if _is_retry_key(input):
+        scope = "|".join(
+            [
+                input.vehicle_id or "",
+                input.user_id or "",
+                input.session_id or "",
+                repr(input.timestamp),
+                repr(sorted((input.signals or {}).items())),
+            ]
+        )
+    return content_hash(input.features, scope)
 
 
 @router.post("/predict", status_code=status.HTTP_200_OK)
@@ -20,8 +85,87 @@ async def predict_sync(input: PredictionInput):
     Synchronous endpoint for low-latency AI prediction requests.
     """
     # **API Layer** handling request validation (via Pydantic)
-    result = ml_service.get_prediction(input.model_dump())
-    return {"status": "success", "data": result}
+    model_version = ml_service.model_version
+    digest = _cache_digest(input)
+    cached = None
+    if digest is not None:
+        cached = await prediction_cache.get(model_version, digest)
+        if cached is not None and _is_retry_key(input):
+            # Retried frame: no feature ingestion, history or alerts again
+            return {"status": "success", "data": cached, "alerts": [], "cached": True}
+
+    payload = input.model_dump()
+    if input.session_id and input.signals:
+        payload["features"] = input.features + feature_engine.update(
+            input.session_id, input.signals, input.timestamp
+        )
+    if cached is not None:
+        result = cached  # Same input: only the inference is memoized
+    else:
+        try:
+            # CPU-bound: runs on the inference executor, not the event loop
+            result = await inference_executor.predict(payload)
+        except InferenceOverloaded as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": "1"},
+            )
+        except InferenceTimeout as e:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e)
+            )
+        if digest is not None:
+            await prediction_cache.put(model_version, digest, result)
+    rollup_service.record_prediction(result)
+    if input.vehicle_id:
+        # Buffered; persisted by the background writer
+        telemetry_service.record_prediction(
+            input.vehicle_id,
+            result,
+            user_id=input.user_id,
+            features=payload["features"],
+            ts=_frame_time(input),
+        )
+    alerts = []
+    if input.session_id or input.vehicle_id:
+        # In-memory rule evaluation; only fired alerts reach the task queue
+        alerts = await alert_engine.process(
+            input.session_id or input.vehicle_id, input.user_id, result
+        )
+    return {"status": "success", "data": result, "alerts": alerts}
+
+
+@router.get("/history/{vehicle_id}", status_code=status.HTTP_200_OK)
+async def get_prediction_history(
+    vehicle_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(1000, le=10_000),
+):
+    """
+    Returns the prediction history of a vehicle (default: the last hour).
+    """
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(hours=1)
+    events = await telemetry_service.get_history(vehicle_id, start, end, limit)
+    return {"vehicle_id": vehicle_id, "count": len(events), "events": events}
+
+
+@router.get("/history/{vehicle_id}/timeline", status_code=status.HTTP_200_OK)
+async def get_prediction_timeline(
+    vehicle_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    unit: str = Query("minute", pattern="^(second|minute|hour|day)$"),
+):
+    """
+    Returns per-interval prediction counts and score statistics (default: last 24h).
+    """
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=1)
+    timeline = await telemetry_service.get_timeline(vehicle_id, start, end, unit)
+    return {"vehicle_id": vehicle_id, "unit": unit, "timeline": timeline}
 
 
 @router.post("/batch-job/{data_id}", status_code=status.HTTP_202_ACCEPTED)
@@ -18,7 +18,7 @@ async def send_notification(request: NotificationRequest):
     Triggers an asynchronous notification dispatch.
     Returns HTTP 202 Accepted (Data Flow Step 5).
     """
-    task_id = notification_service.send_user_alert(
+    task_id = await notification_service.create_alert(
         user_id=request.user_id, message=request.message, type=request.type
     )
 
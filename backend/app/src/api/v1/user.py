@@ -1,7 +1,10 @@
 # backend/app/src/api/v1/user.py
+from typing import Optional
+
 from beanie import PydanticObjectId  # To handle MongoDB IDs
+from core.conditional import etag_matches, not_modified, set_etag
 from db.models import User
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, Response, status
 from pydantic import BaseModel, EmailStr
 from services.user import user_service
 
@@ -28,13 +31,24 @@ class UserPreferencesUpdate(BaseModel):
 
 
 @router.get("/me", response_model=UserProfile)
-async def get_current_user():
-    """Retrieves the profile of the currently authenticated user (placeholder)."""
+async def get_current_user(
+    response: Response, if_none_match: Optional[str] = Header(None)
+):
+    """
+    Retrieves the profile of the currently authenticated user (placeholder).
+    Conditional: a matching If-None-Match gets a 304, checked against a
+    version projection without loading or serializing the profile.
+    """
     # NOTE: In a complete implementation, this user ID would come from JWT validation.
 
     # Hardcoded ID for demonstration (Replace with actual JWT dependency)
     placeholder_user_id = PydanticObjectId("ffffffffffffffffffffffff")
 
+    if if_none_match:
+        etag = await user_service.get_user_etag(placeholder_user_id)
+        if etag is not None and etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
     user = await user_service.get_user_by_id(placeholder_user_id)
 
     if not user:
@@ -42,11 +56,12 @@ async def get_current_user():
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
+    set_etag(response, user_service.user_etag(user))
     return user
 
 
 @router.patch("/me/preferences", response_model=UserProfile)
-async def update_user_preferences(prefs: UserPreferencesUpdate):
+async def update_user_preferences(prefs: UserPreferencesUpdate, response: Response):
     """Updates preferences for the current user."""
     # Hardcoded ID for demonstration
     placeholder_user_id = PydanticObjectId("ffffffffffffffffffffffff")
@@ -60,4 +75,5 @@ async def update_user_preferences(prefs: UserPreferencesUpdate):
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
+    set_etag(response, user_service.user_etag(updated_user))
     return updated_user
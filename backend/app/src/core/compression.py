@@ -0,0 +1,142 @@
+# backend/app/src/core/compression.py
+import asyncio
+import gzip
+from typing import List, Optional, Tuple
+
+from core.conditional import ENCODING_SUFFIXES
+from core.config import settings
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript")
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Picks br or gzip from an Accept-Encoding header (q=0 excludes)."""
+    accepted = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip()] = q
+    candidates = [("br", brotli is not None), ("gzip", True)]
+    best = None
+    for coding, available in candidates:
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if available and q > 0 and (best is None or q > best[1]):
+            best = (coding, q)
+    return best[0] if best else None
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing complete (single-message) responses of
+    compressible types once they reach COMPRESSION_MIN_BYTES. Streaming
+    responses (Server-Sent Events included) pass through untouched. Large
+    bodies are compressed in a worker thread to keep the event loop free.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for name, value in scope.get("headers", ()):
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+        coding = negotiate(accept) if accept else None
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                headers = _header_dict(message.get("headers", ()))
+                if not _compressible(headers):
+                    passthrough = True
+                    await send(message)
+                    return
+                message["headers"] = _with_vary(message.get("headers", ()))
+                if coding is None:
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message  # Held until the body is known
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            passthrough = True  # Only the first body message is considered
+            body = message.get("body", b"")
+            if message.get("more_body") or len(body) < settings.COMPRESSION_MIN_BYTES:
+                await send(start_message)
+                await send(message)
+                return
+            if len(body) >= settings.COMPRESSION_THREAD_MIN_BYTES:
+                body = await asyncio.to_thread(compress, body, coding)
+            else:
+                body = compress(body, coding)
+            start_message["headers"] = _encoded_headers(
+                start_message["headers"], coding, len(body)
+            )
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _header_dict(headers) -> dict:
+    return {name.lower(): value for name, value in headers}
+
+
+def _compressible(headers: dict) -> bool:
+    content_type = headers.get(b"content-type", b"").decode("latin-1")
+    return (
+        b"content-encoding" not in headers
+        and not content_type.startswith("text/event-stream")
+        and content_type.startswith(COMPRESSIBLE_TYPES)
+    )
+
+
+def _with_vary(headers) -> List[Tuple[bytes, bytes]]:
+    headers = list(headers)
+    for i, (name, value) in enumerate(headers):
+        if name.lower() == b"vary":
+            if b"accept-encoding" not in value.lower():
+                headers[i] = (name, value + b", Accept-Encoding")
+            return headers
+    return headers + [(b"vary", b"Accept-Encoding")]
+
+
+def _encoded_headers(headers, coding: str, length: int) -> List[Tuple[bytes, bytes]]:
+    suffix = ENCODING_SUFFIXES[0] if coding == "gzip" else ENCODING_SUFFIXES[1]
+    out = []
+    for name, value in headers:
+        lower = name.lower()
+        if lower == b"content-length":
+            value = str(length).encode()
+        elif lower == b"etag" and value.endswith(b'"'):
+            # The encoded bytes are a different representation
+            value = value[:-1] + suffix.encode() + b'"'
+        out.append((name, value))
+    if not any(name.lower() == b"content-length" for name, _ in out):
+        out.append((b"content-length", str(length).encode()))
+    return out + [(b"content-encoding", coding.encode())]
@@ -0,0 +1,53 @@
+# backend/app/src/core/conditional.py
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Response
+
+# core.compression appends these to the ETag of an encoded representation
+# (strong ETags must differ per encoding); they are ignored when matching
+ENCODING_SUFFIXES = ("-gzip", "-br")
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Strong ETag from the values a representation is derived from (ids,
+    version counters, update timestamps), not from the serialized body.
+    """
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(repr(part).encode())
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()}"'
+
+
+def _strip_encoding(tag: str) -> str:
+    for suffix in ENCODING_SUFFIXES:
+        if tag.endswith(suffix + '"'):
+            return tag[: -len(suffix) - 1] + '"'
+    return tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match evaluation (weak comparison, as RFC 9110 specifies)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(
+        _strip_encoding(tag[2:] if tag.startswith("W/") else tag) == etag
+        for tag in candidates
+    )
+
+
+def set_etag(response: Response, etag: str):
+    """Per-user representations: cacheable by the client, always revalidated."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
@@ -1,6 +1,7 @@
 # backend/app/src/core/config.py
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -10,23 +11,227 @@ class Settings(BaseSettings):
     ENV: str = "local"
     DEBUG: bool = True
 
+    # Logging Settings (see core.logger)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # json | text
+    LOG_QUEUE_SIZE: int = 10_000  # Records buffered for the writer thread
+    # Fraction of INFO/DEBUG records kept per logger (and its children), e.g.
+    # {"uvicorn.access": 0.1}; warnings and errors are never sampled
+    LOG_SAMPLING: Dict[str, float] = {}
+
     # Database Settings (MongoDB)
     MONGO_URI: str = "mongodb://localhost:27017/v13_db"
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 10  # Also the number of connections warmed up at boot
+    MONGO_MAX_IDLE_TIME_MS: int = 300_000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 2_000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5_000
+    MONGO_CONNECT_TIMEOUT_MS: int = 5_000
+    MONGO_READY_CACHE_SEC: float = 2.0  # Readiness ping result cache
+    MONGO_FAIL_FAST: bool = True  # Abort startup if MongoDB is unreachable
+    # Read preference per query class (see db.routing); secondaries need a
+    # replica set, e.g. mongodb://localhost:27017/v13_db?replicaSet=rs0
+    MONGO_READ_ROUTING: Dict[str, str] = {
+        "primary": "primary",  # Auth, read-after-write
+        "list": "secondaryPreferred",
+        "export": "secondaryPreferred",
+        "analytics": "secondaryPreferred",
+    }
+    MONGO_MAX_STALENESS_SEC: int = 90  # Secondary lag bound; -1 or >= 90
+    MONGO_CAUSAL_SESSIONS: bool = True  # Read-your-writes via causal sessions
 
     # Cache/Queue Settings (Redis)
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_MAX_CONNECTIONS: int = 50  # asyncio pool size for caching (per worker)
+    REDIS_SOCKET_TIMEOUT_SEC: float = 0.5  # Cache lookups must not stall requests
 
     # Security Settings
     JWT_SECRET_KEY: str = "super-secret-key"  # **Rotatable**
     ALGORITHM: str = "HS256"
+    # bcrypt threads per API worker; defaults to the cores split across
+    # ML_WEB_WORKERS so bulk onboarding cannot saturate the box
+    PASSWORD_HASH_WORKERS: Optional[int] = None
 
     # ML/Task Settings
-    ML_SERVICE_TIMEOUT_SEC: int = 10
+    ML_SERVICE_TIMEOUT_SEC: int = 10  # Queue wait + inference budget per request
+    ML_EXECUTOR_MODE: str = "thread"  # thread (GIL-releasing runtimes) | process
+    ML_EXECUTOR_WORKERS: int = 2  # Concurrent inferences per API worker
+    ML_EXECUTOR_MAX_QUEUE: int = 64  # Jobs allowed to wait beyond the workers
     TASK_MAX_RETRIES: int = 3
 
+    # Celery Message Settings (see tasks.worker and tasks.claim_check)
+    CELERY_SERIALIZER: str = "msgpack"  # Tasks and results; json still accepted
+    CELERY_RESULT_EXPIRES_SEC: int = 3600  # Stored results are deleted after this
+    CELERY_COMPRESS_MIN_BYTES: int = 16 * 1024  # zlib-compress larger messages
+    CELERY_CLAIM_CHECK_BYTES: int = 256 * 1024  # Larger inputs go by reference
+    CELERY_CLAIM_CHECK_TTL_SEC: int = 86_400  # Unreleased payloads expire
+
+    # Worker Memory Watchdog Settings (see services.watchdog); 0 disables a limit
+    WATCHDOG_ENABLED: bool = True  # API worker RSS sampler
+    WATCHDOG_INTERVAL_SEC: float = 10.0  # API worker RSS sampling period
+    WATCHDOG_API_MAX_RSS_MB: int = 1536  # API worker drains and is replaced above
+    WATCHDOG_SUSTAINED_SAMPLES: int = 3  # Consecutive samples over the ceiling
+    WATCHDOG_DRAIN_LOCK_SEC: int = 60  # One API worker drains at a time
+    WATCHDOG_WORKER_MAX_RSS_MB: int = 2048  # Celery child replaced after its task
+    WATCHDOG_WORKER_MAX_TASKS: int = 500  # Celery child replaced after N tasks
+    WATCHDOG_EVENTS_KEPT: int = 200  # Recycle events kept in Redis
+
+    # Inference Runtime Settings (see services.inference)
+    ML_BACKEND: str = "placeholder"  # placeholder | torchscript | onnx
+    ML_MODEL_PATH: Optional[str] = None  # e.g. /app/models/drowsiness.int8.onnx
+    ML_MODEL_VERSION: str = "v1.0"
+    # Per-process thread pools; by default the cores are split across all
+    # API workers and Celery children on the box to avoid oversubscription
+    ML_WEB_WORKERS: int = 4  # Keep in sync with gunicorn --workers
+    ML_CELERY_CONCURRENCY: int = 2  # Keep in sync with celery --concurrency
+    ML_INTRA_OP_THREADS: Optional[int] = None  # Overrides the computed budget
+    ML_INTER_OP_THREADS: int = 1
+
+    # Prediction Cache Settings (memoized inference, keyed by model version)
+    PREDICTION_CACHE_ENABLED: bool = True
+    PREDICTION_CACHE_SIZE: int = 50_000  # In-process LRU entries
+    PREDICTION_CACHE_REDIS: bool = False  # Share entries across workers via Redis
+    PREDICTION_CACHE_TTL_SEC: int = 600  # Redis entry expiry
+
+    # Dataset Ingestion Settings (see services.ingestion)
+    INGEST_CHUNK_BYTES: int = 8 * 1024 * 1024  # CSV bytes parsed per chunk
+    INGEST_MAX_PARALLEL_INSERTS: int = 4  # Concurrent insert_many batches
+
+    # Parquet Snapshot Export Settings (see services.export)
+    EXPORT_DIR: str = "/app/exports"  # Shared volume read by analytics/batch jobs
+    EXPORT_INTERVAL_SEC: int = 900  # Celery beat schedule
+    # Export only data older than this: must exceed the secondary staleness
+    # bound plus how far behind telemetry timestamps can be (validated below)
+    EXPORT_LAG_SEC: int = 180
+    EXPORT_BATCH_ROWS: int = 50_000  # Rows per cursor batch / file
+    EXPORT_COMPRESSION: str = "zstd"
+
+    # Analytics Rollup Settings
+    ROLLUP_FLUSH_INTERVAL_SEC: float = 5.0  # How often pending counters are written
+
+    # Telemetry Settings (prediction history)
+    TELEMETRY_BATCH_SIZE: int = 500  # Events per insert_many
+    TELEMETRY_FLUSH_INTERVAL_SEC: float = 1.0  # Max time an event waits in the buffer
+    TELEMETRY_MAX_BUFFER: int = 50_000  # Oldest events are dropped beyond this
+    TELEMETRY_MAX_CLOCK_SKEW_SEC: float = 30.0  # Client frame times trusted within
+    TELEMETRY_TTL_DAYS: int = 30
+    TELEMETRY_STORE_FEATURES: bool = False  # Persist raw feature vectors
+
+    # Feature Engine Settings (per-session sliding windows)
+    FEATURE_WINDOW_SEC: float = 30.0
+    FEATURE_WINDOW_CAPACITY: int = 300  # Max frames per window (e.g. 10 Hz x 30 s)
+    FEATURE_MAX_BLINKS: int = 64  # Max blink events kept per window
+    FEATURE_EAR_CLOSED_THRESHOLD: float = 0.2  # Eye aspect ratio below = closed
+    FEATURE_MAX_SESSIONS: int = 10_000
+    FEATURE_SESSION_IDLE_SEC: float = 300.0
+
+    # Alert Rule Settings (see services.alerts.AlertRule for the fields)
+    ALERT_RULES: List[Dict[str, Any]] = [
+        {
+            "name": "drowsiness_sustained",
+            "field": "prediction",
+            "op": "==",
+            "threshold": "high",
+            "consecutive": 3,
+            "cooldown_sec": 120.0,
+            "message": "Signs of drowsiness detected. Please consider a break.",
+        },
+        {
+            "name": "drowsiness_critical",
+            "field": "score",
+            "op": ">=",
+            "threshold": 0.85,
+            "cooldown_sec": 60.0,
+            "message": "Critical drowsiness risk. Pull over safely.",
+        },
+    ]
+    ALERT_SESSION_IDLE_SEC: float = 600.0
+    ALERT_PREFS_TTL_SEC: float = 300.0
+    ALERT_PREFS_CACHE_SIZE: int = 100_000
+
+    # Rate Limiting & Load Shedding Settings (see core.ratelimit)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "redis"  # redis (shared) | memory (per process)
+    # Token buckets per route prefix (most specific prefix wins); `rate` is
+    # tokens/second, `per` is "user" (JWT subject, else IP) or "ip"
+    RATE_LIMIT_RULES: List[Dict[str, Any]] = [
+        {
+            "name": "login",
+            "path": "/api/v1/auth/login",
+            "rate": 0.2,
+            "burst": 5,
+            "per": "ip",
+        },
+        {
+            "name": "register",
+            "path": "/api/v1/auth/register",
+            "rate": 0.1,
+            "burst": 3,
+            "per": "ip",
+        },
+        {"name": "predict", "path": "/api/v1/ml/predict", "rate": 30, "burst": 60},
+        {"name": "api", "path": "/api/", "rate": 20, "burst": 40},
+    ]
+    RATE_LIMIT_DENY_CACHE_SIZE: int = 100_000  # Locally cached denials
+    RATE_LIMIT_MEMORY_BUCKETS: int = 100_000  # Per-process buckets (LRU-evicted)
+    SHED_MAX_IN_FLIGHT: int = 256  # Concurrent requests per worker before 503
+    SHED_MAX_LOOP_LAG_MS: float = 250.0  # Event-loop lag before 503
+    SHED_LAG_INTERVAL_MS: float = 100.0  # Lag probe period
+    SHED_EXEMPT_PATHS: List[str] = ["/health"]
+    # Long-lived streams: limited when opened, not counted as in flight after
+    SHED_LONG_LIVED_PATHS: List[str] = ["/api/v1/events/"]
+
+    # Change Feed Settings (SSE push of project/alert changes, see services.change_feed)
+    CHANGE_FEED_ENABLED: bool = True  # Needs a replica set (change streams)
+    CHANGE_FEED_QUEUE_SIZE: int = 100  # Pending events before a slow client is cut
+    CHANGE_FEED_REPLAY_SIZE: int = 10_000  # Recent events kept for Last-Event-ID
+    CHANGE_FEED_MAX_SUBSCRIBERS: int = 5_000  # Open streams per worker
+    CHANGE_FEED_HEARTBEAT_SEC: float = 15.0  # Keeps idle proxies from closing streams
+    CHANGE_FEED_RETRY_MS: int = 3_000  # Client reconnect delay (SSE retry field)
+
+    # Single-Flight Settings (see services.singleflight)
+    SINGLEFLIGHT_MAX_TRACKED_KEYS: int = 1000  # Per-key collapse counters kept
+
+    # Response Compression Settings (see core.compression)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024  # Smaller bodies are sent as-is
+    COMPRESSION_THREAD_MIN_BYTES: int = 256 * 1024  # Compressed off the loop
+    COMPRESSION_GZIP_LEVEL: int = 5
+    COMPRESSION_BROTLI_QUALITY: int = 4  # Fast settings suit dynamic content
+
+    # Profiling Settings (admin-gated; can also be toggled via /admin/profile)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0  # Fraction of requests profiled at random
+    PROFILING_HEADER: str = "X-Profile-Request"  # Forces profiling when present
+    PROFILING_INTERVAL_MS: float = 2.0  # Stack sampling interval
+    PROFILING_MAX_PROFILES: int = 200  # Recent profiles kept per worker
+
     class Config:
         # Load environment variables from a .env file
         env_file = ".env"
 
+    @model_validator(mode="after")
+    def _check_export_lag(self):
+        # A window exported before its writes reached the secondary (or left
+        # the telemetry buffer) would be skipped for good by the watermark
+        if self.MONGO_READ_ROUTING.get("export", "primary") == "primary":
+            return self
+        if self.MONGO_MAX_STALENESS_SEC < 0:
+            raise ValueError(
+                "Export reads from secondaries need MONGO_MAX_STALENESS_SEC."
+            )
+        min_lag = (
+            self.MONGO_MAX_STALENESS_SEC
+            + self.TELEMETRY_FLUSH_INTERVAL_SEC
+            + self.TELEMETRY_MAX_CLOCK_SKEW_SEC
+        )
+        if self.EXPORT_LAG_SEC <= min_lag:
+            raise ValueError(
+                f"EXPORT_LAG_SEC must exceed {min_lag:g}s (secondary staleness "
+                "+ telemetry flush interval + clock skew), or route exports "
+                "to the primary."
+            )
+        return self
+
 
 settings = Settings()
@@ -0,0 +1,226 @@
+# backend/app/src/core/logger.py
+"""
+Non-blocking, structured logging for the API and Celery processes.
+
+Callers only enqueue records (QueueHandler); a background thread
+(QueueListener) formats and writes them, so log I/O stays off the event loop.
+Messages are formatted lazily on that thread: log with %-style arguments
+(`logger.info("Sent %s", x)`), not f-strings. Records carry the request and
+trace ids of the request (or task) that emitted them, and INFO/DEBUG records
+of high-volume loggers can be sampled (LOG_SAMPLING).
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from core.config import settings
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+trace_id_var: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
+
+# Loggers configured by servers with their own (synchronous) handlers; they are
+# re-routed through the queue
+ROUTED_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access", "celery")
+
+# Attributes every LogRecord has; anything else was passed via `extra=`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including `extra=` fields."""
+
+    def __init__(self, service: str):
+        super().__init__()
+        self.service = service
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "service": self.service,
+            "pid": record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of the records below WARNING for the configured loggers
+    (and their children); warnings and errors are always kept.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.dropped = 0
+
+    def rate_for(self, name: str) -> float:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        if random.random() < self.rate_for(record.name):
+            return True
+        self.dropped += 1
+        return False
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    Enqueues records without formatting them (the listener formats), tagged
+    with the current request/trace ids. Never blocks: when the queue is full
+    the record is dropped and counted.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.request_id = request_id_var.get()
+        record.trace_id = trace_id_var.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _LoggingState:
+    def __init__(self):
+        self.pid: Optional[int] = None
+        self.handler: Optional[ContextQueueHandler] = None
+        self.listener: Optional[QueueListener] = None
+        self.sampler: Optional[SamplingFilter] = None
+
+
+_state = _LoggingState()
+
+
+def setup_logging(service: str = "api"):
+    """
+    Installs the queue handler on the root logger and starts the writer
+    thread. Idempotent per process; call it again after a fork (e.g. in
+    Celery's worker_process_init), since the writer thread is not inherited.
+    """
+    if _state.pid == os.getpid():
+        return
+    if _state.handler is not None:
+        logging.getLogger().removeHandler(_state.handler)
+
+    output = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter(service))
+    else:
+        output.setFormatter(
+            logging.Formatter(
+                "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+            )
+        )
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    handler = ContextQueueHandler(log_queue)
+    sampler = SamplingFilter(settings.LOG_SAMPLING)
+    handler.addFilter(sampler)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(settings.LOG_LEVEL)
+    for name in ROUTED_LOGGERS:
+        routed = logging.getLogger(name)
+        routed.handlers.clear()
+        routed.propagate = True
+
+    listener = QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    _state.pid, _state.handler, _state.sampler = os.getpid(), handler, sampler
+    _state.listener = listener
+
+
+def shutdown_logging():
+    """Flushes queued records and stops the writer thread."""
+    if _state.listener is not None and _state.pid == os.getpid():
+        _state.listener.stop()
+    _state.listener = None
+    _state.pid = None
+
+
+atexit.register(shutdown_logging)
+
+
+def logging_stats() -> Dict[str, Any]:
+    handler = _state.handler
+    return {
+        "queued": handler.queue.qsize() if handler else 0,
+        "dropped_queue_full": handler.dropped if handler else 0,
+        "dropped_sampled": _state.sampler.dropped if _state.sampler else 0,
+    }
+
+
+def _trace_id(traceparent: Optional[str]) -> Optional[str]:
+    """Trace id of a W3C `traceparent` header (version-traceid-spanid-flags)."""
+    parts = (traceparent or "").split("-")
+    return parts[1] if len(parts) == 4 and len(parts[1]) == 32 else None
+
+
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware binding a request id (X-Request-ID, generated when
+    absent) and a trace id (W3C traceparent, else the request id) to every
+    record logged while serving the request. The request id is echoed back.
+    """
+
+    def __init__(self, app, header: str = "X-Request-ID"):
+        self.app = app
+        self.header = header.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers", ()))
+        request_id = headers.get(self.header, b"").decode("latin-1")[:64]
+        request_id = request_id or uuid.uuid4().hex
+        trace_id = _trace_id(headers.get(b"traceparent", b"").decode("latin-1"))
+        request_token = request_id_var.set(request_id)
+        trace_token = trace_id_var.set(trace_id or request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", ())) + [
+                    (self.header, request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(request_token)
+            trace_id_var.reset(trace_token)
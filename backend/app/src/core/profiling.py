@@ -0,0 +1,310 @@
+# backend/app/src/core/profiling.py
+import asyncio
+import logging
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+
+from core.config import settings
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+# The profile of the request currently executing (None when not sampled).
+# Motor copies the caller's context into its executor threads, so the Mongo
+# command listener below sees the same value as the request coroutine.
+_active_profile: ContextVar[Optional["RequestProfile"]] = ContextVar(
+    "active_profile", default=None
+)
+
+# Phases are resolved in this order: the first phase whose marker appears
+# anywhere in a sampled stack wins (e.g. response validation counts as
+# serialization, body validation inside solve_dependencies counts as validation).
+PHASE_MARKERS = (
+    ("mongo", ("motor", "pymongo", "bson"), ()),
+    ("redis", ("redis",), ()),
+    ("serialization", (), ("serialize_response", "jsonable_encoder", "render")),
+    (
+        "validation",
+        ("pydantic",),
+        ("request_body_to_args", "_validate_value_with_model_field"),
+    ),
+    ("dependencies", (), ("solve_dependencies",)),
+)
+DEFAULT_PHASE = "service"
+
+
+def _classify_stack(frames: List[Any]) -> str:
+    """Maps a sampled stack (root first) onto one of the request phases."""
+    modules = {f.f_globals.get("__name__", "").split(".")[0] for f in frames}
+    functions = {f.f_code.co_name for f in frames}
+    for phase, module_markers, function_markers in PHASE_MARKERS:
+        if modules.intersection(module_markers) or functions.intersection(
+            function_markers
+        ):
+            return phase
+    return DEFAULT_PHASE
+
+
+class RequestProfile:
+    """
+    Timings collected for a single sampled request.
+    Phase durations are in milliseconds; folded stacks are weighted in microseconds.
+    """
+
+    def __init__(self, method: str, path: str, trigger: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.started_at = time.time()
+        self.duration_ms: Optional[float] = None
+        self.status_code: Optional[int] = None
+        self.phases: Dict[str, float] = defaultdict(float)
+        self.stacks: Counter = Counter()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> str:
+        return f"{self.method} {self.path}"
+
+    def add_phase(self, phase: str, duration_ms: float, frame: str = ""):
+        """Records explicitly timed work (e.g. a Mongo command or Redis call)."""
+        stack = f"{self.root};{phase}" + (f";{frame}" if frame else "")
+        with self._lock:
+            self.phases[phase] += duration_ms
+            self.stacks[stack] += max(1, int(duration_ms * 1000))
+
+    def add_sample(self, phase: str, folded: str, interval_ms: float):
+        """Records one stack sample taken from the event loop thread."""
+        with self._lock:
+            self.phases[phase] += interval_ms
+            self.stacks[f"{self.root};{phase};{folded}"] += int(interval_ms * 1000)
+
+    def finish(self, status_code: Optional[int]):
+        self.status_code = status_code
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            phases = {k: round(v, 3) for k, v in self.phases.items()}
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "trigger": self.trigger,
+            "started_at": self.started_at,
+            "status_code": self.status_code,
+            "duration_ms": round(self.duration_ms or 0.0, 3),
+            "phases_ms": phases,
+        }
+
+
+class _MongoCommandProfiler(monitoring.CommandListener):
+    """
+    PyMongo command listener attributing round-trip time to the active profile.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        self._record(event)
+
+    @staticmethod
+    def _record(event):
+        profile = _active_profile.get()
+        if profile is not None:
+            profile.add_phase("mongo", event.duration_micros / 1000, event.command_name)
+
+
+class _StackSampler(threading.Thread):
+    """
+    Background thread sampling the event loop stack while profiled requests run.
+    Samples are only attributed when the loop is executing a profiled task, so
+    concurrent unprofiled requests do not pollute the results.
+    """
+
+    def __init__(self, profiler: "RequestProfiler"):
+        super().__init__(name="request-profiler", daemon=True)
+        self.profiler = profiler
+        self.wakeup = threading.Event()
+
+    def run(self):
+        while True:
+            self.wakeup.wait()
+            interval_ms = self.profiler.interval_ms
+            time.sleep(interval_ms / 1000)
+            self.profiler._sample(interval_ms)
+
+
+class RequestProfiler:
+    """
+    On-demand request profiler for the API process.
+    Requests are profiled when the mode is enabled and they either carry the
+    profiling header or fall into the random sample. State is per worker process.
+    """
+
+    def __init__(self):
+        self.enabled = settings.PROFILING_ENABLED
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.interval_ms = settings.PROFILING_INTERVAL_MS
+        self.header = settings.PROFILING_HEADER.lower().encode("latin-1")
+        self.profiles: Deque[RequestProfile] = deque(
+            maxlen=settings.PROFILING_MAX_PROFILES
+        )
+        self.command_listener = _MongoCommandProfiler()
+        self._active: Dict[asyncio.Task, RequestProfile] = {}
+        self._loops: Dict[int, asyncio.AbstractEventLoop] = {}
+        self._lock = threading.Lock()
+        self._sampler: Optional[_StackSampler] = None
+
+    def configure(
+        self, enabled: Optional[bool] = None, sample_rate: Optional[float] = None
+    ):
+        """Toggles profiling at runtime (used by the admin API)."""
+        if enabled is not None:
+            self.enabled = enabled
+        if sample_rate is not None:
+            self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        logger.info(
+            "Request profiling enabled=%s sample_rate=%s",
+            self.enabled,
+            self.sample_rate,
+        )
+
+    def select(self, scope: Dict[str, Any]) -> Optional[str]:
+        """Returns the trigger for profiling this request, or None to skip it."""
+        if not self.enabled:
+            return None
+        if any(name == self.header for name, _ in scope.get("headers", [])):
+            return "header"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    def begin(self, scope: Dict[str, Any], trigger: str) -> RequestProfile:
+        profile = RequestProfile(
+            scope.get("method", ""), scope.get("path", ""), trigger
+        )
+        task = asyncio.current_task()
+        with self._lock:
+            self._active[task] = profile
+            self._loops[threading.get_ident()] = asyncio.get_running_loop()
+            if self._sampler is None:
+                self._sampler = _StackSampler(self)
+                self._sampler.start()
+            self._sampler.wakeup.set()
+        return profile
+
+    def end(self, profile: RequestProfile, status_code: Optional[int]):
+        profile.finish(status_code)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._active.pop(asyncio.current_task(), None)
+            if not any(task.get_loop() is loop for task in self._active):
+                # Loops die with their thread (tests, workers); drop the reference
+                self._loops.pop(threading.get_ident(), None)
+            if not self._active:
+                self._sampler.wakeup.clear()
+        self.profiles.append(profile)
+
+    def _sample(self, interval_ms: float):
+        frames = sys._current_frames()
+        with self._lock:
+            loops = list(self._loops.items())
+            active = dict(self._active)
+        for thread_id, loop in loops:
+            profile = active.get(asyncio.current_task(loop))
+            frame = frames.get(thread_id)
+            if profile is None or frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame)
+                frame = frame.f_back
+            stack.reverse()
+            folded = ";".join(
+                f"{f.f_globals.get('__name__', '?')}:{f.f_code.co_name}" for f in stack
+            )
+            profile.add_sample(_classify_stack(stack), folded, interval_ms)
+
+    def get_profiles(self, limit: int = 50) -> List[Dict[str, Any]]:
+        return [p.to_dict() for p in list(self.profiles)[-limit:]]
+
+    def folded_stacks(self, limit: int = 50) -> str:
+        """
+        Aggregates recent profiles into Brendan Gregg's folded stack format,
+        consumable by flamegraph.pl or speedscope.
+        """
+        merged: Counter = Counter()
+        for profile in list(self.profiles)[-limit:]:
+            with profile._lock:
+                merged.update(profile.stacks)
+        return "\n".join(f"{stack} {count}" for stack, count in merged.items())
+
+    def clear(self):
+        self.profiles.clear()
+
+
+@contextmanager
+def profile_phase(phase: str, frame: str = ""):
+    """
+    Times a block of work against the active profile (no-op when not profiled).
+    Use around I/O the sampler cannot see, e.g. `with profile_phase("redis", "get"):`.
+    """
+    profile = _active_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_phase(phase, (time.perf_counter() - start) * 1000, frame)
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware so the endpoint runs in the same task as the profile,
+    which is what the stack sampler uses to attribute samples.
+    """
+
+    def __init__(self, app, profiler: "RequestProfiler"):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        trigger = self.profiler.select(scope) if scope["type"] == "http" else None
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = self.profiler.begin(scope, trigger)
+        token = _active_profile.set(profile)
+        status_code = None
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _active_profile.reset(token)
+            self.profiler.end(profile, status_code)
+
+
+request_profiler = RequestProfiler()
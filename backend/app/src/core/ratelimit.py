@@ -0,0 +1,288 @@
+# backend/app/src/core/ratelimit.py
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from core.config import settings
+from core.profiling import profile_phase
+
+logger = logging.getLogger(__name__)
+
+# Atomic token bucket: refill by elapsed time, then take `cost` tokens.
+# Uses the Redis clock so API workers with skewed clocks share one bucket.
+# Returns {allowed, retry_after_sec}; floats as strings (Lua numbers truncate).
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+else
+  retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(retry_after)}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """
+    `rate` tokens per second with a bucket of `burst`, for requests whose path
+    starts with `path`, keyed by authenticated user ("user", falling back to
+    the client IP) or by client IP ("ip").
+    """
+
+    name: str
+    path: str
+    rate: float
+    burst: float
+    per: str = "user"
+
+
+class MemoryTokenBucket:
+    """Per-process token buckets (tests, single-worker deployments)."""
+
+    def __init__(self):
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def acquire(
+        self, key: str, rate: float, burst: float, cost: float = 1.0
+    ) -> Tuple[bool, float]:
+        now = time.monotonic()
+        if key in self._buckets:
+            self._buckets.move_to_end(key)
+        elif len(self._buckets) >= settings.RATE_LIMIT_MEMORY_BUCKETS:
+            # The least recently used bucket has refilled the longest, so
+            # dropping it (a new bucket starts full) rarely changes a decision
+            self._buckets.popitem(last=False)
+        tokens, ts = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - ts) * rate)
+        if tokens >= cost:
+            self._buckets[key] = (tokens - cost, now)
+            return True, 0.0
+        self._buckets[key] = (tokens, now)
+        return False, (cost - tokens) / rate
+
+
+class RedisTokenBucket:
+    """
+    Token buckets shared by all workers, updated by one Lua script call.
+    Falls back to per-process buckets while Redis is unavailable.
+    """
+
+    def __init__(self):
+        self._script = None
+        self._fallback = MemoryTokenBucket()
+
+    async def acquire(
+        self, key: str, rate: float, burst: float, cost: float = 1.0
+    ) -> Tuple[bool, float]:
+        from db.redis_client import redis_client
+
+        if redis_client.client is None:
+            return await self._fallback.acquire(key, rate, burst, cost)
+        if self._script is None:
+            self._script = redis_client.client.register_script(TOKEN_BUCKET_LUA)
+        try:
+            with profile_phase("redis", "EVALSHA ratelimit"):
+                allowed, retry_after = await self._script(
+                    keys=[f"ratelimit:{key}"], args=[rate, burst, cost]
+                )
+        except Exception as e:
+            logger.warning("Rate limit script failed, using local bucket: %s", e)
+            return await self._fallback.acquire(key, rate, burst, cost)
+        return bool(int(allowed)), float(retry_after)
+
+
+class LoadShedder:
+    """
+    Tracks in-flight requests and event-loop lag (how late a periodic timer
+    fires). Either above its threshold means the worker is saturated.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.loop_lag_ms = 0.0
+        self._monitor: Optional[asyncio.Task] = None
+        self.metrics = {"shed_in_flight": 0, "shed_loop_lag": 0}
+
+    def ensure_monitor(self):
+        if self._monitor is None or self._monitor.done():
+            self._monitor = asyncio.get_running_loop().create_task(self._measure())
+
+    async def _measure(self):
+        interval = settings.SHED_LAG_INTERVAL_MS / 1000
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            lag_ms = max(loop.time() - start - interval, 0.0) * 1000
+            # Rises immediately, decays smoothly, so one blip does not flap
+            self.loop_lag_ms = max(lag_ms, 0.7 * self.loop_lag_ms + 0.3 * lag_ms)
+
+    def overloaded(self) -> bool:
+        if self.in_flight >= settings.SHED_MAX_IN_FLIGHT:
+            self.metrics["shed_in_flight"] += 1
+            return True
+        if self.loop_lag_ms >= settings.SHED_MAX_LOOP_LAG_MS:
+            self.metrics["shed_loop_lag"] += 1
+            return True
+        return False
+
+    def stop(self):
+        if self._monitor is not None:
+            self._monitor.cancel()
+            self._monitor = None
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            **self.metrics,
+            "in_flight": self.in_flight,
+            "loop_lag_ms": round(self.loop_lag_ms, 2),
+        }
+
+
+class RateLimiter:
+    """
+    Matches requests to rules and consults the bucket backend. Denials are
+    cached locally until the bucket refills, so a client that keeps hammering
+    is rejected without a Redis round trip.
+    """
+
+    def __init__(self, rules: Optional[List[RateLimitRule]] = None, backend=None):
+        self.rules = rules or [
+            RateLimitRule(**rule) for rule in settings.RATE_LIMIT_RULES
+        ]
+        # Most specific prefix first
+        self.rules.sort(key=lambda rule: len(rule.path), reverse=True)
+        if backend is None:
+            backend = (
+                RedisTokenBucket()
+                if settings.RATE_LIMIT_BACKEND == "redis"
+                else MemoryTokenBucket()
+            )
+        self.backend = backend
+        self._denied_until: Dict[str, float] = {}
+        self.metrics = {"allowed": 0, "limited": 0, "limited_local": 0}
+
+    def match(self, path: str) -> Optional[RateLimitRule]:
+        for rule in self.rules:
+            if path.startswith(rule.path):
+                return rule
+        return None
+
+    async def check(self, rule: RateLimitRule, identity: str) -> Tuple[bool, float]:
+        key = f"{rule.name}:{identity}"
+        now = time.monotonic()
+        until = self._denied_until.get(key)
+        if until is not None:
+            if now < until:
+                self.metrics["limited_local"] += 1
+                return False, until - now
+            del self._denied_until[key]
+
+        allowed, retry_after = await self.backend.acquire(key, rule.rate, rule.burst)
+        if allowed:
+            self.metrics["allowed"] += 1
+        else:
+            self.metrics["limited"] += 1
+            if len(self._denied_until) >= settings.RATE_LIMIT_DENY_CACHE_SIZE:
+                self._denied_until.clear()  # Crude bound; hot keys repopulate
+            self._denied_until[key] = now + retry_after
+        return allowed, retry_after
+
+
+def _client_identity(scope, rule: RateLimitRule) -> str:
+    if rule.per == "user":
+        for name, value in scope.get("headers", ()):
+            if name == b"authorization" and value[:7].lower() == b"bearer ":
+                from utils import decode_access_token
+
+                try:
+                    return "user:" + decode_access_token(value[7:].decode())["sub"]
+                except Exception:
+                    break  # Invalid tokens are limited by IP
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware: load shedding (503) first, then per-route token
+    buckets (429). Paths in SHED_EXEMPT_PATHS (health probes) bypass both;
+    streams in SHED_LONG_LIVED_PATHS are checked when opened but do not hold
+    an in-flight slot, which would otherwise shed all other requests.
+    """
+
+    def __init__(self, app, limiter: RateLimiter, shedder: LoadShedder):
+        self.app = app
+        self.limiter = limiter
+        self.shedder = shedder
+
+    async def _reject(self, send, status: int, detail: str, retry_after: float):
+        body = json.dumps({"detail": detail}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(max(int(retry_after + 0.999), 1)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if (
+            scope["type"] != "http"
+            or not settings.RATE_LIMIT_ENABLED
+            or path.startswith(tuple(settings.SHED_EXEMPT_PATHS))
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        self.shedder.ensure_monitor()
+        if self.shedder.overloaded():
+            await self._reject(send, 503, "Server overloaded, retry later.", 1)
+            return
+
+        rule = self.limiter.match(path)
+        if rule is not None:
+            allowed, retry_after = await self.limiter.check(
+                rule, _client_identity(scope, rule)
+            )
+            if not allowed:
+                await self._reject(send, 429, "Rate limit exceeded.", retry_after)
+                return
+
+        if path.startswith(tuple(settings.SHED_LONG_LIVED_PATHS)):
+            await self.app(scope, receive, send)
+            return
+
+        self.shedder.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.shedder.in_flight -= 1
+
+
+rate_limiter = RateLimiter()
+load_shedder = LoadShedder()
@@ -1,9 +1,14 @@
 # backend/app/src/db/client.py
+import asyncio
 import logging
-from typing import List, Type
+import time
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 from beanie import init_beanie
+from beanie.odm.utils.pydantic import get_model_fields
+from beanie.odm.utils.typing import get_index_attributes
 from core.config import settings
+from core.profiling import request_profiler
 from motor.motor_asyncio import AsyncIOMotorClient
 
 logger = logging.getLogger(__name__)
@@ -12,6 +17,21 @@ logger = logging.getLogger(__name__)
 DOCUMENT_MODELS: List[Type] = []
 
 
+def _declared_indexes(model: Type) -> List[Tuple[Tuple[str, Any], ...]]:
+    """
+    Returns the key patterns a model declares, both via `Indexed(...)` fields
+    and `Settings.indexes`, in the same shape as `index_information()` keys.
+    """
+    keys = []
+    for name, field in get_model_fields(model).items():
+        indexed_attrs = get_index_attributes(field)
+        if indexed_attrs is not None:
+            keys.append(((field.alias or name, indexed_attrs[0]),))
+    for index in model.get_settings().indexes or []:
+        keys.append(tuple(index.index.document["key"].items()))
+    return keys
+
+
 class MongoDBClient:
     """
     Manages the asynchronous connection to MongoDB and initializes Beanie ODM.
@@ -20,15 +40,29 @@ class MongoDBClient:
     def __init__(self):
         self.client: AsyncIOMotorClient = None
         self.database = None
+        # Result of the boot-time index verification, per collection
+        self.index_report: Dict[str, Dict[str, List[str]]] = {}
+        self._ready: bool = False
+        self._ready_checked_at: float = 0.0
+        self._ready_lock = asyncio.Lock()
 
     async def connect(self):
         """
-        Establishes the connection and initializes Beanie.
+        Establishes the connection, initializes Beanie, warms up the pool and
+        verifies the declared indexes.
         """
         try:
             logger.info("Connecting to MongoDB...")
             self.client = AsyncIOMotorClient(
-                settings.MONGO_URI, serverSelectionTimeoutMS=5000
+                settings.MONGO_URI,
+                serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+                maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+                minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+                waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                # Attributes Mongo round-trips to profiled requests
+                event_listeners=[request_profiler.command_listener],
             )
 
             # The database name is typically extracted from the URI or set here
@@ -37,12 +71,100 @@ class MongoDBClient:
 
             # Initialize Beanie ODM for document management
             await init_beanie(database=self.database, document_models=DOCUMENT_MODELS)
-            logger.info(f"MongoDB connected successfully to DB: {db_name}")
+            logger.info("MongoDB connected successfully to DB: %s", db_name)
+
+            await self.warmup()
+            await self.verify_indexes()
 
         except Exception as e:
-            logger.error(f"Failed to connect to MongoDB: {e}")
-            # In production, this might raise an exception to prevent the app from starting
-            # if the DB is critical for readiness.
+            logger.error("Failed to connect to MongoDB: %s", e)
+            if settings.MONGO_FAIL_FAST:
+                # Let the process exit so the supervisor restarts it, instead of
+                # serving requests that will all fail against a missing DB.
+                raise
+
+    async def warmup(self):
+        """
+        Opens `MONGO_MIN_POOL_SIZE` connections up front by issuing concurrent
+        pings, so the first requests don't pay TCP/TLS/auth handshake cost.
+        """
+        connections = max(1, settings.MONGO_MIN_POOL_SIZE)
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(self.client.admin.command("ping") for _ in range(connections))
+        )
+        self._mark_ready(True)
+        logger.info(
+            "MongoDB pool warmed up with %d connections in %.1f ms",
+            connections,
+            (time.perf_counter() - start) * 1000,
+        )
+
+    async def verify_indexes(self) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Compares the indexes declared on DOCUMENT_MODELS with those present on
+        the server. Missing indexes are logged loudly because they silently turn
+        hot queries into collection scans.
+        """
+        report = {}
+        for model in DOCUMENT_MODELS:
+            collection = model.get_motor_collection()
+            existing = {
+                tuple(info["key"]): name
+                for name, info in (await collection.index_information()).items()
+            }
+            present, missing = [], []
+            for key in _declared_indexes(model):
+                if key in existing:
+                    present.append(existing[key])
+                else:
+                    missing.append("_".join(f"{k}_{d}" for k, d in key))
+            report[collection.name] = {"present": present, "missing": missing}
+            if missing:
+                logger.error(
+                    "Collection '%s' is missing declared indexes: %s",
+                    collection.name,
+                    missing,
+                )
+            else:
+                logger.info(
+                    "Collection '%s' indexes verified: %s", collection.name, present
+                )
+
+        self.index_report = report
+        return report
+
+    async def is_ready(self) -> bool:
+        """
+        Ping-based readiness probe. The result is cached for
+        `MONGO_READY_CACHE_SEC` and concurrent probes share a single ping.
+        """
+        if self.client is None:
+            return False
+        if time.monotonic() - self._ready_checked_at < settings.MONGO_READY_CACHE_SEC:
+            return self._ready
+
+        async with self._ready_lock:
+            # Another probe may have refreshed the result while we waited
+            if (
+                time.monotonic() - self._ready_checked_at
+                < settings.MONGO_READY_CACHE_SEC
+            ):
+                return self._ready
+            try:
+                await asyncio.wait_for(
+                    self.client.admin.command("ping"),
+                    timeout=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS / 1000,
+                )
+                self._mark_ready(True)
+            except Exception as e:
+                logger.warning("MongoDB readiness ping failed: %s", e)
+                self._mark_ready(False)
+        return self._ready
+
+    def _mark_ready(self, ready: bool):
+        self._ready = ready
+        self._ready_checked_at = time.monotonic()
 
     async def close(self):
         """
@@ -50,6 +172,7 @@ class MongoDBClient:
         """
         if self.client:
             self.client.close()
+            self._mark_ready(False)
             logger.info("MongoDB connection closed.")
 
 
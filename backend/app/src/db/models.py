@@ -1,10 +1,12 @@
 # backend/app/src/db/models.py
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from beanie import Document
+from beanie import Document, Granularity, Indexed, PydanticObjectId, TimeSeriesConfig
+from core.config import settings
 from db.client import DOCUMENT_MODELS  # Import the list to register models
-from pydantic import EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 # --- User Domain Model ---
@@ -14,8 +16,9 @@ class User(Document):
     Implements Denormalization by embedding metadata.
     """
 
-    email: EmailStr = Field(unique=True, index=True)
-    username: Optional[str] = Field(unique=True, index=True)
+    # Indexed() is what Beanie turns into real indexes (Field(index=True) is ignored)
+    email: Indexed(EmailStr, unique=True)
+    username: Optional[str]
     hashed_password: str
 
     # Embedded document for Preferences (Denormalization)
@@ -23,26 +26,49 @@ class User(Document):
 
     # Metadata fields
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set on every profile update; watermark of the incremental export
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
     is_active: bool = True
+    # Incremented on every profile update; the ETag of GET /users/me
+    version: int = 0
 
     # Custom Settings for MongoDB/Beanie
     class Settings:
         name = "users"  # MongoDB collection name
         # Define compound indexes for search-heavy collections (Indexing Strategy)
-        indexes = [("email", "username")]
+        indexes = [
+            ("email", "username"),
+            # Declared here because Beanie ignores Indexed() inside Optional[...];
+            # the partial filter lets several users keep a null username
+            IndexModel(
+                "username",
+                name="username_1",
+                unique=True,
+                partialFilterExpression={"username": {"$type": "string"}},
+            ),
+            # Incremental export window scan (services.export)
+            IndexModel("updated_at"),
+        ]
 
 
 # Register the model with the client list
 DOCUMENT_MODELS.append(User)
 
 
+class UserVersion(BaseModel):
+    """Projection for ETag checks: revalidation skips loading the profile."""
+
+    id: PydanticObjectId = Field(alias="_id")
+    version: int = 0  # Users created before versioning
+
+
 class Project(Document):
     """
     Stores project-specific entities. Features schema flexibility for project details.
     """
 
     owner_id: PydanticObjectId  # Link back to the User who owns the project
-    name: str = Field(index=True)
+    name: Indexed(str)
     status: str = Field(default="Draft")
 
     # Flexible field to store semi-structured data
@@ -55,8 +81,165 @@ class Project(Document):
     class Settings:
         name = "projects"  # MongoDB collection name
         # Compound index for efficient queries (e.g., finding a user's projects by status)
-        indexes = [("owner_id", "status", "created_at")]
+        indexes = [
+            ("owner_id", "status", "created_at"),
+            # Serves "all projects of an owner, newest first" without an in-memory
+            # SORT (status sits between owner_id and created_at in the index above)
+            IndexModel([("owner_id", ASCENDING), ("created_at", DESCENDING)]),
+            # Incremental export window scan (services.export)
+            IndexModel("updated_at"),
+        ]
 
 
 # Register the new model
 DOCUMENT_MODELS.append(Project)
+
+
+class ProjectStamp(BaseModel):
+    """Projection for ETag checks on project listings."""
+
+    id: PydanticObjectId = Field(alias="_id")
+    updated_at: datetime
+
+
+class AnalyticsRollup(Document):
+    """
+    Pre-aggregated hourly/daily counters read by the analytics dashboard.
+    Maintained incrementally with $inc upserts by services.rollup; the `_id`
+    is "<granularity>:<bucket start>" so concurrent workers merge into one doc.
+    """
+
+    id: str
+    granularity: str  # "hour", "day" or "totals" (the single `_id: "totals"` doc)
+    bucket_start: datetime
+    users_created: int = 0
+    # Absolute project counts per status as of the bucket's last change
+    projects_by_status: Dict[str, int] = Field(default={})
+    predictions: Dict[str, int] = Field(default={})  # total / high / low
+    score_histogram: Dict[str, int] = Field(default={})  # decile "0".."9"
+    alerts_sent: Dict[str, int] = Field(default={})  # per notification type
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "analytics_rollups"
+        indexes = [("granularity", "bucket_start")]
+
+
+DOCUMENT_MODELS.append(AnalyticsRollup)
+
+
+# --- Alerts ---
+class Alert(Document):
+    """
+    A notification sent to a user (rule-fired or via /notify/send). Persisted
+    so the change feed (services.change_feed) can push it to the user's
+    connected clients; delivery itself goes through the task layer.
+    """
+
+    user_id: str
+    message: str
+    type: str = "in-app"
+    rule: Optional[str] = None  # AlertRule name, None for manual alerts
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "alerts"
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+        ]
+
+
+DOCUMENT_MODELS.append(Alert)
+
+
+# --- Telemetry (Time-Series) ---
+class PredictionMeta(BaseModel):
+    """
+    Series key of a prediction event. MongoDB buckets measurements by this
+    metaField, so range queries per vehicle only touch that vehicle's buckets.
+    """
+
+    vehicle_id: str
+    user_id: Optional[str] = None
+
+
+class PredictionEvent(Document):
+    """
+    One model prediction, stored in a time-series collection with TTL expiry.
+    Written in batches by services.telemetry, never on the request path.
+    """
+
+    ts: datetime
+    meta: PredictionMeta
+    prediction: str
+    score: float
+    model_version: str
+    features: List[float] = Field(default=[])
+
+    class Settings:
+        name = "prediction_events"
+        timeseries = TimeSeriesConfig(
+            time_field="ts",
+            meta_field="meta",
+            granularity=Granularity.seconds,
+            expire_after_seconds=settings.TELEMETRY_TTL_DAYS * 24 * 3600,
+        )
+        # Secondary index for per-vehicle range scans
+        indexes = [("meta.vehicle_id", "ts")]
+
+
+DOCUMENT_MODELS.append(PredictionEvent)
+
+
+# --- Dataset Ingestion ---
+class DatasetSample(Document):
+    """
+    One row of an ingested driver-behaviour dataset (see services.ingestion).
+    The `_id` is "<dataset>:<byte offset of the row>", which makes re-running
+    a chunk after a failure idempotent.
+    """
+
+    id: str
+    dataset: str
+    vehicle_id: str
+    session_id: Optional[str] = None
+    ts: datetime
+    ear: Optional[float] = None
+    mar: Optional[float] = None
+    head_pitch: Optional[float] = None
+    head_yaw: Optional[float] = None
+    label: Optional[str] = None
+
+    class Settings:
+        name = "dataset_samples"
+        indexes = [("dataset", "vehicle_id", "ts")]
+
+
+DOCUMENT_MODELS.append(DatasetSample)
+
+
+class IngestionJob(Document):
+    """
+    Progress checkpoint of a CSV ingestion. `offset` is the byte position up to
+    which every row is persisted; a resumed job continues from there.
+    """
+
+    path: str
+    dataset: str
+    status: str = "pending"  # pending, running, completed, failed
+    offset: int = 0
+    file_size: int = 0
+    file_digest: Optional[str] = None  # Content digest, part of the row ids
+    rows_inserted: int = 0
+    rows_rejected: int = 0
+    rows_duplicate: int = 0  # Already written by an earlier attempt
+    rows_per_sec: float = 0.0
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "ingestion_jobs"
+
+
+DOCUMENT_MODELS.append(IngestionJob)
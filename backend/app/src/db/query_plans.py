@@ -0,0 +1,370 @@
+# backend/app/src/db/query_plans.py
+"""
+Query plan regression checker.
+
+Runs every registered service-layer query through `explain()` against a seeded
+MongoDB database and fails on collection scans, in-memory sorts, or a poor
+docs-examined/returned ratio. Requires a real mongod (mongomock has no planner).
+
+Usage (from backend/app/src):
+    python -m db.query_plans --uri mongodb://localhost:27017/v13_query_plans
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from beanie import init_beanie
+from db.client import DOCUMENT_MODELS
+from db.models import PredictionEvent, Project, User
+from motor.motor_asyncio import AsyncIOMotorClient
+
+logger = logging.getLogger(__name__)
+
+PROJECT_STATUSES = ["Draft", "Active", "Archived"]
+DEFAULT_MAX_EXAMINED_RATIO = 2.0
+
+
+@dataclass
+class SeedData:
+    users: List[User] = field(default_factory=list)
+    projects: List[Project] = field(default_factory=list)
+    vehicles: List[str] = field(default_factory=list)
+    telemetry_end: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass
+class RegisteredQuery:
+    name: str
+    build: Callable[[SeedData], Any]  # Returns a Beanie FindOne/FindMany
+
+
+@dataclass
+class PlanResult:
+    name: str
+    stages: List[str]
+    docs_examined: int
+    keys_examined: int
+    returned: int
+    problems: List[str]
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems
+
+
+QUERY_REGISTRY: List[RegisteredQuery] = []
+
+
+def register_query(name: str):
+    """Registers a builder returning the Beanie query a service method runs."""
+
+    def decorator(build: Callable[[SeedData], Any]):
+        QUERY_REGISTRY.append(RegisteredQuery(name=name, build=build))
+        return build
+
+    return decorator
+
+
+# --- Registered Service Queries ---
+# Builders call the services' own query builders so the checked query cannot
+# drift from the one served in production.
+
+
+@register_query("UserService.get_user_by_email")
+def _user_by_email(seed: SeedData):
+    from services.user import user_service
+
+    return user_service.user_by_email_query(seed.users[-1].email)
+
+
+@register_query("UserService.get_user_by_id")
+def _user_by_id(seed: SeedData):
+    from services.user import user_service
+
+    return user_service.user_by_id_query(seed.users[-1].id)
+
+
+@register_query("UserService.get_user_etag")
+def _user_version(seed: SeedData):
+    from services.user import user_service
+
+    return user_service.user_version_query(seed.users[-1].id)
+
+
+@register_query("DataService.get_project_by_id")
+def _project_by_id(seed: SeedData):
+    from services.data import data_service
+
+    project = seed.projects[-1]
+    return data_service.project_by_id_query(project.id, project.owner_id)
+
+
+@register_query("DataService.get_projects_by_owner")
+def _projects_by_owner(seed: SeedData):
+    from services.data import data_service
+
+    return data_service.projects_by_owner_query(seed.users[-1].id, limit=10)
+
+
+@register_query("DataService.get_projects_etag")
+def _project_stamps(seed: SeedData):
+    from services.data import data_service
+
+    return data_service.project_stamps_query(seed.users[-1].id, limit=10)
+
+
+def _export_window(seed: SeedData, model, table_name: str):
+    from services.export import TABLES, export_query
+
+    table = next(t for t in TABLES if t.name == table_name)
+    # A recent window, as in the scheduled runs (the first run has no lower bound)
+    until = datetime.utcnow() + timedelta(minutes=1)
+    query, sort = export_query(table, until - timedelta(minutes=15), until)
+    return model.find(query).sort(sort)
+
+
+@register_query("ExportService.export_table[users]")
+def _export_users(seed: SeedData):
+    return _export_window(seed, User, "users")
+
+
+@register_query("ExportService.export_table[projects]")
+def _export_projects(seed: SeedData):
+    return _export_window(seed, Project, "projects")
+
+
+def _telemetry_window(seed: SeedData):
+    # The last hour of one vehicle, as the dashboards request it
+    return (
+        seed.vehicles[-1],
+        seed.telemetry_end - timedelta(hours=1),
+        seed.telemetry_end,
+    )
+
+
+@register_query("TelemetryService.get_history")
+def _telemetry_history(seed: SeedData):
+    from services.telemetry import telemetry_service
+
+    return telemetry_service.history_query(*_telemetry_window(seed), limit=1000)
+
+
+@register_query("TelemetryService.get_timeline")
+def _telemetry_timeline(seed: SeedData):
+    from services.telemetry import telemetry_service
+
+    # The $group/$sort stages run on the matched events either way; the
+    # leading $match is what must use the (meta.vehicle_id, ts) index
+    pipeline = telemetry_service.timeline_pipeline(*_telemetry_window(seed))
+    return PredictionEvent.find(pipeline[0]["$match"])
+
+
+# --- Seeding ---
+
+
+async def seed_collections(
+    users: int = 200, projects_per_user: int = 20, vehicles: int = 20
+) -> SeedData:
+    """
+    Inserts synthetic users, projects and prediction events so the planner
+    has realistic cardinalities to choose from (an empty collection hides
+    COLLSCANs).
+    """
+    now = datetime.utcnow()
+    seed = SeedData()
+    seed.users = [
+        User(
+            email=f"qp-user-{i}@example.com",
+            username=f"qp_user_{i}",
+            hashed_password="not-a-real-hash",
+            updated_at=now - timedelta(minutes=i),
+        )
+        for i in range(users)
+    ]
+    await User.insert_many(seed.users)
+    seed.users = await User.find_all().to_list()
+
+    seed.projects = [
+        Project(
+            owner_id=user.id,
+            name=f"project-{j}",
+            status=random.choice(PROJECT_STATUSES),
+            created_at=now - timedelta(minutes=j),
+            updated_at=now - timedelta(minutes=j),
+        )
+        for user in seed.users
+        for j in range(projects_per_user)
+    ]
+    await Project.insert_many(seed.projects)
+    seed.projects = await Project.find_all().to_list()
+
+    # A day of per-minute predictions per vehicle, spread over many buckets
+    seed.vehicles = [f"qp-vehicle-{v}" for v in range(vehicles)]
+    seed.telemetry_end = now
+    await PredictionEvent.get_motor_collection().insert_many(
+        [
+            {
+                "ts": now - timedelta(minutes=m),
+                "meta": {"vehicle_id": vehicle_id, "user_id": None},
+                "prediction": random.choice(["low", "high"]),
+                "score": random.random(),
+                "model_version": "qp",
+                "features": [],
+            }
+            for vehicle_id in seed.vehicles
+            for m in range(24 * 60)
+        ],
+        ordered=False,
+    )
+    return seed
+
+
+# --- Plan Analysis ---
+
+
+def _unwrap_explain(explain: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Time-series finds are rewritten into an aggregation over the buckets, so
+    their explain nests the planner output in the leading $cursor stage.
+    """
+    if "queryPlanner" in explain or "stages" not in explain:
+        return explain
+    return explain["stages"][0]["$cursor"]
+
+
+def _pipeline_stages(explain: Dict[str, Any]) -> List[str]:
+    """Stage names after the $cursor (e.g. $_internalUnpackBucket, $sort)."""
+    return [next(iter(stage)) for stage in explain.get("stages", [])[1:]]
+
+
+def _collect_stages(plan: Dict[str, Any]) -> List[str]:
+    """Flattens a (classic or SBE) winning plan tree into its stage names."""
+    if "queryPlan" in plan:  # Slot-based engine wraps the classic tree
+        plan = plan["queryPlan"]
+    stages = [plan.get("stage", "?")]
+    if "inputStage" in plan:
+        stages += _collect_stages(plan["inputStage"])
+    for child in plan.get("inputStages", []):
+        stages += _collect_stages(child)
+    return stages
+
+
+def analyze_plan(
+    name: str,
+    explain: Dict[str, Any],
+    max_examined_ratio: float = DEFAULT_MAX_EXAMINED_RATIO,
+) -> PlanResult:
+    cursor = _unwrap_explain(explain)
+    stages = _pipeline_stages(explain)[::-1] + _collect_stages(
+        cursor["queryPlanner"]["winningPlan"]
+    )
+    stats = cursor.get("executionStats", {})
+    docs_examined = stats.get("totalDocsExamined", 0)
+    returned = stats.get("nReturned", 0)
+
+    problems = []
+    if "COLLSCAN" in stages:
+        problems.append("collection scan (COLLSCAN)")
+    if "SORT" in stages:
+        problems.append("in-memory sort (SORT stage)")
+    if "$sort" in stages:
+        # Unbounded; an index-backed time-series sort is $_internalBoundedSort
+        problems.append("blocking sort of unpacked events ($sort stage)")
+    ratio = docs_examined / max(returned, 1)
+    if ratio > max_examined_ratio:
+        problems.append(
+            f"examined {docs_examined} docs for {returned} returned "
+            f"(ratio {ratio:.1f} > {max_examined_ratio})"
+        )
+
+    return PlanResult(
+        name=name,
+        stages=stages,
+        docs_examined=docs_examined,
+        keys_examined=stats.get("totalKeysExamined", 0),
+        returned=returned,
+        problems=problems,
+    )
+
+
+async def explain_query(query) -> Dict[str, Any]:
+    """Runs a Beanie FindOne/FindMany through the server's explain command."""
+    collection = query.document_model.get_motor_collection()
+    cursor = collection.find(query.get_filter_query())
+    if getattr(query, "sort_expressions", None):
+        cursor = cursor.sort(query.sort_expressions)
+    if getattr(query, "skip_number", 0):
+        cursor = cursor.skip(query.skip_number)
+    limit = getattr(query, "limit_number", 1)  # FindOne fetches a single document
+    if limit:
+        cursor = cursor.limit(limit)
+    return await cursor.explain()
+
+
+async def check_registered_queries(
+    seed: SeedData, max_examined_ratio: float = DEFAULT_MAX_EXAMINED_RATIO
+) -> List[PlanResult]:
+    results = []
+    for registered in QUERY_REGISTRY:
+        explain = await explain_query(registered.build(seed))
+        results.append(analyze_plan(registered.name, explain, max_examined_ratio))
+    return results
+
+
+async def run(
+    uri: str, users: int, projects_per_user: int, max_examined_ratio: float
+) -> bool:
+    client = AsyncIOMotorClient(uri)
+    database = client.get_default_database()
+    if await database.list_collection_names():
+        # Never seed into (and later drop) a database that holds real data
+        client.close()
+        raise SystemExit(f"Refusing to use non-empty database '{database.name}'.")
+    try:
+        await init_beanie(database=database, document_models=DOCUMENT_MODELS)
+        seed = await seed_collections(users, projects_per_user)
+        results = await check_registered_queries(seed, max_examined_ratio)
+    finally:
+        await client.drop_database(database.name)
+        client.close()
+
+    for result in results:
+        status = "OK  " if result.ok else "FAIL"
+        print(
+            f"[{status}] {result.name}: {' <- '.join(result.stages)} "
+            f"(keys={result.keys_examined}, docs={result.docs_examined}, "
+            f"returned={result.returned})"
+        )
+        for problem in result.problems:
+            print(f"        - {problem}")
+    return all(result.ok for result in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--uri",
+        default="mongodb://localhost:27017/v13_query_plans",
+        help="Empty scratch database URI; it is dropped after the run.",
+    )
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--projects-per-user", type=int, default=20)
+    parser.add_argument(
+        "--max-examined-ratio", type=float, default=DEFAULT_MAX_EXAMINED_RATIO
+    )
+    args = parser.parse_args()
+
+    ok = asyncio.run(
+        run(args.uri, args.users, args.projects_per_user, args.max_examined_ratio)
+    )
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
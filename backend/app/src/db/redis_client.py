@@ -0,0 +1,44 @@
+# backend/app/src/db/redis_client.py
+import logging
+
+import redis.asyncio as redis
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RedisClient:
+    """
+    Manages the shared asyncio Redis connection pool used for caching.
+    (Celery manages its own broker connections.)
+    """
+
+    def __init__(self):
+        self.client: redis.Redis = None
+
+    async def connect(self):
+        """
+        Creates the pool and verifies connectivity. Redis is an optional
+        accelerator here, so failures are logged and callers fall back.
+        """
+        try:
+            self.client = redis.from_url(
+                settings.REDIS_URL,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SEC,
+                socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SEC,
+            )
+            await self.client.ping()
+            logger.info("Redis connected successfully.")
+        except Exception as e:
+            logger.error("Failed to connect to Redis: %s", e)
+            self.client = None
+
+    async def close(self):
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+            logger.info("Redis connection closed.")
+
+
+redis_client = RedisClient()
@@ -0,0 +1,115 @@
+# backend/app/src/db/routing.py
+"""
+Read routing per query class.
+
+Freshness-critical reads (auth, read-after-write) stay on the primary; list,
+export and analytics reads may go to secondaries, bounded by
+MONGO_MAX_STALENESS_SEC. A flow that must see its own writes on a secondary
+runs its writes and reads in one causally consistent session.
+
+Beanie has no per-query read preference, so routed reads run the query's
+filter/sort/limit against a collection handle carrying the preference.
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
+
+from beanie.odm.queries.find import FindMany
+from beanie.odm.utils.parsing import parse_obj
+from beanie.odm.utils.projection import get_projection
+from core.config import settings
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+)
+
+READ_CLASSES = ("primary", "list", "export", "analytics")
+
+READ_MODES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+# MongoDB rejects smaller bounds (heartbeat interval + idle write period)
+MIN_MAX_STALENESS_SEC = 90
+
+
+def read_preference(read_class: str):
+    """The pymongo read preference configured for a query class."""
+    if read_class not in READ_CLASSES:
+        raise ValueError(f"Unknown read class '{read_class}'.")
+    mode = settings.MONGO_READ_ROUTING.get(read_class, "primary")
+    if mode not in READ_MODES:
+        raise ValueError(f"Unknown read preference '{mode}' for '{read_class}'.")
+    if mode == "primary":
+        return Primary()
+    staleness = settings.MONGO_MAX_STALENESS_SEC
+    if staleness != -1 and staleness < MIN_MAX_STALENESS_SEC:
+        raise ValueError(
+            f"MONGO_MAX_STALENESS_SEC must be -1 or >= {MIN_MAX_STALENESS_SEC}."
+        )
+    return READ_MODES[mode](max_staleness=staleness)
+
+
+def routed_collection(model: Type, read_class: str):
+    """The model's motor collection with the class's read preference."""
+    collection = model.get_motor_collection()
+    preference = read_preference(read_class)
+    if preference == collection.read_preference:
+        return collection
+    return collection.with_options(read_preference=preference)
+
+
+async def find_routed(
+    query: FindMany, read_class: str, session: Any = None
+) -> List[Any]:
+    """
+    Runs a Beanie find query with the read preference of `read_class`.
+    Queries with fetch_links (aggregation) are not supported.
+    """
+    if query.fetch_links:
+        raise ValueError("find_routed does not support fetch_links queries.")
+    cursor = routed_collection(query.document_model, read_class).find(
+        filter=query.get_filter_query(),
+        sort=query.sort_expressions,
+        projection=get_projection(query.projection_model),
+        skip=query.skip_number,
+        limit=query.limit_number,
+        session=session or query.session,
+    )
+    return [
+        parse_obj(query.projection_model, document, lazy_parse=query.lazy_parse)
+        for document in await cursor.to_list(length=None)
+    ]
+
+
+@asynccontextmanager
+async def causal_session(client: Any = None) -> AsyncIterator[Optional[Any]]:
+    """
+    A causally consistent session: reads issued with it observe the writes
+    issued with it before, even on a lagging secondary. Yields None when
+    MONGO_CAUSAL_SESSIONS is off (reads then follow their routing only).
+    """
+    if not settings.MONGO_CAUSAL_SESSIONS:
+        yield None
+        return
+    if client is None:
+        from db.client import mongo_client
+
+        client = mongo_client.client
+    async with await client.start_session(causal_consistency=True) as session:
+        yield session
+
+
+def routing_table() -> Dict[str, str]:
+    """Effective routing, for /admin/metrics."""
+    return {
+        read_class: settings.MONGO_READ_ROUTING.get(read_class, "primary")
+        for read_class in READ_CLASSES
+    }
@@ -1,13 +1,32 @@
 # backend/app/src/main.py (FINAL UPDATED VERSION)
-import logging
-
-from api.v1 import auth, ml, user  # IMPORTED NEW ROUTERS
+from api.v1 import (  # IMPORTED NEW ROUTERS
+    admin,
+    auth,
+    data,
+    events,
+    ml,
+    notification,
+    user,
+)
+from core.compression import CompressionMiddleware
 from core.config import settings
+from core.logger import RequestContextMiddleware, setup_logging, shutdown_logging
+from core.profiling import ProfilingMiddleware, request_profiler
+from core.ratelimit import RateLimitMiddleware, load_shedder, rate_limiter
 from db.client import mongo_client
-from fastapi import FastAPI, status
+from db.redis_client import redis_client
+from services.change_feed import change_feed
+from services.executor import inference_executor
+from services.inference import configure_threads
+from services.ml import ml_service
+from services.notification import notification_service
+from services.rollup import rollup_service
+from services.telemetry import telemetry_service
+from services.watchdog import memory_watchdog
+from fastapi import FastAPI, HTTPException, status
 
-# Configure basic logging for visibility
-logging.basicConfig(level=logging.INFO)
+# Queue-backed structured logging; the writer thread keeps I/O off the loop
+setup_logging("api")
 
 
 def create_app() -> FastAPI:
@@ -22,14 +41,46 @@ def create_app() -> FastAPI:
         docs_url="/api/v1/docs",
     )
 
+    # --- Response Compression (innermost: compresses the endpoint's output) ---
+    app.add_middleware(CompressionMiddleware)
+
+    # --- Rate Limiting & Load Shedding (rejects before any endpoint work) ---
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter, shedder=load_shedder)
+
+    # --- Request Profiling (admin-gated, see /api/v1/admin/profile) ---
+    # Outside rate limiting, so its Redis round trip is part of the profile
+    app.add_middleware(ProfilingMiddleware, profiler=request_profiler)
+
+    # --- Request/Trace IDs for log records (outermost, so rejections carry one) ---
+    app.add_middleware(RequestContextMiddleware)
+
     # --- Database Connection Lifecycle ---
     @app.on_event("startup")
     async def startup_event():
+        # Per-worker inference thread pools, then the exported model
+        configure_threads()
+        ml_service.load_runtime()
+        inference_executor.start()
         await mongo_client.connect()
+        if settings.PREDICTION_CACHE_REDIS or settings.RATE_LIMIT_BACKEND == "redis":
+            await redis_client.connect()
+        await rollup_service.start()
+        await telemetry_service.start()
+        await change_feed.start()
+        await memory_watchdog.start()
 
     @app.on_event("shutdown")
     async def shutdown_event():
+        await memory_watchdog.stop()
+        await change_feed.stop()
+        await notification_service.drain()
+        await telemetry_service.stop()
+        inference_executor.stop()
+        load_shedder.stop()
+        await rollup_service.stop()
+        await redis_client.close()
         await mongo_client.close()
+        shutdown_logging()
 
     # ------------------------------------
 
@@ -41,6 +92,7 @@ def create_app() -> FastAPI:
     app.include_router(
         notification.router, prefix="/api/v1/notify", tags=["Notification Service"]
     )
+    app.include_router(events.router, prefix="/api/v1/events", tags=["Change Feed"])
     app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin Service"])
 
     # Health Check Strategy
@@ -50,7 +102,7 @@ def create_app() -> FastAPI:
 
     @app.get("/health/ready", status_code=status.HTTP_200_OK, tags=["Health"])
     async def readiness_check():
-        if mongo_client.client is None:
+        if not await mongo_client.is_ready():
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="DB not connected",
@@ -58,7 +110,16 @@ def create_app() -> FastAPI:
 
         # Add Redis/Task broker check here in a complete environment
 
-        return {"status": "ok", "message": "All core components are ready"}
+        missing_indexes = {
+            name: report["missing"]
+            for name, report in mongo_client.index_report.items()
+            if report["missing"]
+        }
+        return {
+            "status": "ok",
+            "message": "All core components are ready",
+            "missing_indexes": missing_indexes,
+        }
 
     return app
 
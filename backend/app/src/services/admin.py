@@ -1,8 +1,18 @@
 # backend/app/src/services/admin.py (NEW FILE)
+import asyncio
+from datetime import datetime
 from typing import Any, Dict, List
 
 from core.config import settings
+from core.logger import logging_stats
+from core.ratelimit import load_shedder, rate_limiter
+from db.routing import routing_table
+from services.change_feed import change_feed
+from services.executor import inference_executor
+from services.prediction_cache import prediction_cache
+from services.singleflight import single_flight_groups
 from services.task import task_service  # To access queue metrics
+from services.watchdog import MB, memory_watchdog, recent_recycles, rss_bytes
 
 
 class AdminService:
@@ -39,10 +49,31 @@ class AdminService:
             "worker_status": task_metrics.get("workers_online", 0),
             "queue_depth": task_metrics.get("queue_length", 0),
             "last_db_check": task_metrics.get("last_check"),
-            "memory_usage_mb": 450,  # Placeholder
+            "memory_usage_mb": round(rss_bytes() / MB, 1),  # This API worker
             "cpu_usage_percent": 12.5,  # Placeholder
+            "prediction_cache": prediction_cache.stats(),
+            "inference_executor": inference_executor.stats(),
+            "rate_limit": rate_limiter.metrics,
+            "load_shedding": load_shedder.stats(),
+            "logging": logging_stats(),
+            "read_routing": {
+                **routing_table(),
+                "max_staleness_sec": settings.MONGO_MAX_STALENESS_SEC,
+            },
+            "single_flight": {
+                name: group.stats() for name, group in single_flight_groups.items()
+            },
+            "memory_watchdog": memory_watchdog.stats(),
+            "change_feed": change_feed.stats(),
         }
 
+    async def get_recycle_events(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Recent API worker and Celery child recycles (shared across processes
+        via Redis), newest first.
+        """
+        return await asyncio.to_thread(recent_recycles, limit)
+
     def _get_task_queue_status(self) -> Dict[str, Any]:
         """
         Simulates checking the Celery/Redis broker status.
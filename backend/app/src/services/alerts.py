@@ -0,0 +1,191 @@
+# backend/app/src/services/alerts.py
+import logging
+import operator
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """
+    Declarative alert rule evaluated on every prediction of a session.
+    Fires when `result[field] <op> threshold` holds for `consecutive` events in a
+    row, then stays silent for `cooldown_sec` (one episode -> one alert).
+    """
+
+    name: str
+    field: str = "score"
+    op: str = ">="
+    threshold: Any = 0.5
+    consecutive: int = 1
+    cooldown_sec: float = 60.0
+    message: str = "Driver risk detected."
+    type: str = "push"
+
+    def matches(self, result: Dict[str, Any]) -> bool:
+        value = result.get(self.field)
+        if value is None:
+            return False
+        try:
+            return OPERATORS[self.op](value, self.threshold)
+        except TypeError:
+            return False
+
+
+@dataclass
+class _RuleState:
+    streak: int = 0
+    cooldown_until: float = 0.0
+
+
+class _SessionState:
+    __slots__ = ("rules", "last_seen")
+
+    def __init__(self):
+        self.rules: Dict[str, _RuleState] = {}
+        self.last_seen = 0.0
+
+
+class PreferenceCache:
+    """
+    TTL cache of users' `notifications` preference, so alert evaluation does
+    not query MongoDB per event. Invalidated when preferences are updated;
+    bounded LRU-style, so a full cache only evicts its coldest users.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, Tuple[bool, float]]" = OrderedDict()
+
+    async def notifications_enabled(self, user_id: str) -> bool:
+        entry = self._entries.get(user_id)
+        now = time.monotonic()
+        if entry is not None and entry[1] > now:
+            self._entries.move_to_end(user_id)
+            return entry[0]
+
+        # Lazy import to avoid a circular dependency with the user service
+        from beanie import PydanticObjectId
+        from services.user import user_service
+
+        try:
+            user = await user_service.get_user_by_id(PydanticObjectId(user_id))
+        except Exception as e:
+            logger.warning("Could not load preferences for %s: %s", user_id, e)
+            user = None
+        enabled = bool(
+            user and user.is_active and user.preferences.get("notifications")
+        )
+        self._entries[user_id] = (enabled, now + settings.ALERT_PREFS_TTL_SEC)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > settings.ALERT_PREFS_CACHE_SIZE:
+            self._entries.popitem(last=False)
+        return enabled
+
+    def invalidate(self, user_id: str):
+        self._entries.pop(str(user_id), None)
+
+
+class AlertRuleEngine:
+    """
+    Turns the prediction stream into notifications.
+    Rule state lives in memory, per session, in least-recently-seen order so
+    idle sessions are evicted from the front. Only the event loop touches it.
+    """
+
+    def __init__(self, rules: Optional[List[AlertRule]] = None):
+        self.rules = rules or [AlertRule(**rule) for rule in settings.ALERT_RULES]
+        self.preferences = PreferenceCache()
+        self._sessions: "OrderedDict[str, _SessionState]" = OrderedDict()
+        self.metrics = {
+            "evaluated": 0,
+            "fired": 0,
+            "suppressed_cooldown": 0,
+            "suppressed_preferences": 0,
+        }
+
+    def evaluate(
+        self, session_id: str, result: Dict[str, Any], now: Optional[float] = None
+    ) -> List[AlertRule]:
+        """
+        Updates the session's rule state with one prediction and returns the
+        rules that fire. Pure in-memory, O(number of rules).
+        """
+        if now is None:
+            now = time.monotonic()
+        fired = []
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _SessionState()
+        else:
+            self._sessions.move_to_end(session_id)
+        session.last_seen = now
+
+        for rule in self.rules:
+            state = session.rules.setdefault(rule.name, _RuleState())
+            if not rule.matches(result):
+                state.streak = 0
+                continue
+            state.streak += 1
+            if state.streak < rule.consecutive:
+                continue
+            if now < state.cooldown_until:
+                self.metrics["suppressed_cooldown"] += 1
+                continue
+            state.streak = 0
+            state.cooldown_until = now + rule.cooldown_sec
+            fired.append(rule)
+
+        self._evict_idle(now)
+
+        self.metrics["evaluated"] += 1
+        return fired
+
+    def _evict_idle(self, now: float):
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_seen < settings.ALERT_SESSION_IDLE_SEC:
+                break
+            del self._sessions[session_id]
+
+    async def process(
+        self, session_id: str, user_id: Optional[str], result: Dict[str, Any]
+    ) -> List[str]:
+        """
+        Evaluates a prediction and dispatches notifications for fired rules,
+        honouring the user's (cached) notification preference. Returns the
+        rules actually dispatched (none for anonymous frames: nobody to notify).
+        """
+        fired = self.evaluate(session_id, result)
+        if not fired or not user_id:
+            return []
+
+        if not await self.preferences.notifications_enabled(user_id):
+            self.metrics["suppressed_preferences"] += len(fired)
+            return []
+
+        from services.notification import notification_service
+
+        for rule in fired:
+            await notification_service.create_alert(
+                user_id=user_id, message=rule.message, type=rule.type, rule=rule.name
+            )
+        self.metrics["fired"] += len(fired)
+        return [rule.name for rule in fired]
+
+
+alert_engine = AlertRuleEngine()
@@ -0,0 +1,312 @@
+# backend/app/src/services/change_feed.py
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from core.config import settings
+from db.client import mongo_client
+from db.models import Alert, Project
+from pymongo.errors import OperationFailure, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# Change stream errors after which resuming is impossible: the token fell
+# off the oplog (ChangeStreamHistoryLost) or the stream was invalidated
+RESUME_LOST_CODES = {260, 280, 286}
+NOT_REPLICA_SET_CODE = 40573
+
+# Tells clients that events may have been missed: refetch, then keep streaming
+RESYNC_FRAME = b"event: resync\ndata: {}\n\n"
+
+
+class FeedUnavailable(Exception):
+    """Change streams are unsupported (standalone MongoDB) or the worker is full."""
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)  # ObjectId
+
+
+def encode_event(event_id: str, kind: str, data: Dict[str, Any]) -> bytes:
+    """One SSE frame, encoded once and shared by every subscriber of the user."""
+    payload = json.dumps(data, default=_json_default, separators=(",", ":"))
+    return f"id: {event_id}\nevent: {kind}\ndata: {payload}\n\n".encode()
+
+
+class Subscription:
+    """
+    One open stream. Events are queued as encoded frames; a full queue means
+    the client cannot keep up, so it is disconnected (None ends the stream)
+    instead of buffering without bound. It resumes from its Last-Event-ID.
+    """
+
+    __slots__ = ("user_id", "queue", "closed")
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(
+            maxsize=settings.CHANGE_FEED_QUEUE_SIZE + 1  # Room for the end marker
+        )
+        self.closed = False
+
+    def push(self, frame: bytes) -> bool:
+        if self.closed:
+            return False
+        if self.queue.qsize() >= settings.CHANGE_FEED_QUEUE_SIZE:
+            self.close()
+            return False
+        self.queue.put_nowait(frame)
+        return True
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()  # The client replays them on reconnect
+        self.queue.put_nowait(None)
+
+
+class ChangeFeed:
+    """
+    Pushes project and alert changes to the owning user's open SSE streams.
+    One change stream per process (not per client) watches both collections;
+    events are routed to per-user subscriber queues. Recent events are kept
+    in a replay ring keyed by their resume token, which doubles as the SSE
+    event id, so a reconnecting client gets what it missed.
+
+    The ring is per process and only holds events seen since this worker
+    started. A client that reconnects to another worker, or to a recycled
+    one, is replayed only if that worker already saw its last event;
+    otherwise it gets `resync` and refetches its state once (one
+    conditional GET /data/projects, usually a 304), then streams again.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._replay: Deque[Tuple[str, str, bytes]] = deque(
+            maxlen=settings.CHANGE_FEED_REPLAY_SIZE
+        )
+        self._task: Optional[asyncio.Task] = None
+        self._resume_token: Optional[Dict[str, Any]] = None
+        self.available = False
+        self.metrics = {
+            "events": 0,
+            "delivered": 0,
+            "unroutable": 0,
+            "slow_disconnects": 0,
+            "replayed": 0,
+            "resyncs": 0,
+            "stream_errors": 0,
+        }
+
+    # --- Consumer (one per process) ---
+
+    async def start(self):
+        if not settings.CHANGE_FEED_ENABLED:
+            return
+        await self._enable_pre_images()
+        self.available = True
+        self._task = asyncio.create_task(self._consume())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.available = False
+        self.disconnect_all()
+
+    async def _enable_pre_images(self):
+        # Deleted projects carry no document; the pre-image has the owner
+        try:
+            await mongo_client.database.command(
+                "collMod",
+                Project.Settings.name,
+                changeStreamPreAndPostImages={"enabled": True},
+            )
+        except PyMongoError as e:
+            logger.warning("Project pre-images unavailable, deletes not fed: %s", e)
+
+    def _pipeline(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "$match": {
+                    "$or": [
+                        {
+                            "ns.coll": Project.Settings.name,
+                            "operationType": {
+                                "$in": ["insert", "update", "replace", "delete"]
+                            },
+                        },
+                        {
+                            "ns.coll": Alert.Settings.name,
+                            "operationType": "insert",
+                        },
+                    ]
+                }
+            },
+            # Only what routing and the event need (the _id is the resume token)
+            {
+                "$project": {
+                    "operationType": 1,
+                    "ns.coll": 1,
+                    "documentKey": 1,
+                    "fullDocument": 1,
+                    "fullDocumentBeforeChange.owner_id": 1,
+                }
+            },
+        ]
+
+    async def _consume(self):
+        backoff = 1.0
+        while True:
+            try:
+                async with mongo_client.database.watch(
+                    self._pipeline(),
+                    full_document="updateLookup",
+                    full_document_before_change="whenAvailable",
+                    resume_after=self._resume_token,
+                ) as stream:
+                    logger.info(
+                        "Change feed consuming (resumed=%s)",
+                        self._resume_token is not None,
+                    )
+                    backoff = 1.0
+                    while stream.alive:
+                        # try_next also advances the token on empty batches,
+                        # so a restart never replays or skips an idle period
+                        change = await stream.try_next()
+                        if change is not None:
+                            self.publish(change)
+                        self._resume_token = stream.resume_token
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if e.code == NOT_REPLICA_SET_CODE:
+                    logger.error("Change feed disabled, MongoDB is not a replica set")
+                    self.available = False
+                    self.disconnect_all()
+                    return
+                self.metrics["stream_errors"] += 1
+                logger.error("Change stream failed: %s", e)
+                if e.code in RESUME_LOST_CODES:
+                    self._resume_token = None
+                    self.broadcast_resync()
+            except PyMongoError as e:
+                self.metrics["stream_errors"] += 1
+                logger.warning("Change stream interrupted, resuming: %s", e)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    # --- Fan-out ---
+
+    def publish(self, change: Dict[str, Any]):
+        """Routes one change event to its user's subscribers (no I/O)."""
+        op = change["operationType"]
+        document = change.get("fullDocument")
+        if change["ns"]["coll"] == Alert.Settings.name:
+            kind, user_id = "alert", (document or {}).get("user_id")
+        else:
+            kind = "project"
+            before = change.get("fullDocumentBeforeChange") or {}
+            user_id = (document or before).get("owner_id")
+            if document is None:
+                # Deleted (or deleted before the update was looked up)
+                op, document = "delete", change["documentKey"]
+        if user_id is None:
+            self.metrics["unroutable"] += 1
+            return
+        user_id = str(user_id)
+        event_id = change["_id"]["_data"]
+        op = "update" if op == "replace" else op
+        frame = encode_event(event_id, kind, {"op": op, kind: document})
+
+        self.metrics["events"] += 1
+        self._replay.append((event_id, user_id, frame))
+        for subscription in list(self._subscribers.get(user_id, ())):
+            if subscription.push(frame):
+                self.metrics["delivered"] += 1
+            else:
+                self.metrics["slow_disconnects"] += 1
+                self.unsubscribe(subscription)
+
+    def ensure_available(self):
+        """Raises FeedUnavailable when a new stream cannot be served here."""
+        if not self.available:
+            raise FeedUnavailable("Change feed unavailable, poll instead.")
+        if self.subscriber_count >= settings.CHANGE_FEED_MAX_SUBSCRIBERS:
+            raise FeedUnavailable("Too many open streams on this worker.")
+
+    def subscribe(
+        self, user_id: str, last_event_id: Optional[str] = None
+    ) -> Tuple[Subscription, List[bytes]]:
+        """
+        Registers a stream and returns it with the frames to send first:
+        the events after `last_event_id` from the replay ring, or a resync
+        frame when that event is no longer there.
+        """
+        self.ensure_available()
+        subscription = Subscription(user_id)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        if not last_event_id:
+            return subscription, []
+
+        backlog, found = [], False
+        for event_id, owner, frame in self._replay:
+            if found and owner == user_id:
+                backlog.append(frame)
+            elif event_id == last_event_id:
+                found = True
+        if not found:
+            self.metrics["resyncs"] += 1
+            return subscription, [RESYNC_FRAME]
+        self.metrics["replayed"] += len(backlog)
+        return subscription, backlog
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscribers.get(subscription.user_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscribers[subscription.user_id]
+
+    def broadcast_resync(self):
+        """After a lost resume token: clients may have missed events."""
+        self._replay.clear()
+        for subscriptions in list(self._subscribers.values()):
+            for subscription in list(subscriptions):
+                if not subscription.push(RESYNC_FRAME):
+                    self.unsubscribe(subscription)
+
+    def disconnect_all(self):
+        """Ends every open stream (shutdown, recycling); clients reconnect."""
+        for subscriptions in list(self._subscribers.values()):
+            for subscription in list(subscriptions):
+                subscription.close()
+        self._subscribers.clear()
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscribers.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "available": self.available,
+            "subscribers": self.subscriber_count,
+            "users": len(self._subscribers),
+            "replay_buffered": len(self._replay),
+        }
+
+
+change_feed = ChangeFeed()
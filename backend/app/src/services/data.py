@@ -1,9 +1,14 @@
 # backend/app/src/services/data.py (UPDATED)
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
-from db.models import Project, PydanticObjectId
+from beanie.odm.queries.find import FindMany, FindOne
+from core.conditional import make_etag
+from db.models import Project, ProjectStamp, PydanticObjectId
+from db.routing import find_routed
+from services.rollup import rollup_service
+from services.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -13,45 +18,94 @@ class DataService:
     Manages CRUD for project-specific entities (e.g., Projects, Documents).
     """
 
+    def __init__(self):
+        # Concurrent listings for the same owner share one query
+        self.projects_by_owner_flight = SingleFlight("projects_by_owner")
+
     # --- Project Management CRUD ---
 
     async def create_project(
-        self, owner_id: PydanticObjectId, name: str, details: Dict[str, Any]
+        self,
+        owner_id: PydanticObjectId,
+        name: str,
+        details: Dict[str, Any],
+        session: Any = None,
     ) -> Project:
         """
-        Creates a new project document for a user.
+        Creates a new project document for a user. Pass a causal session
+        (db.routing.causal_session) to list the new project from a secondary.
         """
         project = Project(
             owner_id=owner_id, name=name, details=details, status="Active"
         )
         # Async Querying: Non-blocking operation
-        await project.insert()
+        await project.insert(session=session)
+        rollup_service.record_project_status(project.status)
         return project
 
+    # --- Query Builders (explained by db.query_plans) ---
+
+    def project_by_id_query(
+        self, project_id: PydanticObjectId, owner_id: PydanticObjectId
+    ) -> FindOne[Project]:
+        return Project.find_one(Project.id == project_id, Project.owner_id == owner_id)
+
+    def projects_by_owner_query(
+        self, owner_id: PydanticObjectId, limit: int = 100
+    ) -> FindMany[Project]:
+        return (
+            Project.find(Project.owner_id == owner_id)
+            .sort(-Project.created_at)
+            .limit(limit)
+        )
+
+    def project_stamps_query(
+        self, owner_id: PydanticObjectId, limit: int = 100
+    ) -> FindMany[ProjectStamp]:
+        return self.projects_by_owner_query(owner_id, limit).project(ProjectStamp)
+
     async def get_project_by_id(
         self, project_id: PydanticObjectId, owner_id: PydanticObjectId
     ) -> Optional[Project]:
         """
         Retrieves a specific project, ensuring ownership check.
         """
-        return await Project.find_one(
-            Project.id == project_id, Project.owner_id == owner_id
-        )
+        return await self.project_by_id_query(project_id, owner_id)
 
     async def get_projects_by_owner(
-        self, owner_id: PydanticObjectId, limit: int = 100
+        self, owner_id: PydanticObjectId, limit: int = 100, session: Any = None
     ) -> List[Project]:
         """
         Retrieves a list of projects owned by a specific user.
-        Uses the compound index for fast retrieval.
+        Uses the (owner_id, created_at) index for filtering and sorting.
+        Routed as a "list" read (may be served by a secondary); with a causal
+        session it observes the session's earlier writes. Concurrent identical
+        calls without a session share one query and the same list.
         """
-        return (
-            await Project.find(Project.owner_id == owner_id)
-            .sort(-Project.created_at)
-            .limit(limit)
-            .to_list()
+        query = self.projects_by_owner_query(owner_id, limit)
+        if session is not None:
+            return await find_routed(query, "list", session)
+        return await self.projects_by_owner_flight.do(
+            (str(owner_id), limit), lambda: find_routed(query, "list")
         )
 
+    @staticmethod
+    def projects_etag(
+        owner_id: PydanticObjectId, projects: List[Union[Project, ProjectStamp]]
+    ) -> str:
+        """Changes whenever a listed project is added, removed or updated."""
+        return make_etag("projects", owner_id, [(p.id, p.updated_at) for p in projects])
+
+    async def get_projects_etag(
+        self, owner_id: PydanticObjectId, limit: int = 100
+    ) -> str:
+        """
+        ETag of get_projects_by_owner from an (_id, updated_at) projection of
+        the same query and read routing, without loading the documents.
+        """
+        stamps = await find_routed(self.project_stamps_query(owner_id, limit), "list")
+        return self.projects_etag(owner_id, stamps)
+
     async def update_project(
         self,
         project_id: PydanticObjectId,
@@ -63,12 +117,23 @@ class DataService:
         """
         project = await self.get_project_by_id(project_id, owner_id)
         if project:
+            previous_status = project.status
             # Update fields dynamically and set the updated_at timestamp
             project.details.update(updates.pop("details", {}))
             project.updated_at = datetime.utcnow()
 
-            # Use Beanie's set operation for efficiency
-            await project.set(updates)
+            # Use Beanie's set operation for efficiency; details and
+            # updated_at are set with it (updated_at drives the listing ETag)
+            await project.set(
+                {
+                    **updates,
+                    Project.details: project.details,
+                    Project.updated_at: project.updated_at,
+                }
+            )
+            rollup_service.record_project_status(
+                updates.get("status", previous_status), previous_status
+            )
 
             # Refetch to ensure latest state is returned (optional, but good practice)
             return await self.get_project_by_id(project_id, owner_id)
@@ -82,8 +147,14 @@ class DataService:
         Logically deletes a project.
         """
         # In a real app, you might set a status like 'archived' instead of deleting
-        result = await Project.delete({"_id": project_id, "owner_id": owner_id})
-        return result.deleted_count > 0
+        # find_one_and_delete returns the status for the rollups in one round trip
+        deleted = await Project.get_motor_collection().find_one_and_delete(
+            {"_id": project_id, "owner_id": owner_id}, projection={"status": 1}
+        )
+        if deleted is None:
+            return False
+        rollup_service.record_project_status(None, deleted.get("status"))
+        return True
 
 
 data_service = DataService()
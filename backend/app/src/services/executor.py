@@ -0,0 +1,155 @@
+# backend/app/src/services/executor.py
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceOverloaded(Exception):
+    """The queue is full or the estimated wait exceeds ML_SERVICE_TIMEOUT_SEC."""
+
+
+class InferenceTimeout(Exception):
+    """Inference did not complete within ML_SERVICE_TIMEOUT_SEC."""
+
+
+# Module-level entry points so they can be pickled to a process pool; in a
+# child process they use that process's own MLService/runtime.
+def _init_process():
+    from services.inference import configure_threads
+    from services.ml import ml_service
+
+    configure_threads()
+    ml_service.load_runtime()
+
+
+def _predict(payload: Dict[str, Any]):
+    from services.ml import ml_service
+
+    start = time.perf_counter()
+    return ml_service.get_prediction(payload), time.perf_counter() - start
+
+
+def _predict_batch(inputs: List[Dict[str, Any]]):
+    from services.ml import ml_service
+
+    start = time.perf_counter()
+    return ml_service.get_batch_prediction(inputs), time.perf_counter() - start
+
+
+class InferenceExecutor:
+    """
+    Runs CPU-bound inference off the event loop with admission control.
+    A thread pool suits runtimes that release the GIL (torch, onnxruntime);
+    a process pool isolates GIL-bound models. The number of in-flight jobs is
+    bounded, and requests whose estimated queue wait exceeds the timeout are
+    rejected up front instead of timing out after waiting.
+    """
+
+    def __init__(self):
+        self._pool: Executor = None
+        self._lock = threading.Lock()  # Done callbacks run on pool threads
+        self._in_flight = 0
+        # EWMA of the service time, seeded so the first requests are admitted
+        self._service_time = 0.005
+        self.metrics = {"completed": 0, "rejected": 0, "timeouts": 0, "errors": 0}
+
+    @property
+    def workers(self) -> int:
+        return settings.ML_EXECUTOR_WORKERS
+
+    def start(self):
+        if self._pool is not None:
+            return
+        if settings.ML_EXECUTOR_MODE == "process":
+            # Note: model swaps in the parent are not propagated to children
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_process
+            )
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="inference"
+            )
+        logger.info(
+            "Inference executor started (%s, %d workers).",
+            settings.ML_EXECUTOR_MODE,
+            self.workers,
+        )
+
+    def stop(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def estimated_wait(self) -> float:
+        """Seconds a newly admitted job would wait before starting."""
+        queued = max(self._in_flight - self.workers + 1, 0)
+        return queued * self._service_time / self.workers
+
+    def _admit(self):
+        with self._lock:
+            if (
+                self._in_flight >= self.workers + settings.ML_EXECUTOR_MAX_QUEUE
+                or self.estimated_wait() > settings.ML_SERVICE_TIMEOUT_SEC
+            ):
+                self.metrics["rejected"] += 1
+                raise InferenceOverloaded("Inference capacity exhausted.")
+            self._in_flight += 1
+
+    def _done(self, future):
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self.metrics["errors"] += 1
+                return
+            self.metrics["completed"] += 1
+            elapsed = future.result()[1]
+            self._service_time = 0.9 * self._service_time + 0.1 * elapsed
+
+    async def _run(self, fn, arg):
+        self.start()
+        self._admit()
+        try:
+            future = self._pool.submit(fn, arg)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        future.add_done_callback(self._done)
+        try:
+            # On timeout the job is cancelled if it has not started yet;
+            # a running job finishes but its result is discarded
+            result, _ = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=settings.ML_SERVICE_TIMEOUT_SEC
+            )
+        except asyncio.TimeoutError:
+            self.metrics["timeouts"] += 1
+            raise InferenceTimeout("Inference timed out.")
+        return result
+
+    async def predict(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._run(_predict, payload)
+
+    async def predict_batch(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await self._run(_predict_batch, inputs)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "mode": settings.ML_EXECUTOR_MODE,
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            "service_time_ms": round(self._service_time * 1000, 3),
+            "estimated_wait_ms": round(self.estimated_wait() * 1000, 3),
+        }
+
+
+inference_executor = InferenceExecutor()
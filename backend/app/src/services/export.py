@@ -0,0 +1,325 @@
+# backend/app/src/services/export.py
+"""
+Incremental Parquet snapshots of operational collections for offline use.
+
+Each run exports the documents whose watermark field lies in
+(last watermark, now - EXPORT_LAG_SEC] into append-only, zstd-compressed
+files partitioned by day:
+
+    <EXPORT_DIR>/<table>/date=YYYY-MM-DD/part-<run>-<n>.parquet
+
+Reads use the "export" read class (db.routing): a secondary when available,
+within MONGO_MAX_STALENESS_SEC, so the scans stay off the primary. A window
+is only exported once every write in it must have replicated and left the
+telemetry buffer (EXPORT_LAG_SEC is validated against both, see core.config),
+and the watermark advances to the newest exported value, not the window end.
+Updated documents (users, projects) are exported again under their new
+`updated_at`, and an interrupted run is re-exported in full; readers that need
+one row per document keep the latest version per id (see latest_versions()).
+Users stored before `updated_at` existed lack the field and are only exported
+after their next update, unless backfilled once with
+    db.users.updateMany({updated_at: {$exists: false}},
+                        [{$set: {updated_at: "$created_at"}}])
+Analysts, the dashboard and batch jobs read the snapshots memory-mapped with
+read_snapshot() instead of querying MongoDB.
+"""
+
+import fcntl
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from core.config import settings
+from db.routing import read_preference
+from pymongo import MongoClient
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_FILE = "_watermarks.json"
+LOCK_FILE = "_export.lock"
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    """
+    Export definition: `fields` is an inclusion projection, so fields added to
+    the model later (e.g. secrets) are never exported by accident.
+    """
+
+    name: str
+    collection: str
+    watermark: str
+    fields: List[str]
+    schema: pa.Schema
+    row: Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def _user_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": str(doc["_id"]),
+        "email": doc.get("email"),
+        "username": doc.get("username"),
+        "is_active": doc.get("is_active"),
+        "preferences": json.dumps(doc.get("preferences") or {}),
+        "created_at": doc.get("created_at"),
+        "updated_at": doc["updated_at"],
+    }
+
+
+def _project_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": str(doc["_id"]),
+        "owner_id": str(doc.get("owner_id")),
+        "name": doc.get("name"),
+        "status": doc.get("status"),
+        "details": json.dumps(doc.get("details") or {}, default=str),
+        "created_at": doc.get("created_at"),
+        "updated_at": doc["updated_at"],
+    }
+
+
+def _prediction_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    meta = doc.get("meta") or {}
+    return {
+        "id": str(doc["_id"]),
+        "ts": doc["ts"],
+        "vehicle_id": meta.get("vehicle_id"),
+        "user_id": meta.get("user_id"),
+        "prediction": doc.get("prediction"),
+        "score": doc.get("score"),
+        "model_version": doc.get("model_version"),
+        "features": doc.get("features") or [],
+    }
+
+
+TIMESTAMP = pa.timestamp("ms")
+
+TABLES = [
+    ExportTable(
+        name="users",
+        collection="users",
+        watermark="updated_at",
+        fields=[
+            "email",
+            "username",
+            "is_active",
+            "preferences",
+            "created_at",
+            "updated_at",
+        ],
+        schema=pa.schema(
+            [
+                ("id", pa.string()),
+                ("email", pa.string()),
+                ("username", pa.string()),
+                ("is_active", pa.bool_()),
+                ("preferences", pa.string()),
+                ("created_at", TIMESTAMP),
+                ("updated_at", TIMESTAMP),
+            ]
+        ),
+        row=_user_row,
+    ),
+    ExportTable(
+        name="projects",
+        collection="projects",
+        watermark="updated_at",
+        fields=["owner_id", "name", "status", "details", "created_at", "updated_at"],
+        schema=pa.schema(
+            [
+                ("id", pa.string()),
+                ("owner_id", pa.string()),
+                ("name", pa.string()),
+                ("status", pa.string()),
+                ("details", pa.string()),
+                ("created_at", TIMESTAMP),
+                ("updated_at", TIMESTAMP),
+            ]
+        ),
+        row=_project_row,
+    ),
+    ExportTable(
+        name="predictions",
+        collection="prediction_events",
+        watermark="ts",
+        fields=["ts", "meta", "prediction", "score", "model_version", "features"],
+        schema=pa.schema(
+            [
+                ("id", pa.string()),
+                ("ts", TIMESTAMP),
+                ("vehicle_id", pa.string()),
+                ("user_id", pa.string()),
+                ("prediction", pa.string()),
+                ("score", pa.float64()),
+                ("model_version", pa.string()),
+                ("features", pa.list_(pa.float32())),
+            ]
+        ),
+        row=_prediction_row,
+    ),
+]
+
+
+def export_query(
+    table: ExportTable, since: Optional[datetime], until: datetime
+) -> Tuple[Dict[str, Any], List[Tuple[str, int]]]:
+    """
+    Filter and sort of one export window; served by an index on the
+    watermark (checked by db.query_plans).
+    """
+    window = {"$lte": until}
+    if since is not None:
+        window["$gt"] = since
+    return {table.watermark: window}, [(table.watermark, 1)]
+
+
+class ExportService:
+    """
+    Writes incremental Parquet snapshots (run by the `export_snapshots` beat task).
+    """
+
+    def __init__(self, export_dir: Optional[str] = None):
+        self.export_dir = export_dir or settings.EXPORT_DIR
+
+    def _load_watermarks(self) -> Dict[str, str]:
+        path = os.path.join(self.export_dir, WATERMARK_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_watermarks(self, watermarks: Dict[str, str]):
+        path = os.path.join(self.export_dir, WATERMARK_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(watermarks, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def _write_partitions(
+        self, table: ExportTable, rows: List[Dict[str, Any]], run_id: str, seq: int
+    ) -> int:
+        partitions: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            partitions.setdefault(f"{row[table.watermark]:%Y-%m-%d}", []).append(row)
+        for day, day_rows in partitions.items():
+            directory = os.path.join(self.export_dir, table.name, f"date={day}")
+            os.makedirs(directory, exist_ok=True)
+            name = f"part-{run_id}-{seq:05d}.parquet"
+            # Dot-prefixed files are ignored by Parquet readers until renamed
+            tmp_path = os.path.join(directory, "." + name)
+            pq.write_table(
+                pa.Table.from_pylist(day_rows, schema=table.schema),
+                tmp_path,
+                compression=settings.EXPORT_COMPRESSION,
+            )
+            os.replace(tmp_path, os.path.join(directory, name))
+        return len(partitions)
+
+    def export_table(
+        self, database, table: ExportTable, since: Optional[datetime], until: datetime
+    ) -> Dict[str, int]:
+        query, sort = export_query(table, since, until)
+        cursor = (
+            database[table.collection]
+            .find(
+                query,
+                projection=table.fields,
+                batch_size=settings.EXPORT_BATCH_ROWS,
+            )
+            .sort(sort)
+        )
+        run_id = until.strftime("%Y%m%dT%H%M%S")
+        stats = {"rows": 0, "files": 0, "watermark": None}
+        rows: List[Dict[str, Any]] = []
+        for doc in cursor:
+            rows.append(table.row(doc))
+            stats["watermark"] = rows[-1][table.watermark]  # Sorted ascending
+            if len(rows) >= settings.EXPORT_BATCH_ROWS:
+                stats["files"] += self._write_partitions(
+                    table, rows, run_id, stats["files"]
+                )
+                stats["rows"] += len(rows)
+                rows = []
+        if rows:
+            stats["files"] += self._write_partitions(
+                table, rows, run_id, stats["files"]
+            )
+            stats["rows"] += len(rows)
+        if stats["watermark"] is not None:
+            stats["watermark"] = stats["watermark"].isoformat()
+        return stats
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Exports every table once. Returns per-table stats, or None when another
+        run still holds the lock.
+        """
+        os.makedirs(self.export_dir, exist_ok=True)
+        with open(os.path.join(self.export_dir, LOCK_FILE), "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                logger.info("Snapshot export already running; skipping.")
+                return None
+
+            client = MongoClient(
+                settings.MONGO_URI,
+                read_preference=read_preference("export"),
+                serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            )
+            try:
+                database = client.get_default_database()
+                # Lag behind "now" so buffered writes (telemetry) have landed
+                until = datetime.utcnow() - timedelta(seconds=settings.EXPORT_LAG_SEC)
+                watermarks = self._load_watermarks()
+                results = {}
+                for table in TABLES:
+                    since = watermarks.get(table.name)
+                    since = datetime.fromisoformat(since) if since else None
+                    results[table.name] = self.export_table(
+                        database, table, since, until
+                    )
+                    # Only after the files are in place: a crash re-exports the
+                    # window. An empty window keeps the previous watermark.
+                    if results[table.name]["watermark"] is not None:
+                        watermarks[table.name] = results[table.name]["watermark"]
+                        self._save_watermarks(watermarks)
+                    logger.info("Exported %s: %s", table.name, results[table.name])
+                return results
+            finally:
+                client.close()
+
+
+def read_snapshot(
+    table: str,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List] = None,
+    export_dir: Optional[str] = None,
+) -> pa.Table:
+    """
+    Reads a snapshot table memory-mapped. Partition pruning works on `date`,
+    e.g. filters=[("date", ">=", "2025-01-01")].
+    """
+    path = os.path.join(export_dir or settings.EXPORT_DIR, table)
+    return pq.read_table(
+        path,
+        columns=columns,
+        filters=filters,
+        memory_map=True,
+        partitioning="hive",
+    )
+
+
+def latest_versions(data: pa.Table, watermark: str = "updated_at"):
+    """
+    Collapses re-exported documents to their latest version (pandas DataFrame).
+    """
+    frame = data.to_pandas()
+    return frame.sort_values(watermark).drop_duplicates("id", keep="last")
+
+
+export_service = ExportService()
@@ -0,0 +1,224 @@
+# backend/app/src/services/features.py
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+from core.config import settings
+
+# Per-frame driver signals understood by the engine (others are ignored):
+# eye aspect ratio, mouth aspect ratio (yawning), head pitch and yaw in degrees.
+SIGNALS = ("ear", "mar", "head_pitch", "head_yaw")
+
+# Order of the windowed features appended to the model input
+FEATURE_NAMES = [f"{s}_{stat}" for s in SIGNALS for stat in ("mean", "std")] + [
+    "perclos",
+    "blink_rate_per_min",
+]
+
+_EYES_CLOSED = len(SIGNALS)  # Extra channel: 1.0 while the eyes are closed
+NAN = float("nan")
+
+
+class RollingWindow:
+    """
+    Time-bounded sliding window over several channels sharing one timestamp
+    ring. Backed by fixed-capacity array('d') buffers; count, sum and sum of
+    squares are updated incrementally, so push/evict are O(1) per channel.
+    NaN marks a value missing from a sample; it is excluded from the stats
+    of its channel only.
+    """
+
+    __slots__ = (
+        "capacity",
+        "horizon",
+        "channels",
+        "_times",
+        "_values",
+        "_sum",
+        "_sumsq",
+        "_count",
+        "_head",
+        "_size",
+        "_evictions",
+    )
+
+    def __init__(self, channels: int, capacity: int, horizon_sec: float):
+        self.capacity = capacity
+        self.horizon = horizon_sec
+        self.channels = channels
+        self._times = array("d", bytes(8 * capacity))
+        self._values = [array("d", bytes(8 * capacity)) for _ in range(channels)]
+        self._sum = [0.0] * channels
+        self._sumsq = [0.0] * channels
+        self._count = [0] * channels
+        self._head = 0
+        self._size = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, ts: float, values: Sequence[float]):
+        self.expire(ts)
+        if self._size == self.capacity:
+            self._evict_oldest()
+        slot = (self._head + self._size) % self.capacity
+        self._times[slot] = ts
+        for channel, value in enumerate(values):
+            self._values[channel][slot] = value
+            if value == value:  # Not NaN
+                self._sum[channel] += value
+                self._sumsq[channel] += value * value
+                self._count[channel] += 1
+        self._size += 1
+
+    def expire(self, now: float):
+        """Drops samples older than the horizon (amortized O(1))."""
+        while self._size and now - self._times[self._head] > self.horizon:
+            self._evict_oldest()
+
+    def _evict_oldest(self):
+        slot = self._head
+        for channel in range(self.channels):
+            value = self._values[channel][slot]
+            if value == value:
+                self._sum[channel] -= value
+                self._sumsq[channel] -= value * value
+                self._count[channel] -= 1
+        self._head = (self._head + 1) % self.capacity
+        self._size -= 1
+        self._evictions += 1
+        if self._evictions >= self.capacity:
+            # Bound floating-point drift of the running sums
+            self._recompute()
+
+    def _recompute(self):
+        self._evictions = 0
+        slots = [(self._head + i) % self.capacity for i in range(self._size)]
+        for channel in range(self.channels):
+            present = [v for v in (self._values[channel][s] for s in slots) if v == v]
+            self._sum[channel] = sum(present)
+            self._sumsq[channel] = sum(v * v for v in present)
+            self._count[channel] = len(present)
+
+    def count(self, channel: int = 0) -> int:
+        """Samples in the window that carry a value for `channel`."""
+        return self._count[channel]
+
+    def mean(self, channel: int = 0) -> float:
+        count = self._count[channel]
+        return self._sum[channel] / count if count else 0.0
+
+    def variance(self, channel: int = 0) -> float:
+        count = self._count[channel]
+        if not count:
+            return 0.0
+        mean = self._sum[channel] / count
+        # Clamp tiny negative values caused by rounding
+        return max(self._sumsq[channel] / count - mean * mean, 0.0)
+
+
+class SessionFeatures:
+    """
+    Rolling state of one driving session: the signal window plus a small
+    window of blink events used for the blink rate.
+    """
+
+    __slots__ = ("signals", "blinks", "eyes_closed", "last_seen")
+
+    def __init__(self):
+        self.signals = RollingWindow(
+            len(SIGNALS) + 1,
+            settings.FEATURE_WINDOW_CAPACITY,
+            settings.FEATURE_WINDOW_SEC,
+        )
+        self.blinks = RollingWindow(
+            0, settings.FEATURE_MAX_BLINKS, settings.FEATURE_WINDOW_SEC
+        )
+        self.eyes_closed = False
+        self.last_seen = 0.0
+
+    def update(self, ts: float, signals: Dict[str, float]):
+        # A signal absent from the frame is missing (NaN), not zero
+        values = [
+            float(signals[name]) if signals.get(name) is not None else NAN
+            for name in SIGNALS
+        ]
+        ear = values[0]
+        if ear == ear:
+            closed = ear < settings.FEATURE_EAR_CLOSED_THRESHOLD
+            if self.eyes_closed and not closed:
+                self.blinks.push(ts, ())  # Blink = closed -> open transition
+            self.eyes_closed = closed
+            eyes_closed = 1.0 if closed else 0.0
+        else:
+            eyes_closed = NAN  # Eye state unknown: no PERCLOS sample, no blink
+        self.signals.push(ts, values + [eyes_closed])
+        self.blinks.expire(ts)
+
+    def vector(self) -> List[float]:
+        features = []
+        for channel in range(len(SIGNALS)):
+            features.append(self.signals.mean(channel))
+            features.append(self.signals.variance(channel) ** 0.5)
+        features.append(self.signals.mean(_EYES_CLOSED))  # PERCLOS
+        features.append(len(self.blinks) * 60.0 / settings.FEATURE_WINDOW_SEC)
+        return features
+
+
+class FeatureEngine:
+    """
+    Maintains per-session sliding-window features next to the MLService.
+    Memory is bounded by FEATURE_MAX_SESSIONS fixed-size sessions; sessions
+    idle for FEATURE_SESSION_IDLE_SEC (or least recently used) are evicted.
+    """
+
+    def __init__(self):
+        # Ordered by last update, so idle/LRU sessions are always at the front
+        self._sessions: "OrderedDict[str, SessionFeatures]" = OrderedDict()
+        self.metrics = {"sessions_created": 0, "sessions_evicted": 0}
+
+    def update(
+        self, session_id: str, signals: Dict[str, float], ts: Optional[float] = None
+    ) -> List[float]:
+        """
+        Adds one frame of signals and returns the windowed feature vector
+        (ordered as FEATURE_NAMES).
+        """
+        now = time.time()
+        if ts is None:
+            ts = now
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = SessionFeatures()
+            self.metrics["sessions_created"] += 1
+        else:
+            self._sessions.move_to_end(session_id)
+        session.update(ts, signals)
+        session.last_seen = now  # Server clock, independent of client timestamps
+        self.evict_idle(now)
+        return session.vector()
+
+    def evict_idle(self, now: Optional[float] = None):
+        if now is None:
+            now = time.time()
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if (
+                len(self._sessions) <= settings.FEATURE_MAX_SESSIONS
+                and now - session.last_seen < settings.FEATURE_SESSION_IDLE_SEC
+            ):
+                break
+            del self._sessions[session_id]
+            self.metrics["sessions_evicted"] += 1
+
+    def end_session(self, session_id: str):
+        self._sessions.pop(session_id, None)
+
+    @property
+    def active_sessions(self) -> int:
+        return len(self._sessions)
+
+
+feature_engine = FeatureEngine()
@@ -0,0 +1,259 @@
+# backend/app/src/services/inference.py
+"""
+CPU inference runtimes for MLService.
+
+Backends score a batch of feature vectors and return one risk score per row:
+- "placeholder": the mean-of-features stand-in used until a model is exported
+- "torchscript": a torch.jit graph (torch.jit.load)
+- "onnx": an ONNX graph run by onnxruntime
+
+Dynamic int8 quantization is applied when exporting (quantized graphs are then
+loaded like any other). Thread pools are sized per process so that all API and
+Celery processes on a box together use about one thread per core.
+
+Usage:
+    python -m services.inference benchmark --torchscript m.pt --onnx m.onnx --dim 16
+"""
+
+import argparse
+import logging
+import os
+import random
+import time
+from typing import Dict, List, Optional, Sequence
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_threads_configured = False
+
+
+def thread_budget() -> Dict[str, int]:
+    """
+    Intra/inter-op thread counts for one process: explicit settings win,
+    otherwise the cores are divided among all inference processes on the box.
+    """
+    processes = max(settings.ML_WEB_WORKERS + settings.ML_CELERY_CONCURRENCY, 1)
+    intra = settings.ML_INTRA_OP_THREADS or max((os.cpu_count() or 1) // processes, 1)
+    return {"intra_op": intra, "inter_op": settings.ML_INTER_OP_THREADS}
+
+
+def configure_threads() -> Dict[str, int]:
+    """
+    Applies the thread budget to torch in this process. Must run after fork
+    (gunicorn worker / Celery child) and before the first forward pass.
+    """
+    global _threads_configured
+    budget = thread_budget()
+    if _threads_configured:
+        return budget
+    try:
+        import torch
+    except ImportError:
+        return budget  # onnxruntime takes the budget through SessionOptions
+
+    torch.set_num_threads(budget["intra_op"])
+    try:
+        torch.set_num_interop_threads(budget["inter_op"])
+    except RuntimeError:
+        # Only settable once, before any inter-op parallel work started
+        logger.warning("torch inter-op threads already initialized; keeping them.")
+    _threads_configured = True
+    logger.info("Inference threads configured: %s", budget)
+    return budget
+
+
+class InferenceBackend:
+    """
+    Scores a batch of feature vectors; one float per row.
+    """
+
+    name = "base"
+
+    def predict(self, batch: Sequence[Sequence[float]]) -> List[float]:
+        raise NotImplementedError
+
+
+class PlaceholderBackend(InferenceBackend):
+    name = "placeholder"
+
+    def predict(self, batch: Sequence[Sequence[float]]) -> List[float]:
+        return [sum(row) / len(row) if row else 0.0 for row in batch]
+
+
+class TorchScriptBackend(InferenceBackend):
+    name = "torchscript"
+
+    def __init__(self, path: str):
+        import torch
+
+        configure_threads()
+        self._torch = torch
+        self.model = torch.jit.load(path, map_location="cpu").eval()
+        try:
+            self.model = torch.jit.optimize_for_inference(self.model)
+        except Exception as e:  # Some (e.g. quantized) graphs cannot be frozen
+            logger.info("Skipping TorchScript freezing for %s: %s", path, e)
+
+    def predict(self, batch: Sequence[Sequence[float]]) -> List[float]:
+        torch = self._torch
+        with torch.inference_mode():
+            output = self.model(torch.tensor(batch, dtype=torch.float32))
+        return output.reshape(len(batch), -1)[:, 0].tolist()
+
+
+class OnnxBackend(InferenceBackend):
+    name = "onnx"
+
+    def __init__(self, path: str):
+        import numpy as np
+        import onnxruntime as ort
+
+        budget = thread_budget()
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = budget["intra_op"]
+        options.inter_op_num_threads = budget["inter_op"]
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._np = np
+        self.session = ort.InferenceSession(
+            path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._input = self.session.get_inputs()[0].name
+
+    def predict(self, batch: Sequence[Sequence[float]]) -> List[float]:
+        inputs = self._np.asarray(batch, dtype=self._np.float32)
+        (output,) = self.session.run(None, {self._input: inputs})
+        return output.reshape(len(batch), -1)[:, 0].tolist()
+
+
+BACKENDS = {
+    PlaceholderBackend.name: PlaceholderBackend,
+    TorchScriptBackend.name: TorchScriptBackend,
+    OnnxBackend.name: OnnxBackend,
+}
+
+
+def load_backend(name: str, path: Optional[str] = None) -> InferenceBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {name}")
+    if name == PlaceholderBackend.name:
+        return PlaceholderBackend()
+    if not path:
+        raise ValueError(f"Backend '{name}' requires ML_MODEL_PATH.")
+    return BACKENDS[name](path)
+
+
+def export_torchscript(module, example_dim: int, path: str, quantize: bool = False):
+    """
+    Traces an eager torch module (optionally dynamic-int8 quantizing its
+    Linear/LSTM/GRU layers first) and saves it for TorchScriptBackend.
+    """
+    import torch
+
+    module = module.eval()
+    if quantize:
+        module = torch.ao.quantization.quantize_dynamic(
+            module, {torch.nn.Linear, torch.nn.LSTM, torch.nn.GRU}, dtype=torch.qint8
+        )
+    example = torch.zeros(1, example_dim)
+    torch.jit.save(torch.jit.trace(module, example), path)
+
+
+def export_onnx(module, example_dim: int, path: str, quantize: bool = False):
+    """
+    Exports an eager torch module to ONNX with a dynamic batch axis; with
+    `quantize`, writes a dynamic-int8 copy next to it and returns its path.
+    """
+    import torch
+
+    torch.onnx.export(
+        module.eval(),
+        torch.zeros(1, example_dim),
+        path,
+        input_names=["features"],
+        output_names=["score"],
+        dynamic_axes={"features": {0: "batch"}, "score": {0: "batch"}},
+    )
+    if not quantize:
+        return path
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantized_path = path.replace(".onnx", ".int8.onnx")
+    quantize_dynamic(path, quantized_path, weight_type=QuantType.QInt8)
+    return quantized_path
+
+
+def benchmark(
+    backends: Dict[str, InferenceBackend],
+    dim: int,
+    batch_sizes: Sequence[int] = (1, 32),
+    repeats: int = 200,
+    seed: int = 0,
+) -> List[Dict[str, float]]:
+    """
+    Runs every backend on the same random inputs; reports latency per call
+    and the max absolute score difference to the first backend.
+    """
+    rng = random.Random(seed)
+    results = []
+    for batch_size in batch_sizes:
+        batch = [[rng.random() for _ in range(dim)] for _ in range(batch_size)]
+        reference = None
+        for name, backend in backends.items():
+            scores = backend.predict(batch)  # Warm-up (lazy init, allocations)
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                backend.predict(batch)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            if reference is None:
+                reference = scores
+            results.append(
+                {
+                    "backend": name,
+                    "batch_size": batch_size,
+                    "p50_ms": round(timings[len(timings) // 2], 4),
+                    "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 4),
+                    "rows_per_sec": round(
+                        batch_size * 1000 / timings[len(timings) // 2]
+                    ),
+                    "max_abs_diff": max(abs(a - b) for a, b in zip(scores, reference)),
+                }
+            )
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Compare CPU inference backends.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bench = sub.add_parser("benchmark", help="Benchmark backends on identical inputs")
+    bench.add_argument("--torchscript", help="Path to a TorchScript model")
+    bench.add_argument("--onnx", action="append", default=[], help="ONNX model path(s)")
+    bench.add_argument("--dim", type=int, required=True, help="Input feature count")
+    bench.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32])
+    bench.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    configure_threads()
+    backends: Dict[str, InferenceBackend] = {}
+    if args.torchscript:
+        backends["torchscript"] = TorchScriptBackend(args.torchscript)
+    for path in args.onnx:
+        backends[f"onnx:{os.path.basename(path)}"] = OnnxBackend(path)
+    if not backends:
+        backends["placeholder"] = PlaceholderBackend()
+
+    print(f"threads: {thread_budget()}")
+    for row in benchmark(backends, args.dim, args.batch_sizes, args.repeats):
+        print(
+            f"{row['backend']:<28} batch={row['batch_size']:<4} "
+            f"p50={row['p50_ms']:.3f}ms p95={row['p95_ms']:.3f}ms "
+            f"rows/s={row['rows_per_sec']:<8} max_abs_diff={row['max_abs_diff']:.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
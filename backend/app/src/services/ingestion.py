@@ -0,0 +1,330 @@
+# backend/app/src/services/ingestion.py
+"""
+Chunked, parallel CSV ingestion into the `dataset_samples` collection.
+
+The file is read in fixed-size byte chunks cut at line boundaries, parsed and
+type-coerced with vectorized pandas operations, and written with concurrent
+unordered insert_many batches. Progress is checkpointed as a byte offset in an
+IngestionJob, so a failed job resumes where it stopped. Row ids are derived
+from the file's content digest and the row's byte offset, so rows re-sent
+after a resume (or a re-run of the same file) are skipped as duplicates, while
+a corrected file uploaded under the same dataset gets new ids.
+Quoted fields must not contain newlines (chunks are cut at raw line breaks).
+
+Usage:
+    python -m services.ingestion datasets/drivers.csv --dataset drivers
+    python -m services.ingestion datasets/drivers.csv --dataset drivers --resume <job_id>
+"""
+
+import argparse
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from beanie import PydanticObjectId
+from core.config import settings
+from db.models import DatasetSample, IngestionJob
+from pymongo.errors import BulkWriteError
+from services.features import SIGNALS
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ("vehicle_id", "timestamp")
+STRING_COLUMNS = ("vehicle_id", "session_id", "label")
+DUPLICATE_KEY = 11000
+
+
+class IngestionError(Exception):
+    """An ingestion job failed; `job_id` can be passed back to resume it."""
+
+    def __init__(self, job_id: str, message: str):
+        super().__init__(message)
+        self.job_id = job_id
+
+
+def iter_chunks(
+    path: str, start_offset: int, chunk_bytes: int
+) -> Iterator[Tuple[bytes, int, bytes]]:
+    """
+    Yields (header, start offset, chunk) with chunks ending on a line break.
+    Only one chunk is held in memory at a time.
+    """
+    with open(path, "rb") as f:
+        header = f.readline()
+        offset = max(start_offset, len(header))
+        f.seek(offset)
+        while True:
+            chunk = f.read(chunk_bytes)
+            if not chunk:
+                return
+            if not chunk.endswith(b"\n"):
+                chunk += f.readline()  # Complete the last line
+            yield header, offset, chunk
+            offset += len(chunk)
+
+
+def file_digest(path: str) -> str:
+    """Content digest of the file, streamed (part of every row id)."""
+    digest = hashlib.blake2b(digest_size=8)
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(settings.INGEST_CHUNK_BYTES)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_chunk(
+    header: bytes, start: int, chunk: bytes, dataset: str, digest: str
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Parses and validates one chunk; returns (documents, rejected row count).
+    Conversion is column-wise; invalid rows are dropped, not raised.
+    """
+    options = dict(
+        dtype=str,
+        skip_blank_lines=False,  # Keep rows aligned with line offsets
+        keep_default_na=False,
+    )
+    try:
+        frame = pd.read_csv(io.BytesIO(header + chunk), **options)
+    except pd.errors.ParserError:
+        # Rows with extra fields: the (slower) python parser blanks them so
+        # they are rejected below while keeping every row at its line offset
+        width = len(header.decode().split(","))
+        frame = pd.read_csv(
+            io.BytesIO(header + chunk),
+            engine="python",
+            on_bad_lines=lambda fields: [""] * width,
+            **options,
+        )
+    # Byte offset of every line in the chunk, without a Python-level loop
+    newlines = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == ord("\n"))
+    line_starts = np.concatenate(([0], newlines + 1))[: len(frame)] + start
+
+    out = pd.DataFrame(index=frame.index)
+    out["_id"] = f"{dataset}:{digest}:" + pd.Series(
+        line_starts, index=frame.index
+    ).astype(str)
+    out["dataset"] = dataset
+    for column in STRING_COLUMNS:
+        values = frame[column] if column in frame else pd.Series("", index=frame.index)
+        values = values.str.strip()
+        out[column] = values.where(values != "", None)
+
+    timestamps = frame["timestamp"].str.strip()
+    epoch = pd.to_numeric(timestamps, errors="coerce")
+    out["ts"] = pd.to_datetime(epoch, unit="s", errors="coerce").fillna(
+        pd.to_datetime(
+            timestamps.where(epoch.isna()), errors="coerce", utc=True, format="mixed"
+        ).dt.tz_localize(None)
+    )
+    for column in SIGNALS:
+        out[column] = (
+            pd.to_numeric(frame[column], errors="coerce").astype("float64")
+            if column in frame
+            else np.nan
+        )
+
+    valid = out["vehicle_id"].notna() & out["ts"].notna()
+    out = out[valid]
+    records = out.astype(object).where(out.notna(), None).to_dict("records")
+    for record in records:
+        record["ts"] = record["ts"].to_pydatetime()
+    return records, int((~valid).sum())
+
+
+class IngestionService:
+    """
+    Runs CSV ingestion jobs. Parsing happens in a worker thread while up to
+    INGEST_MAX_PARALLEL_INSERTS chunks are being written.
+    """
+
+    async def get_or_create_job(
+        self, path: str, dataset: str, job_id: Optional[str] = None
+    ) -> IngestionJob:
+        if job_id:
+            job = await IngestionJob.get(PydanticObjectId(job_id))
+            if job is None:
+                raise ValueError(f"Ingestion job {job_id} not found.")
+            if job.file_digest != await asyncio.to_thread(file_digest, job.path):
+                raise ValueError(
+                    f"{job.path} changed since job {job_id} started; start a new job."
+                )
+            return job
+        with open(path, "rb") as f:
+            header = f.readline().decode().strip().split(",")
+        missing = [c for c in REQUIRED_COLUMNS if c not in header]
+        if missing:
+            raise ValueError(f"CSV is missing required columns: {missing}")
+        job = IngestionJob(
+            path=path,
+            dataset=dataset,
+            file_size=os.path.getsize(path),
+            file_digest=await asyncio.to_thread(file_digest, path),
+        )
+        await job.insert()
+        return job
+
+    @staticmethod
+    async def _insert(collection, documents: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Returns (inserted, duplicates); other write errors are raised."""
+        if not documents:
+            return 0, 0
+        try:
+            await collection.insert_many(documents, ordered=False)
+            return len(documents), 0
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != DUPLICATE_KEY for error in errors):
+                raise
+            return e.details.get("nInserted", 0), len(errors)
+
+    async def ingest(self, job: IngestionJob) -> IngestionJob:
+        """
+        Streams the job's file from its checkpoint. The checkpoint only moves
+        past chunks whose predecessors are all written, since inserts finish
+        out of order.
+        """
+        collection = DatasetSample.get_motor_collection()
+        limit = asyncio.Semaphore(settings.INGEST_MAX_PARALLEL_INSERTS)
+        # Chunk start -> (end, rejected rows, insert task)
+        in_flight: Dict[int, Tuple[int, int, asyncio.Task]] = {}
+        started = time.perf_counter()
+        start_offset = job.offset
+        job.status, job.error = "running", None
+        await job.save()
+
+        async def write(documents):
+            try:
+                return await self._insert(collection, documents)
+            finally:
+                limit.release()
+
+        async def checkpoint():
+            # Advance over the contiguous prefix of finished chunks
+            while job.offset in in_flight and in_flight[job.offset][2].done():
+                end, rejected, task = in_flight.pop(job.offset)
+                inserted, duplicates = task.result()
+                job.rows_inserted += inserted
+                job.rows_rejected += rejected
+                job.rows_duplicate += duplicates
+                job.offset = end
+            elapsed = time.perf_counter() - started
+            job.rows_per_sec = round(job.rows_inserted / elapsed, 1) if elapsed else 0.0
+            job.updated_at = datetime.utcnow()
+            await job.save()
+
+        try:
+            chunks = iter_chunks(job.path, job.offset, settings.INGEST_CHUNK_BYTES)
+            if job.offset == 0:
+                with open(job.path, "rb") as f:
+                    job.offset = len(f.readline())  # Skip the header
+            for header, start, chunk in chunks:
+                documents, rejected = await asyncio.to_thread(
+                    parse_chunk, header, start, chunk, job.dataset, job.file_digest
+                )
+                await limit.acquire()  # Bounds memory: at most N chunks queued
+                task = asyncio.create_task(write(documents))
+                in_flight[start] = (start + len(chunk), rejected, task)
+                if any(t.done() for _, _, t in in_flight.values()):
+                    await checkpoint()
+            if in_flight:
+                await asyncio.gather(*(t for _, _, t in in_flight.values()))
+            await checkpoint()
+        except Exception as e:
+            for _, _, task in in_flight.values():
+                task.cancel()
+            await asyncio.gather(
+                *(t for _, _, t in in_flight.values()), return_exceptions=True
+            )
+            # Keep only chunks that were fully written before the failure
+            in_flight = {
+                start: chunk
+                for start, chunk in in_flight.items()
+                if not chunk[2].cancelled() and chunk[2].exception() is None
+            }
+            job.status, job.error = "failed", str(e)
+            try:
+                await checkpoint()  # Also persists the failed status
+            except Exception as save_error:
+                # E.g. MongoDB is down: the job may stay "running" in the DB,
+                # but the caller still gets a resumable IngestionError
+                logger.error(
+                    "Could not checkpoint failed ingestion job %s: %s",
+                    job.id,
+                    save_error,
+                )
+            logger.error(
+                "Ingestion job %s failed at offset %d: %s", job.id, job.offset, e
+            )
+            raise IngestionError(str(job.id), str(e)) from e
+
+        job.status = "completed"
+        await job.save()
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "Ingestion job %s completed: %d rows (%d rejected, %d duplicate) in %.1fs, "
+            "%.0f rows/s, %.1f MB/s",
+            job.id,
+            job.rows_inserted,
+            job.rows_rejected,
+            job.rows_duplicate,
+            elapsed,
+            job.rows_per_sec,
+            (job.offset - start_offset) / elapsed / 1e6 if elapsed else 0.0,
+        )
+        return job
+
+    async def run_standalone(
+        self, path: str, dataset: str, job_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Connects, runs one job and disconnects (CLI and Celery entry point,
+        each running its own event loop).
+        """
+        from db.client import mongo_client
+
+        await mongo_client.connect()
+        try:
+            job = await self.get_or_create_job(path, dataset, job_id)
+            job = await self.ingest(job)
+            return job.model_dump(mode="json")
+        finally:
+            await mongo_client.close()
+
+
+ingestion_service = IngestionService()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Ingest a driver CSV dataset.")
+    parser.add_argument("path", help="CSV file with vehicle_id,timestamp,<signals>")
+    parser.add_argument("--dataset", required=True, help="Dataset name")
+    parser.add_argument("--resume", metavar="JOB_ID", help="Resume a failed job")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        job = asyncio.run(
+            ingestion_service.run_standalone(args.path, args.dataset, args.resume)
+        )
+    except IngestionError as e:
+        raise SystemExit(f"Failed: {e}. Resume with --resume {e.job_id}")
+    print(
+        f"job {job['id']}: {job['rows_inserted']} rows inserted, "
+        f"{job['rows_rejected']} rejected, {job['rows_duplicate']} duplicate, "
+        f"{job['rows_per_sec']} rows/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 # backend/app/src/services/ml.py
-from typing import Any, Dict
+import logging
+from typing import Any, Callable, Dict, List
 
 from core.config import settings
+from services.inference import InferenceBackend, PlaceholderBackend, load_backend
+
+logger = logging.getLogger(__name__)
 
 
 class MLService:
@@ -10,24 +14,68 @@ class MLService:
     """
 
     def __init__(self):
-        # In a real app, model loading would occur here.
-        # e.g., self.model = load_model("path/to/model")
-        print("ML Service initialized: Model placeholder loaded.")
+        # The exported model is loaded per process by load_runtime() (after fork,
+        # so thread pools are sized for that process); until then the
+        # placeholder backend answers.
+        self.runtime: InferenceBackend = PlaceholderBackend()
+        self.model_version = settings.ML_MODEL_VERSION
+        self._swap_listeners: List[Callable[[str, str], None]] = []
+        logger.info("ML Service initialized: Model placeholder loaded.")
+
+    def load_runtime(self):
+        """
+        Loads the configured inference backend (ML_BACKEND / ML_MODEL_PATH).
+        Called from API startup and Celery's worker_process_init.
+        """
+        runtime = load_backend(settings.ML_BACKEND, settings.ML_MODEL_PATH)
+        self.runtime = runtime
+        logger.info(
+            "Inference runtime loaded: %s (%s)", runtime.name, settings.ML_MODEL_PATH
+        )
+
+    def add_swap_listener(self, listener: Callable[[str, str], None]):
+        """
+        Registers `listener(old_version, new_version)`, called after a model swap
+        (e.g. to invalidate memoized predictions).
+        """
+        self._swap_listeners.append(listener)
+
+    def swap_model(self, version: str):
+        """
+        Activates another model version (model registry hook).
+        """
+        old_version, self.model_version = self.model_version, version
+        if old_version == version:
+            return
+        logger.info("Model swapped: %s -> %s", old_version, version)
+        for listener in self._swap_listeners:
+            listener(old_version, version)
 
     def get_prediction(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Executes synchronous, low-latency AI inference.
         """
-        # Simulate inference based on input features
         features = input_data.get("features", [])
+        return self._score(features)
+
+    def get_batch_prediction(
+        self, inputs: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Executes inference for several inputs in one call, amortizing per-call
+        overhead (and, with a real model, running a single batched forward pass).
+        """
+        batch = [item.get("features", []) for item in inputs]
+        return [self._result(score) for score in self.runtime.predict(batch)]
 
-        # Simple placeholder logic
-        prediction_score = sum(features) / len(features) if features else 0
+    def _score(self, features: List[float]) -> Dict[str, Any]:
+        return self._result(self.runtime.predict([features])[0])
 
+    def _result(self, prediction_score: float) -> Dict[str, Any]:
         return {
             "prediction": "high" if prediction_score > 0.5 else "low",
             "score": round(prediction_score, 4),
-            "model_version": "v1.0",
+            "model_version": self.model_version,
         }
 
     def trigger_batch_inference(self, data_id: str) -> str:
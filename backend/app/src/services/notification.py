@@ -1,6 +1,10 @@
 # backend/app/src/services/notification.py
+import asyncio
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Set
+
+from db.models import Alert
+from services.rollup import rollup_service
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +19,9 @@ class NotificationService:
     Uses Task Layer for background dispatch.
     """
 
+    def __init__(self):
+        self._pending_writes: Set[asyncio.Task] = set()
+
     def send_user_alert(self, user_id: str, message: str, type: str = "in-app") -> str:
         """
         Public method to trigger a background notification.
@@ -29,11 +36,43 @@ class NotificationService:
         }
 
         # Dispatch the job to the Task Service
-        logger.info(f"Dispatching background notification for user {user_id}...")
+        logger.info("Dispatching background notification for user %s...", user_id)
         task_id = task_service.submit_notification_dispatch(payload)
+        rollup_service.record_alert_sent(type)
+
+        return task_id
 
+    async def create_alert(
+        self,
+        user_id: str,
+        message: str,
+        type: str = "in-app",
+        rule: Optional[str] = None,
+    ) -> str:
+        """
+        Dispatches the alert, then persists it in the background (the change
+        feed pushes it to the user's open streams). Delivery matters more
+        than the feed, so a slow or unreachable MongoDB never delays it.
+        """
+        task_id = self.send_user_alert(user_id=user_id, message=message, type=type)
+        alert = Alert(user_id=user_id, message=message, type=type, rule=rule)
+        write = asyncio.create_task(self._persist(alert))
+        self._pending_writes.add(write)  # Keeps a reference until it finishes
+        write.add_done_callback(self._pending_writes.discard)
         return task_id
 
+    @staticmethod
+    async def _persist(alert: Alert):
+        try:
+            await alert.insert()
+        except Exception as e:
+            logger.error("Failed to persist alert for user %s: %s", alert.user_id, e)
+
+    async def drain(self):
+        """Waits for background alert writes (shutdown, before MongoDB closes)."""
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+
     # The actual synchronous dispatch function (used by the Celery worker)
     def _execute_dispatch(self, payload: Dict[str, Any]):
         """
@@ -45,7 +84,10 @@ class NotificationService:
         type = payload.get("type", "in-app")
 
         logger.info(
-            f"[Worker] Successfully dispatched {type} alert to {user_id}: '{message[:20]}...'"
+            "[Worker] Successfully dispatched %s alert to %s: '%.20s...'",
+            type,
+            user_id,
+            message,
         )
         # --- Actual API call to a provider would go here ---
         # time.sleep(1) # Simulate network latency
@@ -0,0 +1,121 @@
+# backend/app/src/services/prediction_cache.py
+import hashlib
+import json
+import logging
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+from core.config import settings
+from core.profiling import profile_phase
+from db.redis_client import redis_client
+from services.ml import ml_service
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(features: Sequence[float], scope: str = "") -> str:
+    """
+    Stable digest of a feature vector. `scope` carries request identity
+    (vehicle/session/frame time) when a repeated submission must map to the same
+    entry but identical features from different sources must not.
+    """
+    digest = hashlib.blake2b(array("d", features).tobytes(), digest_size=16)
+    if scope:
+        digest.update(scope.encode())
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """
+    Memoizes predictions by (model_version, content hash).
+    In-process LRU in front of an optional shared Redis tier. Entries of other
+    model versions are dropped when MLService swaps models, and a hit on an
+    identical submission doubles as idempotency for client retries.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.metrics = {
+            "hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    @staticmethod
+    def _key(model_version: str, digest: str) -> str:
+        return f"pred:{model_version}:{digest}"
+
+    async def get(self, model_version: str, digest: str) -> Optional[Dict[str, Any]]:
+        key = self._key(model_version, digest)
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+            self.metrics["hits"] += 1
+            return result
+
+        if settings.PREDICTION_CACHE_REDIS and redis_client.client is not None:
+            try:
+                with profile_phase("redis", "GET"):
+                    raw = await redis_client.client.get(key)
+            except Exception as e:
+                logger.warning("Prediction cache Redis GET failed: %s", e)
+                raw = None
+            if raw is not None:
+                result = json.loads(raw)
+                self._store_local(key, result)
+                self.metrics["redis_hits"] += 1
+                return result
+
+        self.metrics["misses"] += 1
+        return None
+
+    async def put(self, model_version: str, digest: str, result: Dict[str, Any]):
+        key = self._key(model_version, digest)
+        self._store_local(key, result)
+        if settings.PREDICTION_CACHE_REDIS and redis_client.client is not None:
+            try:
+                with profile_phase("redis", "SET"):
+                    await redis_client.client.set(
+                        key, json.dumps(result), ex=settings.PREDICTION_CACHE_TTL_SEC
+                    )
+            except Exception as e:
+                logger.warning("Prediction cache Redis SET failed: %s", e)
+
+    def _store_local(self, key: str, result: Dict[str, Any]):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > settings.PREDICTION_CACHE_SIZE:
+            self._entries.popitem(last=False)
+            self.metrics["evictions"] += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.metrics["invalidations"] += 1
+
+    def on_model_swapped(self, old_version: str, new_version: str):
+        """
+        Registry listener: drops local entries of the old version. Redis keys
+        embed the version, so stale shared entries simply miss and expire.
+        """
+        self.clear()
+        logger.info(
+            "Prediction cache invalidated (model %s -> %s)", old_version, new_version
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = (
+            self.metrics["hits"] + self.metrics["redis_hits"] + self.metrics["misses"]
+        )
+        hits = self.metrics["hits"] + self.metrics["redis_hits"]
+        return {
+            **self.metrics,
+            "size": len(self._entries),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+prediction_cache = PredictionCache()
+ml_service.add_swap_listener(prediction_cache.on_model_swapped)
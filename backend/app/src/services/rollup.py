@@ -0,0 +1,227 @@
+# backend/app/src/services/rollup.py
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from core.config import settings
+from db.models import AnalyticsRollup, Project
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ("hour", "day")
+# Absolute counters (not per bucket), e.g. the current projects per status
+TOTALS_ID = "totals"
+EPOCH = datetime(1970, 1, 1)
+
+
+def _bucket_start(granularity: str, ts: datetime) -> datetime:
+    if granularity == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class RollupService:
+    """
+    Incrementally maintains the per-hour and per-day analytics rollups.
+    Write paths record counters in memory (no I/O on the request path); a
+    background task flushes them as coalesced $inc upserts, so the dashboard
+    never has to aggregate the raw collections.
+
+    Project status counts are levels, not flows: transitions are applied to
+    one totals document, and each flush copies the resulting totals into the
+    current hour/day buckets, so every bucket holds absolute counts.
+    """
+
+    def __init__(self):
+        self._pending: Dict[Tuple[str, datetime], Counter] = defaultdict(Counter)
+        self._status_deltas: Counter = Counter()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    # --- Write-path hooks (synchronous and cheap) ---
+
+    def increment(self, counters: Dict[str, int], ts: Optional[datetime] = None):
+        """Adds dotted-path counters (e.g. "predictions.high") to the current buckets."""
+        ts = ts or datetime.utcnow()
+        for granularity in GRANULARITIES:
+            self._pending[(granularity, _bucket_start(granularity, ts))].update(
+                counters
+            )
+
+    def record_user_created(self, count: int = 1):
+        self.increment({"users_created": count})
+
+    def record_project_status(
+        self, new_status: Optional[str], old_status: Optional[str] = None
+    ):
+        if new_status == old_status:
+            return
+        if new_status:
+            self._status_deltas[new_status] += 1
+        if old_status:
+            self._status_deltas[old_status] -= 1
+
+    def record_prediction(self, result: Dict[str, Any]):
+        decile = min(int(float(result.get("score", 0)) * 10), 9)
+        self.increment(
+            {
+                "predictions.total": 1,
+                f"predictions.{result.get('prediction', 'unknown')}": 1,
+                f"score_histogram.{max(decile, 0)}": 1,
+            }
+        )
+
+    def record_alert_sent(self, type: str):
+        self.increment({f"alerts_sent.{type}": 1})
+
+    # --- Background flushing ---
+
+    async def flush(self) -> int:
+        """Writes all pending counters in one unordered bulk write."""
+        if not self._pending and not any(self._status_deltas.values()):
+            return 0
+        pending, self._pending = self._pending, defaultdict(Counter)
+        deltas, self._status_deltas = self._status_deltas, Counter()
+
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"_id": f"{granularity}:{bucket_start.isoformat()}"},
+                {
+                    "$inc": {k: v for k, v in counters.items() if v},
+                    "$set": {"updated_at": now},
+                    "$setOnInsert": {
+                        "granularity": granularity,
+                        "bucket_start": bucket_start,
+                    },
+                },
+                upsert=True,
+            )
+            for (granularity, bucket_start), counters in pending.items()
+            if any(counters.values())
+        ]
+        deltas = {f"projects_by_status.{k}": v for k, v in deltas.items() if v}
+        if deltas:
+            operations.append(
+                UpdateOne(
+                    {"_id": TOTALS_ID},
+                    {
+                        "$inc": deltas,
+                        "$set": {"updated_at": now},
+                        "$setOnInsert": {
+                            "granularity": "totals",
+                            "bucket_start": EPOCH,
+                        },
+                    },
+                    upsert=True,
+                )
+            )
+        if not operations:
+            return 0
+        collection = AnalyticsRollup.get_motor_collection()
+        try:
+            await collection.bulk_write(operations, ordered=False)
+        except (Exception, asyncio.CancelledError) as e:
+            # Put the counters back so they are retried on the next flush
+            for key, counters in pending.items():
+                self._pending[key].update(counters)
+            for key, delta in deltas.items():
+                self._status_deltas[key.split(".", 1)[1]] += delta
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            logger.error("Failed to flush analytics rollups: %s", e)
+            return 0
+        if deltas:
+            await self._snapshot_project_totals(collection, now)
+        return len(operations)
+
+    async def _snapshot_project_totals(self, collection, now: datetime):
+        """Copies the current totals into this hour's and day's buckets."""
+        try:
+            totals = await collection.find_one(
+                {"_id": TOTALS_ID}, projection={"projects_by_status": 1}
+            )
+            operations = []
+            for granularity in GRANULARITIES:
+                bucket_start = _bucket_start(granularity, now)
+                operations.append(
+                    UpdateOne(
+                        {"_id": f"{granularity}:{bucket_start.isoformat()}"},
+                        {
+                            "$set": {
+                                "projects_by_status": totals["projects_by_status"]
+                            },
+                            "$setOnInsert": {
+                                "granularity": granularity,
+                                "bucket_start": bucket_start,
+                            },
+                        },
+                        upsert=True,
+                    )
+                )
+            await collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            # The totals are written; the next status change snapshots again
+            logger.error("Failed to snapshot project totals: %s", e)
+
+    async def seed_project_totals(self):
+        """
+        Initializes the totals from the projects collection once (deployments
+        that already had projects). The insert-only upsert lets exactly one
+        worker seed; transitions racing with the count may be off by a few.
+        """
+        collection = AnalyticsRollup.get_motor_collection()
+        if await collection.find_one({"_id": TOTALS_ID}, projection={"_id": 1}):
+            return
+        counts = (
+            await Project.get_motor_collection()
+            .aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}])
+            .to_list(length=None)
+        )
+        await collection.update_one(
+            {"_id": TOTALS_ID},
+            {
+                "$setOnInsert": {
+                    "granularity": "totals",
+                    "bucket_start": EPOCH,
+                    "projects_by_status": {
+                        str(c["_id"]): c["count"] for c in counts if c["_id"]
+                    },
+                    "updated_at": datetime.utcnow(),
+                }
+            },
+            upsert=True,
+        )
+
+    async def _flush_periodically(self):
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(), settings.ROLLUP_FLUSH_INTERVAL_SEC
+                )
+                return  # stop() does the final flush
+            except asyncio.TimeoutError:
+                await self.flush()
+
+    async def start(self):
+        if self._task is None:
+            try:
+                await self.seed_project_totals()
+            except Exception as e:
+                logger.error("Failed to seed project totals: %s", e)
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self):
+        """Lets a running flush finish (no cancellation), then flushes the rest."""
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+
+rollup_service = RollupService()
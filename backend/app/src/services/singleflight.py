@@ -0,0 +1,66 @@
+# backend/app/src/services/singleflight.py
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from core.config import settings
+
+T = TypeVar("T")
+
+# All groups of this process, by name (exposed in /admin/metrics)
+single_flight_groups: Dict[str, "SingleFlight"] = {}
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical reads within a process: the first caller
+    for a key runs the query, callers arriving while it is in flight await the
+    same result. Nothing is cached once the query completes.
+
+    All callers receive the *same* object, so results must be treated as
+    read-only; paths that modify the result must fetch without coalescing.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.metrics = {"calls": 0, "executions": 0, "collapsed": 0}
+        self.collapsed_by_key: Counter = Counter()
+        single_flight_groups[name] = self
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        self.metrics["calls"] += 1
+        future = self._in_flight.get(key)
+        if future is None:
+            # Runs as its own task so a cancelled leader does not cancel the
+            # query for the callers that joined it
+            future = asyncio.ensure_future(fn())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+            self.metrics["executions"] += 1
+        else:
+            self.metrics["collapsed"] += 1
+            self._count_collapsed(key)
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Hashable, future: asyncio.Future):
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if not future.cancelled():
+            future.exception()  # Mark retrieved even if every caller went away
+
+    def _count_collapsed(self, key: Hashable):
+        self.collapsed_by_key[str(key)] += 1
+        if len(self.collapsed_by_key) > settings.SINGLEFLIGHT_MAX_TRACKED_KEYS:
+            # Keep the hottest half
+            keep = settings.SINGLEFLIGHT_MAX_TRACKED_KEYS // 2
+            self.collapsed_by_key = Counter(
+                dict(self.collapsed_by_key.most_common(keep))
+            )
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "in_flight": len(self._in_flight),
+            "top_collapsed_keys": dict(self.collapsed_by_key.most_common(top)),
+        }
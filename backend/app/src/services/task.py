@@ -1,17 +1,21 @@
 # backend/app/src/services/task.py (UPDATED)
-from typing import Any, Dict
+import asyncio
+from typing import Any, Dict, List, Optional
 
+from core.config import settings
+from kombu.serialization import dumps
 from services.notification import notification_service
+from tasks import claim_check
 from tasks.worker import celery_app
 
 
 # --- New Celery Task Definition for Notifications ---
 # This function is executed by the Celery worker in the background.
-@celery_app.task(bind=True, max_retries=3)
+@celery_app.task(bind=True, max_retries=3, ignore_result=True)
 def dispatch_notification(self, payload: Dict[str, Any]):
     """
     Celery task that calls the synchronous execution logic in the Notification Service.
-    Implements Task Resilience (retry policy).
+    Implements Task Resilience (retry policy). Fire-and-forget: no result is stored.
     """
     try:
         notification_service._execute_dispatch(payload)
@@ -20,6 +24,52 @@ def dispatch_notification(self, payload: Dict[str, Any]):
         raise self.retry(exc=e, countdown=10)
 
 
+@celery_app.task(bind=True, max_retries=3)
+def ingest_dataset(self, path: str, dataset: str, job_id: Optional[str] = None):
+    """
+    Celery task that streams a CSV dataset into MongoDB (services.ingestion).
+    Retries resume the same job from its last checkpoint.
+    """
+    # Lazy import: keeps pandas out of processes that never ingest
+    from services.ingestion import IngestionError, ingestion_service
+
+    try:
+        return asyncio.run(ingestion_service.run_standalone(path, dataset, job_id))
+    except IngestionError as e:
+        raise self.retry(exc=e, countdown=30, kwargs={"job_id": e.job_id})
+
+
+@celery_app.task(bind=True, max_retries=3)
+def batch_predict(self, inputs: Any):
+    """
+    Scores a batch of feature payloads. Large batches arrive as a claim-check
+    reference (see TaskService.submit), released once scored.
+    """
+    from services.ml import ml_service
+
+    reference = inputs if claim_check.is_claim(inputs) else None
+    if reference is not None:
+        inputs = claim_check.check_out(reference)
+    try:
+        results = ml_service.get_batch_prediction(inputs)
+    except Exception as e:
+        raise self.retry(exc=e, countdown=10)
+    if reference is not None:
+        claim_check.release(reference)
+    return results
+
+
+@celery_app.task(ignore_result=True)
+def export_snapshots():
+    """
+    Celery beat task: incremental Parquet export of users, projects and
+    prediction history (services.export).
+    """
+    from services.export import export_service
+
+    return export_service.run()
+
+
 # ----------------------------------------------------
 
 
@@ -31,11 +81,49 @@ class TaskService:
     # ... (submit_report_generation and get_task_status methods remain the same) ...
 
     @staticmethod
-    def submit_notification_dispatch(payload: Dict[str, Any]) -> str:
+    def submit(
+        task,
+        payload: Any,
+        may_be_large: bool = False,
+        claim_check_allowed: bool = False,
+    ) -> str:
+        """
+        Publishes `task(payload)` with a size-dependent encoding: small
+        messages as-is, larger ones zlib-compressed, and (for tasks that
+        accept a reference) the largest passed by claim-check.
+        Measuring means serializing the payload once more before Celery does,
+        so only payloads that can be large (`may_be_large`, claim-checkable)
+        are measured; bounded ones (notifications) are published as-is.
+        """
+        if not (may_be_large or claim_check_allowed):
+            return task.apply_async((payload,)).id
+        _, _, body = dumps(payload, serializer=settings.CELERY_SERIALIZER)
+        size = len(body)
+        if claim_check_allowed and size >= settings.CELERY_CLAIM_CHECK_BYTES:
+            return task.apply_async((claim_check.check_in(payload),)).id
+        if size >= settings.CELERY_COMPRESS_MIN_BYTES:
+            return task.apply_async((payload,), compression="zlib").id
+        return task.apply_async((payload,)).id
+
+    def submit_notification_dispatch(self, payload: Dict[str, Any]) -> str:
         """
         Submits a notification request to the task queue.
         """
-        task = dispatch_notification.delay(payload)
+        return self.submit(dispatch_notification, payload)
+
+    def submit_batch_prediction(self, inputs: List[Dict[str, Any]]) -> str:
+        """
+        Submits a batch of prediction inputs; fetch the results by task id
+        within CELERY_RESULT_EXPIRES_SEC.
+        """
+        return self.submit(batch_predict, inputs, claim_check_allowed=True)
+
+    @staticmethod
+    def submit_dataset_ingestion(path: str, dataset: str) -> str:
+        """
+        Submits a CSV ingestion job to the task queue.
+        """
+        task = ingest_dataset.delay(path, dataset)
         return task.id
 
 
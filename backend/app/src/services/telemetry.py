@@ -0,0 +1,203 @@
+# backend/app/src/services/telemetry.py
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from beanie.odm.queries.find import FindMany
+from core.config import settings
+from db.models import PredictionEvent
+from db.routing import find_routed, routed_collection
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+
+class TelemetryService:
+    """
+    Per-vehicle prediction history backed by a MongoDB time-series collection.
+    Predictions are buffered in memory and written by a background task with
+    batched, unordered insert_many calls, keeping writes off the request path.
+    """
+
+    def __init__(self):
+        self._buffer: Deque[Dict[str, Any]] = deque(
+            maxlen=settings.TELEMETRY_MAX_BUFFER
+        )
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+        self.metrics = {"buffered": 0, "written": 0, "dropped": 0, "failed_batches": 0}
+
+    # --- Write path ---
+
+    def record_prediction(
+        self,
+        vehicle_id: str,
+        result: Dict[str, Any],
+        user_id: Optional[str] = None,
+        features: Optional[List[float]] = None,
+        ts: Optional[datetime] = None,
+    ):
+        """
+        Buffers a prediction for the background writer (O(1), no I/O).
+        `ts` is the frame's capture time; beyond TELEMETRY_MAX_CLOCK_SKEW_SEC
+        from ours (bad clock, long offline backlog) the receive time is used,
+        so late events never land behind the export watermark.
+        """
+        now = datetime.utcnow()
+        if ts is None or abs((now - ts).total_seconds()) > (
+            settings.TELEMETRY_MAX_CLOCK_SKEW_SEC
+        ):
+            ts = now
+        if len(self._buffer) == self._buffer.maxlen:
+            # deque(maxlen) evicts the oldest event; account for it
+            self.metrics["dropped"] += 1
+        self._buffer.append(
+            {
+                "ts": ts,
+                "meta": {"vehicle_id": vehicle_id, "user_id": user_id},
+                "prediction": result["prediction"],
+                "score": result["score"],
+                "model_version": result["model_version"],
+                "features": features if settings.TELEMETRY_STORE_FEATURES else [],
+            }
+        )
+        self.metrics["buffered"] += 1
+        if len(self._buffer) >= settings.TELEMETRY_BATCH_SIZE:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Writes everything currently buffered in batches of TELEMETRY_BATCH_SIZE."""
+        written = 0
+        collection = PredictionEvent.get_motor_collection()
+        while self._buffer:
+            batch = [
+                self._buffer.popleft()
+                for _ in range(min(settings.TELEMETRY_BATCH_SIZE, len(self._buffer)))
+            ]
+            try:
+                # Raw dicts skip per-document pydantic validation on the hot path
+                await collection.insert_many(batch, ordered=False)
+                written += len(batch)
+            except BulkWriteError as e:
+                # Unordered: everything but the rejected documents was written
+                written += e.details.get("nInserted", 0)
+                self.metrics["failed_batches"] += 1
+                logger.error("Telemetry batch partially rejected: %s", e)
+            except (Exception, asyncio.CancelledError) as e:
+                # Nothing was written (e.g. connection loss): retry on next
+                # flush. Events recorded meanwhile may leave no room; the
+                # deque then discards from the newest end, so count those
+                self.metrics["dropped"] += max(
+                    0, len(self._buffer) + len(batch) - self._buffer.maxlen
+                )
+                self._buffer.extendleft(reversed(batch))
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+                self.metrics["failed_batches"] += 1
+                logger.error("Failed to write %d telemetry events: %s", len(batch), e)
+                break
+        self.metrics["written"] += written
+        return written
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=settings.TELEMETRY_FLUSH_INTERVAL_SEC
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if not self._stopping:  # stop() does the final flush
+                await self.flush()
+
+    async def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Lets a running flush finish (no cancellation), then drains the buffer."""
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    # --- Range queries ---
+    # Query builders are kept separate so db.query_plans can explain() them.
+
+    def history_query(
+        self, vehicle_id: str, start: datetime, end: datetime, limit: int = 1000
+    ) -> FindMany[PredictionEvent]:
+        return (
+            PredictionEvent.find(
+                {"meta.vehicle_id": vehicle_id, "ts": {"$gte": start, "$lt": end}}
+            )
+            .sort("+ts")
+            .limit(limit)
+        )
+
+    def timeline_pipeline(
+        self, vehicle_id: str, start: datetime, end: datetime, unit: str = "minute"
+    ) -> List[Dict[str, Any]]:
+        return [
+            {
+                "$match": {
+                    "meta.vehicle_id": vehicle_id,
+                    "ts": {"$gte": start, "$lt": end},
+                }
+            },
+            {
+                "$group": {
+                    "_id": {"$dateTrunc": {"date": "$ts", "unit": unit}},
+                    "count": {"$sum": 1},
+                    "high": {
+                        "$sum": {"$cond": [{"$eq": ["$prediction", "high"]}, 1, 0]}
+                    },
+                    "avg_score": {"$avg": "$score"},
+                    "max_score": {"$max": "$score"},
+                }
+            },
+            {"$sort": {"_id": 1}},
+            {
+                "$project": {
+                    "_id": 0,
+                    "bucket_start": "$_id",
+                    "count": 1,
+                    "high": 1,
+                    "avg_score": 1,
+                    "max_score": 1,
+                }
+            },
+        ]
+
+    async def get_history(
+        self, vehicle_id: str, start: datetime, end: datetime, limit: int = 1000
+    ) -> List[PredictionEvent]:
+        """
+        Raw events for one vehicle in [start, end). Filtering on the metaField
+        and time field lets MongoDB prune whole buckets. Routed as a "list"
+        read; events are buffered before writing, so a bounded lag is inherent.
+        """
+        return await find_routed(
+            self.history_query(vehicle_id, start, end, limit), "list"
+        )
+
+    async def get_timeline(
+        self, vehicle_id: str, start: datetime, end: datetime, unit: str = "minute"
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-interval prediction counts and score statistics for one vehicle,
+        aggregated server-side over the vehicle's buckets ("analytics" read).
+        """
+        pipeline = self.timeline_pipeline(vehicle_id, start, end, unit)
+        collection = routed_collection(PredictionEvent, "analytics")
+        return await collection.aggregate(pipeline).to_list(length=None)
+
+
+telemetry_service = TelemetryService()
@@ -1,13 +1,58 @@
 # backend/app/src/services/user.py
+import asyncio
 import logging
-from typing import Optional
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
 
 from beanie import PydanticObjectId
-from db.models import User
+from beanie.odm.operators.update.general import Inc, Set
+from beanie.odm.queries.find import FindOne
+from beanie.odm.queries.update import UpdateResponse
+from core.conditional import make_etag
+from core.config import settings
+from db.models import User, UserVersion
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from services.rollup import rollup_service
+from services.singleflight import SingleFlight
 from utils import hash_password
 
 logger = logging.getLogger(__name__)
 
+# Conflict messages per unique index field (the API maps ValueError to 409)
+CONFLICT_MESSAGES = {
+    "email": "Email already registered.",
+    "username": "Username already taken.",
+}
+
+
+def _conflict_message(key_pattern: Optional[Dict[str, Any]]) -> str:
+    for field, message in CONFLICT_MESSAGES.items():
+        if key_pattern and field in key_pattern:
+            return message
+    return "User already exists."
+
+
+_hash_pool: Optional[ThreadPoolExecutor] = None
+
+
+async def _hash(password: str) -> str:
+    # bcrypt is CPU-bound: off the event loop, on a pool sized to the cores
+    # (not the default executor, which a 1000-row import would monopolize)
+    global _hash_pool
+    if _hash_pool is None:
+        workers = settings.PASSWORD_HASH_WORKERS or max(
+            (os.cpu_count() or 1) // max(settings.ML_WEB_WORKERS, 1), 1
+        )
+        _hash_pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="bcrypt"
+        )
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_pool, hash_password, password
+    )
+
 
 class UserService:
     """
@@ -15,38 +60,150 @@ class UserService:
     Manages CRUD for User documents in MongoDB.
     """
 
+    def __init__(self):
+        # Concurrent lookups of the same user share one query
+        self.user_by_id_flight = SingleFlight("user_by_id")
+
     async def create_user(self, email: str, password: str, username: str) -> User:
         """
         Registers a new user, hashing the password before persistence.
+        A single insert: the unique email/username indexes reject duplicates
+        atomically, so concurrent registrations cannot both succeed.
         """
-        if await User.find_one(User.email == email):
-            raise ValueError("Email already registered.")
-
-        hashed_pwd = hash_password(password)
+        hashed_pwd = await _hash(password)
 
         user = User(email=email, username=username, hashed_password=hashed_pwd)
 
         # Data persisted or retrieved from MongoDB (async)
-        await user.insert()
+        try:
+            await user.insert()
+        except DuplicateKeyError as e:
+            raise ValueError(_conflict_message((e.details or {}).get("keyPattern")))
+        rollup_service.record_user_created()
         return user
 
+    async def create_users_bulk(self, entries: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Registers many users (fleet onboarding) with one unordered insert_many.
+        Every row is attempted; invalid rows and duplicates (against existing
+        users or earlier rows of the batch) are reported per row index.
+        """
+        hashes = await asyncio.gather(*(_hash(entry["password"]) for entry in entries))
+        users: List[User] = []
+        positions: List[int] = []  # users[i] came from entries[positions[i]]
+        conflicts = []
+        for index, (entry, hashed_pwd) in enumerate(zip(entries, hashes)):
+            try:
+                users.append(
+                    User(
+                        id=PydanticObjectId(),  # Client-side ids identify inserted rows
+                        email=entry["email"],
+                        username=entry.get("username"),
+                        hashed_password=hashed_pwd,
+                    )
+                )
+                positions.append(index)
+            except ValidationError as e:
+                conflicts.append(
+                    {
+                        "index": index,
+                        "email": entry.get("email"),
+                        "error": "Invalid user: " + e.errors()[0]["msg"],
+                    }
+                )
+
+        failed = set()
+        if users:
+            try:
+                await User.insert_many(users, ordered=False)
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    failed.add(error["index"])
+                    message = (
+                        _conflict_message(
+                            error.get("keyPattern") or error.get("keyValue")
+                        )
+                        if error.get("code") == 11000
+                        else error.get("errmsg", "Write failed.")
+                    )
+                    conflicts.append(
+                        {
+                            "index": positions[error["index"]],
+                            "email": users[error["index"]].email,
+                            "error": message,
+                        }
+                    )
+
+        inserted = [
+            {"index": positions[i], "id": str(user.id), "email": user.email}
+            for i, user in enumerate(users)
+            if i not in failed
+        ]
+        if inserted:
+            rollup_service.record_user_created(len(inserted))
+        conflicts.sort(key=lambda conflict: conflict["index"])
+        return {"inserted": inserted, "conflicts": conflicts}
+
+    # Query builders are kept separate so db.query_plans can explain() the
+    # exact queries the service runs. User lookups serve auth and
+    # read-after-write paths, so they stay on the primary (see db.routing).
+
+    def user_by_email_query(self, email: str) -> FindOne[User]:
+        return User.find_one(User.email == email)
+
+    def user_by_id_query(self, user_id: PydanticObjectId) -> FindOne[User]:
+        return User.find_one(User.id == user_id)
+
+    def user_version_query(self, user_id: PydanticObjectId) -> FindOne[UserVersion]:
+        return User.find_one(User.id == user_id, projection_model=UserVersion)
+
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Fast query retrieval using indexed collections."""
-        return await User.find_one(User.email == email)
+        return await self.user_by_email_query(email)
 
     async def get_user_by_id(self, user_id: PydanticObjectId) -> Optional[User]:
-        """Retrieves a user by their MongoDB object ID."""
-        return await User.get(user_id)
+        """
+        Retrieves a user by their MongoDB object ID. Concurrent calls for the
+        same ID share one query and the same (read-only) User instance.
+        """
+        return await self.user_by_id_flight.do(
+            str(user_id), lambda: self.user_by_id_query(user_id)
+        )
+
+    @staticmethod
+    def user_etag(user: Union[User, UserVersion]) -> str:
+        return make_etag("user", user.id, user.version)
+
+    async def get_user_etag(self, user_id: PydanticObjectId) -> Optional[str]:
+        """
+        Current ETag of a profile from a projection of (_id, version), so a
+        revalidation that ends in 304 never loads the full document.
+        """
+        stamp = await self.user_version_query(user_id)
+        return self.user_etag(stamp) if stamp else None
 
     async def update_user_preferences(
         self, user_id: PydanticObjectId, updates: dict
     ) -> Optional[User]:
-        """Updates embedded preferences document."""
-        user = await self.get_user_by_id(user_id)
+        """
+        Updates embedded preferences document and bumps the version, in one
+        atomic find-and-modify (concurrent updates get distinct versions).
+        """
+        user = await User.find_one(User.id == user_id).update(
+            Set(
+                {
+                    **{f"preferences.{key}": value for key, value in updates.items()},
+                    "updated_at": datetime.utcnow(),  # Export watermark
+                }
+            ),
+            Inc({User.version: 1}),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
         if user:
-            # Simple update for demonstration
-            user.preferences.update(updates)
-            await user.save()
+            # Lazy import to avoid circular dependency issues at the module level
+            from services.alerts import alert_engine
+
+            alert_engine.preferences.invalidate(user_id)
             return user
         return None
 
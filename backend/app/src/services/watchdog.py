@@ -0,0 +1,229 @@
+# backend/app/src/services/watchdog.py
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import redis
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EVENTS_KEY = "watchdog:recycles"
+DRAIN_LOCK_KEY = "watchdog:draining:api"
+MB = 1024 * 1024
+
+# Deletes the drain lock only if this worker still owns it: once it expired,
+# another worker may hold it
+RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_client = None
+
+
+def _redis() -> redis.Redis:
+    # Synchronous: Celery children are sync code; the API calls it in a thread
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=2.0)
+    return _client
+
+
+def rss_bytes(pid: Optional[int] = None) -> int:
+    """Current resident set size from /proc (0 where /proc is unavailable)."""
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return 0
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def record_recycle(role: str, reason: str, rss: int, **details: Any):
+    """Appends a recycle event to the shared, bounded list in Redis."""
+    event = {
+        "role": role,
+        "pid": os.getpid(),
+        "reason": reason,
+        "rss_mb": round(rss / MB, 1),
+        "at": time.time(),
+        **details,
+    }
+    logger.warning("Recycling %s process", role, extra=event)
+    try:
+        pipe = _redis().pipeline()
+        pipe.lpush(EVENTS_KEY, json.dumps(event))
+        pipe.ltrim(EVENTS_KEY, 0, settings.WATCHDOG_EVENTS_KEPT - 1)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.error("Failed to record recycle event: %s", e)
+
+
+def recent_recycles(limit: int = 50) -> List[Dict[str, Any]]:
+    """Most recent recycle events across all API workers and Celery children."""
+    try:
+        raw = _redis().lrange(EVENTS_KEY, 0, limit - 1)
+    except redis.RedisError as e:
+        logger.error("Failed to read recycle events: %s", e)
+        return []
+    return [json.loads(item) for item in raw]
+
+
+class MemoryWatchdog:
+    """
+    Samples the RSS of this API worker and recycles it once it stays above
+    WATCHDOG_API_MAX_RSS_MB for WATCHDOG_SUSTAINED_SAMPLES samples (transient
+    spikes from a large request pass). Recycling is a SIGTERM to itself:
+    uvicorn stops accepting, finishes in-flight requests and runs the
+    shutdown hooks (telemetry/rollup flushes), and gunicorn forks a
+    replacement. A Redis lock lets only one worker drain at a time, so
+    capacity never drops by more than one worker.
+
+    Without a supervisor (plain `uvicorn`, tests) nothing would replace the
+    process, so the watchdog only logs and records the event.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._over_samples = 0
+        self._lock_token = f"{os.getpid()}:{uuid.uuid4().hex}"
+        self.recycling = False
+        self.metrics = {"samples": 0, "rss_mb": 0.0, "peak_rss_mb": 0.0}
+
+    async def start(self):
+        if not settings.WATCHDOG_ENABLED or settings.WATCHDOG_API_MAX_RSS_MB <= 0:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.recycling:
+            # Drained: let the next worker over its ceiling go
+            await asyncio.to_thread(self._release_drain_lock)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.WATCHDOG_INTERVAL_SEC)
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Memory watchdog check failed")
+
+    async def check(self):
+        rss = rss_bytes()
+        rss_mb = rss / MB
+        self.metrics["samples"] += 1
+        self.metrics["rss_mb"] = round(rss_mb, 1)
+        self.metrics["peak_rss_mb"] = max(self.metrics["peak_rss_mb"], round(rss_mb, 1))
+        if self.recycling:
+            return
+        if rss_mb <= settings.WATCHDOG_API_MAX_RSS_MB:
+            self._over_samples = 0
+            return
+        self._over_samples += 1
+        if self._over_samples >= settings.WATCHDOG_SUSTAINED_SAMPLES:
+            await self._recycle(rss)
+
+    async def _recycle(self, rss: int):
+        supervised = "gunicorn" in sys.modules
+        if supervised and not await asyncio.to_thread(self._acquire_drain_lock):
+            return  # Another worker is draining; retried on the next sample
+        self.recycling = True
+        await asyncio.to_thread(
+            record_recycle,
+            "api",
+            "max_memory",
+            rss,
+            limit_mb=settings.WATCHDOG_API_MAX_RSS_MB,
+            action="drain" if supervised else "none (unsupervised)",
+        )
+        if supervised:
+            # Open SSE streams would hold the drain until --graceful-timeout;
+            # their clients resume elsewhere from Last-Event-ID
+            from services.change_feed import change_feed
+
+            change_feed.disconnect_all()
+            os.kill(os.getpid(), signal.SIGTERM)  # Graceful under UvicornWorker
+
+    def _acquire_drain_lock(self) -> bool:
+        try:
+            return bool(
+                _redis().set(
+                    DRAIN_LOCK_KEY,
+                    self._lock_token,
+                    nx=True,
+                    ex=settings.WATCHDOG_DRAIN_LOCK_SEC,
+                )
+            )
+        except redis.RedisError:
+            return True  # Better an uncoordinated recycle than an OOM kill
+
+    def _release_drain_lock(self):
+        try:
+            _redis().eval(RELEASE_LOCK_LUA, 1, DRAIN_LOCK_KEY, self._lock_token)
+        except redis.RedisError:
+            pass  # Expires after WATCHDOG_DRAIN_LOCK_SEC
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "limit_mb": settings.WATCHDOG_API_MAX_RSS_MB,
+            "over_samples": self._over_samples,
+            "recycling": self.recycling,
+        }
+
+
+class ChildRecycleRecorder:
+    """
+    Records why a Celery prefork child is about to be replaced. The recycle
+    itself is Celery's: worker_max_tasks_per_child / worker_max_memory_per_child
+    are evaluated by the pool after a task has completed, so in-flight tasks
+    always finish and prefetched tasks wait in the parent for the new child.
+    This mirrors that check (same memory probe) to report the event.
+    """
+
+    def __init__(self):
+        self.completed = 0
+
+    def reset(self):
+        self.completed = 0
+
+    def task_finished(self):
+        from billiard.compat import mem_rss
+
+        self.completed += 1
+        max_tasks = settings.WATCHDOG_WORKER_MAX_TASKS
+        limit_kb = settings.WATCHDOG_WORKER_MAX_RSS_MB * 1024
+        if max_tasks and self.completed >= max_tasks:
+            reason = "max_tasks"
+        elif limit_kb and mem_rss() > limit_kb:
+            reason = "max_memory"
+        else:
+            return
+        record_recycle(
+            "celery",
+            reason,
+            rss_bytes(),
+            tasks_completed=self.completed,
+            limit_mb=settings.WATCHDOG_WORKER_MAX_RSS_MB,
+            action="replace after task",
+        )
+
+
+memory_watchdog = MemoryWatchdog()
+child_recycle_recorder = ChildRecycleRecorder()
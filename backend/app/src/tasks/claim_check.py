@@ -0,0 +1,65 @@
+# backend/app/src/tasks/claim_check.py
+"""
+Claim-check for large task inputs: the payload is stored in Redis (serialized
+with the task serializer and zlib-compressed) and only a small reference
+travels through the broker. Workers check the payload out by reference and
+release it once the task has succeeded; CELERY_CLAIM_CHECK_TTL_SEC bounds
+how long unreleased payloads (failed tasks) are kept.
+"""
+
+import uuid
+import zlib
+from typing import Any, Dict, Tuple
+
+import redis
+from core.config import settings
+from kombu.serialization import dumps, loads, prepare_accept_content
+
+CLAIM_KEY = "__claim__"
+
+_client = None
+
+
+def _redis() -> redis.Redis:
+    # Synchronous: publishers (TaskService) and Celery tasks are sync code
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=5.0)
+    return _client
+
+
+def encode(value: Any) -> Tuple[str, str, bytes]:
+    """Returns (content type, content encoding, compressed payload)."""
+    content_type, encoding, data = dumps(value, serializer=settings.CELERY_SERIALIZER)
+    if isinstance(data, str):
+        data = data.encode(encoding)
+    return content_type, encoding, zlib.compress(data)
+
+
+def decode(content_type: str, encoding: str, blob: bytes) -> Any:
+    # Same content types as the worker accepts (never pickle)
+    accept = prepare_accept_content([settings.CELERY_SERIALIZER, "json"])
+    return loads(zlib.decompress(blob), content_type, encoding, accept=accept)
+
+
+def check_in(value: Any) -> Dict[str, str]:
+    """Stores `value` and returns the reference to pass as the task argument."""
+    key = f"claim:{uuid.uuid4().hex}"
+    content_type, encoding, blob = encode(value)
+    _redis().set(key, blob, ex=settings.CELERY_CLAIM_CHECK_TTL_SEC)
+    return {CLAIM_KEY: key, "content_type": content_type, "encoding": encoding}
+
+
+def is_claim(value: Any) -> bool:
+    return isinstance(value, dict) and CLAIM_KEY in value
+
+
+def check_out(reference: Dict[str, str]) -> Any:
+    blob = _redis().get(reference[CLAIM_KEY])
+    if blob is None:
+        raise LookupError(f"Claim-checked payload {reference[CLAIM_KEY]} expired.")
+    return decode(reference["content_type"], reference["encoding"], blob)
+
+
+def release(reference: Dict[str, str]):
+    _redis().delete(reference[CLAIM_KEY])
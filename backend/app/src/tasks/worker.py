@@ -1,8 +1,19 @@
 # backend/app/src/tasks/worker.py
+import logging
 from time import sleep
 
 from celery import Celery
+from celery.signals import (
+    before_task_publish,
+    setup_logging as celery_setup_logging,
+    task_postrun,
+    task_prerun,
+    worker_process_init,
+)
 from core.config import settings
+from core.logger import request_id_var, setup_logging, trace_id_var
+
+logger = logging.getLogger(__name__)
 
 # Initialize Celery using Redis as the broker
 celery_app = Celery(
@@ -18,19 +29,88 @@ celery_app.conf.update(
     task_send_sent_event=True,
     task_default_retry_limit=settings.TASK_MAX_RETRIES,
     task_default_retry_delay=60,  # seconds
+    # Compact binary messages; json is still accepted so messages queued
+    # before a serializer change can be consumed
+    task_serializer=settings.CELERY_SERIALIZER,
+    result_serializer=settings.CELERY_SERIALIZER,
+    accept_content=[settings.CELERY_SERIALIZER, "json"],
+    # Results nobody fetched must not accumulate in Redis; fire-and-forget
+    # tasks set ignore_result and never store one
+    result_expires=settings.CELERY_RESULT_EXPIRES_SEC,
+    # Prefork children are replaced after a task once they hit either limit
+    # (fragmentation from torch/OpenCV allocations); checked between tasks,
+    # so nothing in flight is dropped (see services.watchdog)
+    worker_max_tasks_per_child=settings.WATCHDOG_WORKER_MAX_TASKS or None,
+    worker_max_memory_per_child=settings.WATCHDOG_WORKER_MAX_RSS_MB * 1024 or None,
+    beat_schedule={
+        "export-parquet-snapshots": {
+            "task": "services.task.export_snapshots",
+            "schedule": settings.EXPORT_INTERVAL_SEC,
+        },
+    },
 )
 
 
+@celery_setup_logging.connect
+def configure_worker_logging(**kwargs):
+    """Replaces Celery's own logging setup with the queue-backed pipeline."""
+    setup_logging("worker")
+
+
+@before_task_publish.connect
+def propagate_request_context(headers=None, **kwargs):
+    """Tags published tasks with the request/trace ids of the publisher."""
+    if headers is not None and request_id_var.get():
+        headers["request_id"] = request_id_var.get()
+        headers["trace_id"] = trace_id_var.get()
+
+
+@task_prerun.connect
+def bind_task_context(task_id=None, task=None, **kwargs):
+    """Binds the originating request's ids (else the task id) to task logs."""
+    if task.request.is_eager:
+        return  # Runs inside the publishing request, which already has ids
+    request_id_var.set(task.request.get("request_id") or task_id)
+    trace_id_var.set(task.request.get("trace_id") or task_id)
+
+
+@task_postrun.connect
+def record_child_recycle(task=None, **kwargs):
+    """Reports the recycle the pool is about to perform after this task."""
+    if task.request.is_eager:
+        return
+    from services.watchdog import child_recycle_recorder
+
+    child_recycle_recorder.task_finished()
+
+
+@worker_process_init.connect
+def init_inference_runtime(**kwargs):
+    """
+    Runs in every prefork child: restarts the log writer thread (threads are
+    not inherited across fork), sizes torch/onnxruntime thread pools for this
+    process and loads the model (not inherited from the parent).
+    """
+    from services.inference import configure_threads
+    from services.ml import ml_service
+    from services.watchdog import child_recycle_recorder
+
+    setup_logging("worker")
+    child_recycle_recorder.reset()
+    configure_threads()
+    ml_service.load_runtime()
+
+
 @celery_app.task(bind=True)
 def example_long_running_task(self, data: dict):
     """
     Placeholder for a heavy, background job (e.g., report generation).
     """
     try:
-        print(f"Starting heavy task for data: {data}")
+        logger.info("Starting heavy task for data: %s", data)
         # Simulate long-running I/O or computation
         sleep(5)
-        print("Task completed successfully.")
+        logger.info("Task completed successfully.")
         return {"status": "completed", "result": f"Processed {len(data)} items."}
     except Exception as e:
         # **Resilience** principle: structured retry
@@ -39,4 +39,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-# NOTE: A function for token decoding/validation would be added here later for middleware.
+def decode_access_token(token: str) -> dict:
+    """
+    Verifies a JWT's signature and expiry and returns its claims.
+    Raises jwt.PyJWTError if the token is invalid or expired.
+    """
+    return jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -77,3 +77,78 @@ async def test_register_duplicate_email_fails(client: AsyncClient, db_client):
     # Validation
     assert response.status_code == 409
     assert "Email already registered" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_register_duplicate_username_fails(client: AsyncClient, db_client):
+    """
+    The unique username index is mapped to a 409 as well.
+    """
+    await client.post(
+        "/api/v1/auth/register",
+        json={"email": "first@test.com", "username": "taken", "password": "p"},
+    )
+
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={"email": "second@test.com", "username": "taken", "password": "p"},
+    )
+
+    assert response.status_code == 409
+    assert "Username already taken" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_registrations_create_one_user(client: AsyncClient, db_client):
+    """
+    Registration relies on the unique index, so racing requests cannot both win.
+    """
+    import asyncio
+
+    responses = await asyncio.gather(
+        *(
+            client.post(
+                "/api/v1/auth/register",
+                json={"email": "race@test.com", "username": f"r{i}", "password": "p"},
+            )
+            for i in range(5)
+        )
+    )
+
+    assert sorted(r.status_code for r in responses) == [201, 409, 409, 409, 409]
+    assert await User.find(User.email == "race@test.com").count() == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_reports_per_row_conflicts(client: AsyncClient, db_client):
+    """
+    Bulk onboarding inserts all valid rows and reports conflicts by row index.
+    """
+    await client.post(
+        "/api/v1/auth/register",
+        json={"email": "existing@test.com", "username": "existing", "password": "p"},
+    )
+
+    response = await client.post(
+        "/api/v1/admin/users/import",
+        json={
+            "users": [
+                {"email": "new1@test.com", "username": "new1", "password": "p"},
+                {"email": "existing@test.com", "username": "other", "password": "p"},
+                {"email": "not-an-email", "password": "p"},
+                {"email": "new1@test.com", "username": "new1b", "password": "p"},
+                {"email": "new2@test.com", "username": "existing", "password": "p"},
+                {"email": "new3@test.com", "password": "p"},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert [row["index"] for row in report["inserted"]] == [0, 5]
+    conflicts = {c["index"]: c["error"] for c in report["conflicts"]}
+    assert conflicts[1] == "Email already registered."
+    assert conflicts[2].startswith("Invalid user")
+    assert conflicts[3] == "Email already registered."  # Duplicate within the batch
+    assert conflicts[4] == "Username already taken."
+    assert await User.count() == 3
@@ -0,0 +1,25 @@
+# test/backend/integration/test_conditional_requests.py
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_project_listing_revalidates_with_etag(client, db_client):
+    """
+    An unchanged listing answers If-None-Match with 304; an update changes
+    the ETag (updated_at is persisted with the update).
+    """
+    created = await client.post("/api/v1/data/projects", json={"name": "Fleet A"})
+    listing = await client.get("/api/v1/data/projects")
+    etag = listing.headers["etag"]
+
+    unchanged = await client.get(
+        "/api/v1/data/projects", headers={"If-None-Match": etag}
+    )
+    assert unchanged.status_code == 304
+
+    await client.patch(
+        f"/api/v1/data/projects/{created.json()['_id']}", json={"status": "Done"}
+    )
+    changed = await client.get("/api/v1/data/projects", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
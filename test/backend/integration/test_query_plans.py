@@ -0,0 +1,73 @@
+# test/backend/integration/test_query_plans.py
+import pytest
+
+from backend.app.src.db.query_plans import (
+    QUERY_REGISTRY,
+    analyze_plan,
+    check_registered_queries,
+    seed_collections,
+)
+
+
+@pytest.mark.asyncio
+async def test_registered_queries_use_indexes(db_client):
+    """
+    Every registered service query must avoid COLLSCAN, in-memory SORT and
+    excessive docs-examined/returned ratios on a seeded database.
+    """
+    seed = await seed_collections(users=50, projects_per_user=10)
+
+    results = await check_registered_queries(seed)
+
+    assert len(results) == len(QUERY_REGISTRY)
+    failures = {r.name: r.problems for r in results if not r.ok}
+    assert failures == {}
+
+
+def test_analyze_plan_flags_collscan_and_sort():
+    """
+    The analyzer must flag scans, blocking sorts and poor selectivity.
+    """
+    explain = {
+        "queryPlanner": {
+            "winningPlan": {
+                "stage": "SORT",
+                "inputStage": {"stage": "COLLSCAN"},
+            }
+        },
+        "executionStats": {"totalDocsExamined": 500, "nReturned": 10},
+    }
+
+    result = analyze_plan("example", explain, max_examined_ratio=2.0)
+
+    assert result.stages == ["SORT", "COLLSCAN"]
+    assert len(result.problems) == 3
+
+
+def test_analyze_plan_unwraps_time_series_explain():
+    """
+    Time-series finds explain as a bucket aggregation; the index plan sits in
+    the leading $cursor stage and a blocking $sort after it is flagged.
+    """
+    explain = {
+        "stages": [
+            {
+                "$cursor": {
+                    "queryPlanner": {
+                        "winningPlan": {
+                            "stage": "FETCH",
+                            "inputStage": {"stage": "IXSCAN"},
+                        }
+                    },
+                    "executionStats": {"totalDocsExamined": 3, "nReturned": 3},
+                }
+            },
+            {"$_internalUnpackBucket": {}},
+            {"$sort": {"sortKey": {"ts": 1}}},
+        ]
+    }
+
+    result = analyze_plan("example", explain)
+
+    assert result.stages == ["$sort", "$_internalUnpackBucket", "FETCH", "IXSCAN"]
+    assert result.problems == ["blocking sort of unpacked events ($sort stage)"]
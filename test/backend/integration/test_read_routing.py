@@ -0,0 +1,28 @@
+# test/backend/integration/test_read_routing.py
+import pytest
+
+from backend.app.src.db.models import PydanticObjectId
+from backend.app.src.db.routing import causal_session
+from backend.app.src.services.data import data_service
+
+
+@pytest.mark.asyncio
+async def test_causal_session_reads_its_own_writes(db_client):
+    """
+    A project created in a causal session is listed by the routed ("list")
+    query in the same session. Against a replica set (?replicaSet=rs0) the
+    read may be served by a secondary.
+    """
+    owner_id = PydanticObjectId()
+
+    async with causal_session(db_client) as session:
+        project = await data_service.create_project(
+            owner_id=owner_id, name="Fleet A", details={}, session=session
+        )
+        projects = await data_service.get_projects_by_owner(owner_id, session=session)
+
+    assert [p.id for p in projects] == [project.id]
+    # Without a session the routed read goes through the single-flight group
+    assert [p.id for p in await data_service.get_projects_by_owner(owner_id)] == [
+        project.id
+    ]
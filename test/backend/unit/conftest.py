@@ -0,0 +1,8 @@
+# test/backend/unit/conftest.py
+import pytest
+
+
+@pytest.fixture(scope="function", autouse=True)
+def cleanup_db():
+    """Unit tests run without MongoDB: overrides the integration cleanup fixture."""
+    yield
@@ -0,0 +1,105 @@
+# test/backend/unit/test_alerts.py
+import asyncio
+
+import pytest
+
+from backend.app.src.services.alerts import AlertRule, AlertRuleEngine
+
+SUSTAINED = AlertRule(
+    name="sustained",
+    field="prediction",
+    op="==",
+    threshold="high",
+    consecutive=3,
+    cooldown_sec=60.0,
+)
+HIGH = {"prediction": "high", "score": 0.7}
+LOW = {"prediction": "low", "score": 0.2}
+
+
+def test_rule_fires_after_consecutive_matches():
+    """
+    A non-matching event resets the streak; the rule fires on the Nth match in a row.
+    """
+    engine = AlertRuleEngine(rules=[SUSTAINED])
+
+    fired = [
+        engine.evaluate("s1", event, now=float(t))
+        for t, event in enumerate([HIGH, HIGH, LOW, HIGH, HIGH, HIGH])
+    ]
+
+    assert [len(f) for f in fired] == [0, 0, 0, 0, 0, 1]
+
+
+def test_cooldown_deduplicates_an_episode():
+    """
+    A long high-risk episode produces a single alert per cooldown period,
+    and sessions do not share state.
+    """
+    engine = AlertRuleEngine(rules=[SUSTAINED])
+
+    fired = sum(len(engine.evaluate("s1", HIGH, now=t / 10)) for t in range(500))
+    other_session = engine.evaluate("s2", HIGH, now=0.0)
+
+    assert fired == 1
+    assert engine.metrics["suppressed_cooldown"] > 0
+    assert other_session == []
+    # A still-ongoing episode alerts again once the cooldown has expired
+    assert len(engine.evaluate("s1", HIGH, now=200.0)) == 1
+
+
+@pytest.mark.asyncio
+async def test_alert_is_dispatched_before_it_is_persisted(monkeypatch):
+    from backend.app.src.services import notification as notification_module
+
+    events = []
+
+    class SlowAlert:
+        def __init__(self, **fields):
+            self.user_id = fields["user_id"]
+
+        async def insert(self):
+            await asyncio.sleep(0.05)  # e.g. MongoDB failing over
+            events.append("persisted")
+
+    monkeypatch.setattr(notification_module, "Alert", SlowAlert)
+    service = notification_module.NotificationService()
+    monkeypatch.setattr(
+        service, "send_user_alert", lambda **kw: events.append("dispatched") or "t1"
+    )
+
+    assert await service.create_alert("u1", "Take a break.") == "t1"
+    assert events == ["dispatched"]
+    await service.drain()
+    assert events == ["dispatched", "persisted"]
+
+
+@pytest.mark.asyncio
+async def test_anonymous_frames_report_no_dispatched_alerts():
+    engine = AlertRuleEngine(rules=[AlertRule(name="any", threshold=0.5)])
+
+    assert await engine.process("s1", None, HIGH) == []
+    assert engine.metrics["fired"] == 0
+
+
+@pytest.mark.asyncio
+async def test_preference_cache_evicts_least_recently_used(monkeypatch):
+    from backend.app.src.services import alerts as alerts_module
+
+    lookups = []
+
+    async def get_user_by_id(user_id):
+        lookups.append(str(user_id))
+        return None
+
+    monkeypatch.setattr(alerts_module.settings, "ALERT_PREFS_CACHE_SIZE", 2)
+    # Patched where the cache lazily imports it from
+    monkeypatch.setattr("services.user.user_service.get_user_by_id", get_user_by_id)
+    cache = alerts_module.PreferenceCache()
+    hot, cold, new = "a" * 24, "b" * 24, "c" * 24
+
+    for user_id in (hot, cold, hot, new, hot):
+        await cache.notifications_enabled(user_id)
+
+    assert lookups == [hot, cold, new]  # `hot` stayed cached throughout
+    assert list(cache._entries) == [new, hot]
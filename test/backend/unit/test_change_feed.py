@@ -0,0 +1,109 @@
+# test/backend/unit/test_change_feed.py
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from backend.app.src.services import change_feed as feed_module
+from backend.app.src.services.change_feed import RESYNC_FRAME, ChangeFeed
+
+OWNER = ObjectId("ffffffffffffffffffffffff")
+
+
+def project_change(token, op="update", owner=OWNER, status="Active"):
+    project = {
+        "_id": ObjectId(),
+        "owner_id": owner,
+        "name": "Fleet A",
+        "status": status,
+        "updated_at": datetime(2025, 1, 1),
+    }
+    return {
+        "_id": {"_data": token},
+        "operationType": op,
+        "ns": {"coll": "projects"},
+        "documentKey": {"_id": project["_id"]},
+        "fullDocument": project,
+    }
+
+
+def alert_change(token, user_id):
+    return {
+        "_id": {"_data": token},
+        "operationType": "insert",
+        "ns": {"coll": "alerts"},
+        "documentKey": {"_id": ObjectId()},
+        "fullDocument": {"user_id": user_id, "message": "Take a break."},
+    }
+
+
+def frames(subscription):
+    out = []
+    while not subscription.queue.empty():
+        out.append(subscription.queue.get_nowait())
+    return out
+
+
+@pytest.fixture
+def feed():
+    feed = ChangeFeed()
+    feed.available = True
+    return feed
+
+
+def test_events_are_routed_to_the_owner(feed):
+    mine, _ = feed.subscribe(str(OWNER))
+    other, _ = feed.subscribe("aaaaaaaaaaaaaaaaaaaaaaaa")
+
+    feed.publish(project_change("01"))
+    feed.publish(alert_change("02", str(OWNER)))
+
+    received = frames(mine)
+    assert [frame.split(b"\n")[1] for frame in received] == [
+        b"event: project",
+        b"event: alert",
+    ]
+    data = json.loads(received[0].split(b"data: ")[1])
+    assert data["op"] == "update"
+    assert data["project"]["owner_id"] == str(OWNER)
+    assert frames(other) == []
+
+
+def test_delete_is_routed_by_pre_image(feed):
+    subscription, _ = feed.subscribe(str(OWNER))
+    change = project_change("01", op="delete")
+    change["fullDocumentBeforeChange"] = {"owner_id": OWNER}
+    del change["fullDocument"]
+
+    feed.publish(change)
+    feed.publish({**change, "fullDocumentBeforeChange": None})  # No pre-image
+
+    (frame,) = frames(subscription)
+    assert json.loads(frame.split(b"data: ")[1])["op"] == "delete"
+    assert feed.metrics["unroutable"] == 1
+
+
+def test_reconnect_replays_missed_events(feed):
+    for token in ("01", "02", "03"):
+        feed.publish(project_change(token))
+    feed.publish(alert_change("04", "aaaaaaaaaaaaaaaaaaaaaaaa"))
+
+    _, backlog = feed.subscribe(str(OWNER), last_event_id="01")
+    assert [frame.split(b"\n")[0] for frame in backlog] == [b"id: 02", b"id: 03"]
+
+    _, backlog = feed.subscribe(str(OWNER), last_event_id="evicted")
+    assert backlog == [RESYNC_FRAME]
+
+
+def test_slow_consumer_is_disconnected(feed, monkeypatch):
+    monkeypatch.setattr(feed_module.settings, "CHANGE_FEED_QUEUE_SIZE", 2)
+    slow, _ = feed.subscribe(str(OWNER))
+
+    for token in ("01", "02", "03"):
+        feed.publish(project_change(token))
+
+    # Backlog discarded (replayed on reconnect), stream ended, unsubscribed
+    assert frames(slow) == [None]
+    assert feed.subscriber_count == 0
+    assert feed.metrics["slow_disconnects"] == 1
@@ -0,0 +1,96 @@
+# test/backend/unit/test_db_client.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from beanie import Indexed
+from pydantic import BaseModel
+from pymongo import IndexModel
+
+from backend.app.src.db import client as client_module
+from backend.app.src.db.client import MongoDBClient
+
+
+class FakeAdmin:
+    def __init__(self, fail=False):
+        self.pings = 0
+        self.fail = fail
+
+    async def command(self, name):
+        self.pings += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise ConnectionError("no primary")
+        return {"ok": 1}
+
+
+def connected(admin):
+    client = MongoDBClient()
+    client.client = SimpleNamespace(admin=admin)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_readiness_is_cached_and_probes_share_one_ping(monkeypatch):
+    monkeypatch.setattr(client_module.settings, "MONGO_READY_CACHE_SEC", 60)
+    admin = FakeAdmin()
+    client = connected(admin)
+
+    results = await asyncio.gather(*(client.is_ready() for _ in range(10)))
+    assert results == [True] * 10
+    assert admin.pings == 1
+
+    admin.fail = True
+    assert await client.is_ready() is True  # Cached result, no new ping
+    assert admin.pings == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_ping_reports_not_ready_until_it_recovers(monkeypatch):
+    monkeypatch.setattr(client_module.settings, "MONGO_READY_CACHE_SEC", 0)
+    admin = FakeAdmin(fail=True)
+    client = connected(admin)
+
+    assert await client.is_ready() is False
+    admin.fail = False
+    assert await client.is_ready() is True
+    assert admin.pings == 2
+    assert await MongoDBClient().is_ready() is False  # Never connected
+
+
+class FakeCollection:
+    name = "vehicles"
+
+    async def index_information(self):
+        return {
+            "_id_": {"key": [("_id", 1)]},
+            "vin_1": {"key": [("vin", 1)]},
+        }
+
+
+class Vehicle(BaseModel):
+    vin: Indexed(str)
+    owner_id: str
+
+    @classmethod
+    def get_settings(cls):
+        return SimpleNamespace(
+            indexes=[SimpleNamespace(index=IndexModel([("owner_id", 1), ("vin", -1)]))]
+        )
+
+    @classmethod
+    def get_motor_collection(cls):
+        return FakeCollection()
+
+
+@pytest.mark.asyncio
+async def test_verify_indexes_reports_missing_index(monkeypatch):
+    monkeypatch.setattr(client_module, "DOCUMENT_MODELS", [Vehicle])
+    client = MongoDBClient()
+
+    report = await client.verify_indexes()
+
+    assert report == {
+        "vehicles": {"present": ["vin_1"], "missing": ["owner_id_1_vin_-1"]}
+    }
+    assert client.index_report == report
@@ -0,0 +1,48 @@
+# test/backend/unit/test_executor.py
+import time
+
+import pytest
+
+from backend.app.src.services import executor as executor_module
+from backend.app.src.services.executor import (
+    InferenceExecutor,
+    InferenceOverloaded,
+    InferenceTimeout,
+)
+
+
+def _slow(seconds):
+    time.sleep(seconds)
+    return "done", seconds
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    monkeypatch.setattr(executor_module.settings, "ML_EXECUTOR_MODE", "thread")
+    monkeypatch.setattr(executor_module.settings, "ML_EXECUTOR_WORKERS", 1)
+    monkeypatch.setattr(executor_module.settings, "ML_EXECUTOR_MAX_QUEUE", 4)
+    monkeypatch.setattr(executor_module.settings, "ML_SERVICE_TIMEOUT_SEC", 0.2)
+    executor = InferenceExecutor()
+    yield executor
+    executor.stop()
+
+
+@pytest.mark.asyncio
+async def test_times_out_and_frees_the_slot(executor):
+    with pytest.raises(InferenceTimeout):
+        await executor._run(_slow, 0.5)
+
+    time.sleep(0.4)  # Let the abandoned job finish
+    assert await executor._run(_slow, 0.0) == "done"
+    assert executor.stats()["in_flight"] == 0
+    assert executor.metrics["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_estimated_wait_exceeds_timeout(executor):
+    executor._service_time = 0.15  # Observed service time per job
+    executor._in_flight = 2  # One running, one queued ahead
+
+    with pytest.raises(InferenceOverloaded):
+        await executor._run(_slow, 0.0)
+    assert executor.metrics["rejected"] == 1
@@ -0,0 +1,80 @@
+# test/backend/unit/test_export.py
+from datetime import datetime
+
+from backend.app.src.services.export import (
+    TABLES,
+    ExportService,
+    latest_versions,
+    read_snapshot,
+)
+
+PROJECTS = next(table for table in TABLES if table.name == "projects")
+
+
+def _project(status, updated_at):
+    return PROJECTS.row(
+        {
+            "_id": "p1",
+            "owner_id": "u1",
+            "name": "demo",
+            "status": status,
+            "details": {},
+            "created_at": datetime(2025, 1, 1),
+            "updated_at": updated_at,
+        }
+    )
+
+
+def test_partitions_by_day_and_reads_latest_version(tmp_path):
+    service = ExportService(str(tmp_path))
+    service._write_partitions(
+        PROJECTS, [_project("Draft", datetime(2025, 1, 1, 8))], "run1", 0
+    )
+    service._write_partitions(
+        PROJECTS, [_project("Active", datetime(2025, 1, 2, 9))], "run2", 0
+    )
+
+    assert sorted(p.name for p in (tmp_path / "projects").iterdir()) == [
+        "date=2025-01-01",
+        "date=2025-01-02",
+    ]
+    snapshot = read_snapshot("projects", export_dir=str(tmp_path))
+    assert snapshot.num_rows == 2
+    assert latest_versions(snapshot)["status"].tolist() == ["Active"]
+
+    pruned = read_snapshot(
+        "projects", filters=[("date", "<", "2025-01-02")], export_dir=str(tmp_path)
+    )
+    assert pruned.column("status").to_pylist() == ["Draft"]
+
+
+class FakeCursor(list):
+    def sort(self, sort):
+        return self
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find(self, query, projection, batch_size):
+        return FakeCursor(self.documents)
+
+
+def test_watermark_advances_to_newest_exported_row_only(tmp_path):
+    service = ExportService(str(tmp_path))
+    until = datetime(2025, 1, 3)
+    docs = [
+        {"_id": "p1", "owner_id": "u1", "updated_at": datetime(2025, 1, 1, 8)},
+        {"_id": "p2", "owner_id": "u1", "updated_at": datetime(2025, 1, 2, 9)},
+    ]
+
+    stats = service.export_table(
+        {"projects": FakeCollection(docs)}, PROJECTS, None, until
+    )
+    empty = service.export_table(
+        {"projects": FakeCollection([])}, PROJECTS, None, until
+    )
+
+    assert stats == {"rows": 2, "files": 2, "watermark": "2025-01-02T09:00:00"}
+    assert empty["watermark"] is None  # The previous watermark is kept
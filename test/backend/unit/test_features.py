@@ -0,0 +1,80 @@
+# test/backend/unit/test_features.py
+import statistics
+
+import pytest
+
+from backend.app.src.services import features as features_module
+from backend.app.src.services.features import (
+    FEATURE_NAMES,
+    FeatureEngine,
+    RollingWindow,
+)
+
+
+def test_rolling_window_matches_full_recomputation():
+    """
+    Incremental mean/variance must match a recomputation over the live samples,
+    across capacity wrap-around and the periodic drift correction.
+    """
+    window = RollingWindow(channels=1, capacity=50, horizon_sec=1_000)
+    values = [((i * 37) % 101) / 7 for i in range(500)]
+
+    for ts, value in enumerate(values):
+        window.push(float(ts), [value])
+
+    live = values[-50:]
+    assert len(window) == 50
+    assert window.mean() == pytest.approx(statistics.fmean(live))
+    assert window.variance() == pytest.approx(statistics.pvariance(live))
+
+
+def test_rolling_window_expires_by_time():
+    """
+    Samples older than the horizon are evicted on push.
+    """
+    window = RollingWindow(channels=1, capacity=100, horizon_sec=10)
+    for ts in range(20):
+        window.push(float(ts), [1.0 if ts < 10 else 3.0])
+
+    assert len(window) == 11  # ts 9..19
+    assert window.mean() == pytest.approx((1.0 + 10 * 3.0) / 11)
+
+
+def test_feature_engine_perclos_blinks_and_eviction(monkeypatch):
+    """
+    PERCLOS and blink rate follow the eye signal; least recently used
+    sessions are evicted beyond FEATURE_MAX_SESSIONS.
+    """
+    settings = features_module.settings
+    monkeypatch.setattr(settings, "FEATURE_MAX_SESSIONS", 2)
+    engine = FeatureEngine()
+
+    # 10 frames, eyes closed on every other frame -> 5 blinks, PERCLOS 0.5
+    for i in range(10):
+        vector = engine.update("s1", {"ear": 0.1 if i % 2 == 0 else 0.3}, ts=i * 0.1)
+    features = dict(zip(FEATURE_NAMES, vector))
+    assert features["perclos"] == pytest.approx(0.5)
+    assert features["blink_rate_per_min"] == pytest.approx(
+        5 * 60 / settings.FEATURE_WINDOW_SEC
+    )
+
+    engine.update("s2", {"ear": 0.3})
+    engine.update("s3", {"ear": 0.3})
+    assert engine.active_sessions == 2
+    assert engine.metrics["sessions_evicted"] == 1
+
+
+def test_missing_signals_are_not_counted_as_zero():
+    """A frame without `ear` is not "eyes closed" and does not skew means."""
+    engine = FeatureEngine()
+
+    engine.update("s1", {"ear": 0.3, "mar": 0.4}, ts=0.0)
+    engine.update("s1", {"mar": 0.2}, ts=0.1)  # No eye signal
+    vector = engine.update("s1", {"ear": 0.3, "head_yaw": None}, ts=0.2)
+
+    features = dict(zip(FEATURE_NAMES, vector))
+    assert features["perclos"] == 0.0
+    assert features["blink_rate_per_min"] == 0.0
+    assert features["ear_mean"] == pytest.approx(0.3)
+    assert features["mar_mean"] == pytest.approx(0.3)
+    assert features["head_yaw_mean"] == 0.0  # Never observed
@@ -0,0 +1,81 @@
+# test/backend/unit/test_http_caching.py
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from backend.app.src.core import compression
+from backend.app.src.core.compression import CompressionMiddleware, negotiate
+from backend.app.src.core.conditional import etag_matches, make_etag
+
+
+def test_etag_matching_ignores_weakness_and_encoding_suffix():
+    etag = make_etag("projects", "owner", [(1, "t")])
+
+    assert etag == make_etag("projects", "owner", [(1, "t")])
+    assert etag != make_etag("projects", "owner", [(1, "t2")])
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches(etag[:-1] + '-gzip"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, deflate", "gzip"),
+        ("gzip;q=0, identity", None),
+        ("*", "gzip"),
+        ("identity", None),
+    ],
+)
+def test_negotiation_without_brotli(monkeypatch, header, expected):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert negotiate(header) == expected
+
+
+def _client(monkeypatch) -> TestClient:
+    monkeypatch.setattr(compression.settings, "COMPRESSION_MIN_BYTES", 100)
+    monkeypatch.setattr(compression, "brotli", None)
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+    large = [{"id": i, "name": "project"} for i in range(50)]
+
+    @app.get("/large")
+    async def get_large():
+        return JSONResponse(large, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    async def get_small():
+        return PlainTextResponse("ok")
+
+    @app.get("/events")
+    async def get_events():
+        body = iter([b"data: " + b"x" * 200 + b"\n\n"])
+        return StreamingResponse(body, media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+def test_large_responses_are_compressed_with_encoded_etag(monkeypatch):
+    client = _client(monkeypatch)
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == '"abc-gzip"'
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert len(response.json()) == 50
+
+
+def test_small_and_streaming_responses_pass_through(monkeypatch):
+    client = _client(monkeypatch)
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    events = client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in events.headers
+    assert "vary" not in events.headers
@@ -0,0 +1,31 @@
+# test/backend/unit/test_inference.py
+from backend.app.src.services import inference
+
+
+def test_thread_budget_splits_cores_across_processes(monkeypatch):
+    monkeypatch.setattr(inference.os, "cpu_count", lambda: 12)
+    monkeypatch.setattr(inference.settings, "ML_WEB_WORKERS", 4)
+    monkeypatch.setattr(inference.settings, "ML_CELERY_CONCURRENCY", 2)
+    monkeypatch.setattr(inference.settings, "ML_INTRA_OP_THREADS", None)
+
+    assert inference.thread_budget()["intra_op"] == 2
+
+    monkeypatch.setattr(inference.settings, "ML_INTRA_OP_THREADS", 3)
+    assert inference.thread_budget()["intra_op"] == 3
+
+
+def test_benchmark_runs_backends_on_identical_inputs():
+    backends = {
+        "a": inference.PlaceholderBackend(),
+        "b": inference.PlaceholderBackend(),
+    }
+
+    rows = inference.benchmark(backends, dim=4, batch_sizes=(1, 8), repeats=5)
+
+    assert [(r["backend"], r["batch_size"]) for r in rows] == [
+        ("a", 1),
+        ("b", 1),
+        ("a", 8),
+        ("b", 8),
+    ]
+    assert all(r["max_abs_diff"] == 0 for r in rows)
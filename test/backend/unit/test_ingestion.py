@@ -0,0 +1,115 @@
+# test/backend/unit/test_ingestion.py
+from datetime import datetime
+
+import pytest
+
+from backend.app.src.services import ingestion
+from backend.app.src.services.ingestion import (
+    IngestionError,
+    file_digest,
+    iter_chunks,
+    parse_chunk,
+)
+
+CSV = (
+    b"vehicle_id,session_id,timestamp,ear,mar,head_pitch,head_yaw,label\n"
+    b"v1,s1,1700000000,0.31,0.2,1,2,awake\n"
+    b"\n"
+    b"v2,,2024-01-01T10:00:00Z,bad,0.1,,,\n"
+    b",s1,1700000001,0.3,0,0,0,awake\n"
+    b"v3,s3,1700000002,0.2,0,0,0,drowsy"
+)
+
+
+def test_chunks_end_on_line_boundaries_and_cover_the_file(tmp_path):
+    path = tmp_path / "drivers.csv"
+    path.write_bytes(CSV)
+    header_size = CSV.index(b"\n") + 1
+
+    chunks = list(iter_chunks(str(path), 0, chunk_bytes=20))
+
+    assert chunks[0][1] == header_size
+    assert b"".join(chunk for _, _, chunk in chunks) == CSV[header_size:]
+    assert all(chunk.endswith(b"\n") for _, _, chunk in chunks[:-1])
+
+
+def test_parse_chunk_coerces_types_and_rejects_invalid_rows():
+    header_size = CSV.index(b"\n") + 1
+    header, body = CSV[:header_size], CSV[header_size:]
+
+    docs, rejected = parse_chunk(header, header_size, body, "drivers", "f00d")
+
+    assert rejected == 2  # Blank line and missing vehicle_id
+    assert [d["vehicle_id"] for d in docs] == ["v1", "v2", "v3"]
+    assert docs[0]["_id"] == f"drivers:f00d:{header_size}"
+    assert docs[0]["ts"] == datetime(2023, 11, 14, 22, 13, 20)
+    assert docs[1]["ts"] == datetime(2024, 1, 1, 10, 0)
+    assert docs[1]["ear"] is None and docs[1]["session_id"] is None
+    assert isinstance(docs[2]["mar"], float)
+    assert CSV[int(docs[2]["_id"].split(":")[2]) :].startswith(b"v3,")
+
+
+def test_rows_with_extra_fields_are_rejected_not_raised():
+    header = b"vehicle_id,timestamp,ear\n"
+    body = b"v1,1700000000,0.3\nv2,1700000001,0.3,extra,fields\nv3,1700000002,0.2\n"
+
+    docs, rejected = parse_chunk(header, len(header), body, "drivers", "f00d")
+
+    assert rejected == 1
+    assert [d["vehicle_id"] for d in docs] == ["v1", "v3"]
+    assert body[int(docs[1]["_id"].split(":")[2]) - len(header) :].startswith(b"v3,")
+
+
+def test_row_ids_differ_for_a_different_file_under_the_same_dataset(tmp_path):
+    original, corrected = tmp_path / "a.csv", tmp_path / "b.csv"
+    original.write_bytes(CSV)
+    corrected.write_bytes(CSV.replace(b"0.31", b"0.32"))
+    header_size = CSV.index(b"\n") + 1
+    header, body = CSV[:header_size], CSV[header_size:]
+
+    def ids(path):
+        docs, _ = parse_chunk(header, header_size, body, "drivers", file_digest(path))
+        return [doc["_id"] for doc in docs]
+
+    assert ids(original) == ids(original)  # Re-sent rows dedupe on resume
+    assert set(ids(original)).isdisjoint(ids(corrected))
+
+
+class FailingCollection:
+    async def insert_many(self, documents, ordered):
+        raise ConnectionError("insert failed")
+
+
+class UnsavableJob:
+    """Saves while the job starts, then MongoDB goes away."""
+
+    def __init__(self, path):
+        self.id, self.path, self.dataset = "job-1", path, "drivers"
+        self.file_digest = file_digest(path)
+        self.offset = self.rows_inserted = self.rows_rejected = 0
+        self.rows_duplicate, self.rows_per_sec = 0, 0.0
+        self.status = self.error = self.updated_at = None
+        self.saves = 0
+
+    async def save(self):
+        self.saves += 1
+        if self.saves > 1:
+            raise ConnectionError("MongoDB unreachable")
+
+
+@pytest.mark.asyncio
+async def test_failure_raises_ingestion_error_even_if_checkpoint_fails(
+    tmp_path, monkeypatch
+):
+    path = tmp_path / "drivers.csv"
+    path.write_bytes(CSV)
+    monkeypatch.setattr(
+        ingestion.DatasetSample, "get_motor_collection", lambda: FailingCollection()
+    )
+    job = UnsavableJob(str(path))
+
+    with pytest.raises(IngestionError) as failure:
+        await ingestion.ingestion_service.ingest(job)
+
+    assert failure.value.job_id == "job-1"
+    assert job.status == "failed"
@@ -0,0 +1,83 @@
+# test/backend/unit/test_logger.py
+import io
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.app.src.core.logger import (
+    ContextQueueHandler,
+    JsonFormatter,
+    RequestContextMiddleware,
+    SamplingFilter,
+)
+
+
+def test_records_are_formatted_off_thread_with_request_context():
+    """
+    Records are queued unformatted and written as JSON by the listener, with
+    the request/trace ids bound by the middleware and any `extra=` fields.
+    """
+    log_queue = queue.Queue()
+    stream = io.StringIO()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter("test"))
+    listener = QueueListener(log_queue, output)
+    listener.start()
+
+    logger = logging.getLogger("test.logger.context")
+    logger.propagate = False
+    logger.addHandler(ContextQueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/ping")
+    async def ping():
+        logger.info("ping from %s", "client", extra={"vehicle_id": "v1"})
+        return {}
+
+    traceparent = "00-" + "a" * 32 + "-" + "b" * 16 + "-01"
+    response = TestClient(app).get(
+        "/ping", headers={"X-Request-ID": "req-1", "traceparent": traceparent}
+    )
+    listener.stop()
+
+    assert response.headers["x-request-id"] == "req-1"
+    entry = json.loads(stream.getvalue())
+    assert entry["message"] == "ping from client"
+    assert entry["request_id"] == "req-1"
+    assert entry["trace_id"] == "a" * 32
+    assert entry["vehicle_id"] == "v1"
+    assert entry["service"] == "test"
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = ContextQueueHandler(queue.Queue(maxsize=1))
+    record = logging.makeLogRecord({"msg": "x", "levelno": logging.INFO})
+
+    handler.emit(record)
+    handler.emit(record)
+
+    assert handler.dropped == 1
+
+
+@pytest.mark.parametrize(
+    "name, level, kept",
+    [
+        ("uvicorn.access", logging.INFO, False),
+        ("uvicorn.access.child", logging.INFO, False),
+        ("uvicorn.access", logging.WARNING, True),
+        ("services.ml", logging.INFO, True),
+    ],
+)
+def test_sampling_applies_per_logger_below_warning(name, level, kept):
+    sampler = SamplingFilter({"uvicorn.access": 0.0})
+    record = logging.makeLogRecord({"name": name, "levelno": level, "msg": "x"})
+
+    assert sampler.filter(record) is kept
@@ -0,0 +1,83 @@
+# test/backend/unit/test_prediction_cache.py
+import pytest
+
+from backend.app.src.services import prediction_cache as cache_module
+from backend.app.src.services.prediction_cache import PredictionCache, content_hash
+
+RESULT = {"prediction": "high", "score": 0.7, "model_version": "v1.0"}
+
+
+@pytest.mark.asyncio
+async def test_hit_after_put_and_lru_eviction(monkeypatch):
+    """
+    Entries are keyed by model version; the least recently used entry is evicted.
+    """
+    monkeypatch.setattr(cache_module.settings, "PREDICTION_CACHE_SIZE", 2)
+    monkeypatch.setattr(cache_module.settings, "PREDICTION_CACHE_REDIS", False)
+    cache = PredictionCache()
+    a, b, c = (content_hash([x, 0.5]) for x in (0.1, 0.2, 0.3))
+
+    await cache.put("v1.0", a, RESULT)
+    await cache.put("v1.0", b, RESULT)
+    assert await cache.get("v1.0", a) == RESULT
+    assert await cache.get("v2.0", a) is None
+    await cache.put("v1.0", c, RESULT)  # Evicts b, the least recently used
+
+    assert await cache.get("v1.0", b) is None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["hit_rate"] == pytest.approx(1 / 3, abs=1e-3)
+
+
+@pytest.mark.asyncio
+async def test_model_swap_invalidates(monkeypatch):
+    monkeypatch.setattr(cache_module.settings, "PREDICTION_CACHE_REDIS", False)
+    cache = PredictionCache()
+    digest = content_hash([0.4], scope="vehicle-1")
+    await cache.put("v1.0", digest, RESULT)
+
+    cache.on_model_swapped("v1.0", "v1.1")
+
+    assert cache.stats()["size"] == 0
+    assert digest != content_hash([0.4])
+
+
+@pytest.mark.asyncio
+async def test_repeated_vehicle_reading_still_records_history(monkeypatch):
+    """
+    The same reading without a timestamp reuses the inference but is a new
+    event; with a timestamp it is a retry and short-circuits.
+    """
+    from backend.app.src.api.v1 import ml as ml_api
+
+    monkeypatch.setattr(ml_api.settings, "PREDICTION_CACHE_ENABLED", True)
+    monkeypatch.setattr(ml_api, "prediction_cache", PredictionCache())
+    inferences, recorded, evaluated = [], [], []
+
+    async def predict(payload):
+        inferences.append(payload)
+        return dict(RESULT)
+
+    async def process(key, user_id, result):
+        evaluated.append(key)
+        return []
+
+    monkeypatch.setattr(ml_api.inference_executor, "predict", predict)
+    monkeypatch.setattr(
+        ml_api.telemetry_service,
+        "record_prediction",
+        lambda vehicle_id, result, **kw: recorded.append(vehicle_id),
+    )
+    monkeypatch.setattr(ml_api.alert_engine, "process", process)
+    monkeypatch.setattr(ml_api.rollup_service, "record_prediction", lambda r: None)
+
+    reading = ml_api.PredictionInput(features=[0.2, 0.4], vehicle_id="v1")
+    first = await ml_api.predict_sync(reading)
+    second = await ml_api.predict_sync(reading)
+    assert first["data"] == second["data"] and "cached" not in second
+    assert len(inferences) == 1
+    assert recorded == ["v1", "v1"] and evaluated == ["v1", "v1"]
+
+    retry = ml_api.PredictionInput(features=[0.2, 0.4], vehicle_id="v1", timestamp=5)
+    await ml_api.predict_sync(retry)
+    assert (await ml_api.predict_sync(retry))["cached"] is True
+    assert recorded == ["v1"] * 3
@@ -0,0 +1,145 @@
+# test/backend/unit/test_profiling.py
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.app.src.api.v1 import admin
+from backend.app.src.core import profiling
+from backend.app.src.core.profiling import (
+    ProfilingMiddleware,
+    RequestProfiler,
+    _classify_stack,
+    profile_phase,
+)
+
+
+def fake_frame(module, function):
+    return SimpleNamespace(
+        f_globals={"__name__": module}, f_code=SimpleNamespace(co_name=function)
+    )
+
+
+def test_classify_stack_prefers_io_over_enclosing_phases():
+    route = fake_frame("api.v1.data", "get_projects")
+    deps = fake_frame("fastapi.dependencies.utils", "solve_dependencies")
+
+    assert _classify_stack([route]) == "service"
+    assert _classify_stack([deps, route]) == "dependencies"
+    assert _classify_stack([deps, fake_frame("pydantic.main", "validate")]) == (
+        "validation"
+    )
+    assert _classify_stack([route, fake_frame("motor.core", "find")]) == "mongo"
+
+
+def solve_dependencies():
+    # Named like FastAPI's resolver so the sampler attributes it to that phase
+    deadline = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _app(profiler):
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+    @app.get("/work")
+    async def work():
+        solve_dependencies()
+        with profile_phase("redis", "get"):
+            await asyncio.sleep(0.01)
+        return {"ok": True}
+
+    return app
+
+
+@pytest.fixture
+def profiler():
+    profiler = RequestProfiler()
+    profiler.enabled = True
+    profiler.interval_ms = 1.0
+    return profiler
+
+
+def test_header_triggers_profiling_and_phases_are_attributed(profiler):
+    client = TestClient(_app(profiler))
+
+    assert client.get("/work").status_code == 200
+    assert profiler.get_profiles() == []  # No header, no random sampling
+
+    assert client.get("/work", headers={"X-Profile-Request": "1"}).status_code == 200
+    (profile,) = profiler.get_profiles()
+    assert profile["trigger"] == "header"
+    assert profile["path"] == "/work"
+    assert profile["status_code"] == 200
+    assert profile["phases_ms"]["redis"] >= 10
+    assert profile["phases_ms"]["dependencies"] > 0
+    assert "GET /work;redis;get " in profiler.folded_stacks()
+    assert not profiler._active
+    assert not profiler._loops  # Released when its last profile ended
+
+
+def test_admin_endpoints_toggle_and_report(monkeypatch, profiler):
+    monkeypatch.setattr(admin, "request_profiler", profiler)
+    profiler.enabled = False
+    app = FastAPI()
+    app.include_router(admin.router, prefix="/admin")
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+    client = TestClient(app)
+
+    assert client.post("/admin/profile", json={"sample_rate": 2}).status_code == 422
+    response = client.post("/admin/profile", json={"enabled": True, "sample_rate": 1})
+    assert response.json() == {"enabled": True, "sample_rate": 1.0}
+
+    client.get("/admin/profile")  # Randomly sampled now; recorded once it ends
+    report = client.get("/admin/profile").json()
+    assert [p["trigger"] for p in report["profiles"]] == ["sample"]
+    assert report["profiles"][0]["path"] == "/admin/profile"
+    folded = client.get("/admin/profile", params={"format": "folded"})
+    assert folded.headers["content-type"].startswith("text/plain")
+
+    assert client.delete("/admin/profile").status_code == 204
+    assert [p.method for p in profiler.profiles] == ["DELETE"]  # Only itself
+
+
+def test_rate_limit_redis_time_is_attributed(profiler):
+    from backend.app.src.core.ratelimit import (
+        LoadShedder,
+        RateLimiter,
+        RateLimitMiddleware,
+        RateLimitRule,
+    )
+
+    class ProfiledBuckets:
+        async def acquire(self, key, rate, burst, cost=1.0):
+            with profile_phase("redis", "EVALSHA ratelimit"):
+                await asyncio.sleep(0.005)
+            return True, 0.0
+
+    app = FastAPI()
+
+    @app.get("/limited")
+    async def limited():
+        return {"ok": True}
+
+    limiter = RateLimiter(
+        rules=[RateLimitRule(name="api", path="/", rate=10, burst=10)],
+        backend=ProfiledBuckets(),
+    )
+    # Same order as main.create_app: profiling wraps rate limiting
+    app.add_middleware(RateLimitMiddleware, limiter=limiter, shedder=LoadShedder())
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+    TestClient(app).get("/limited", headers={"X-Profile-Request": "1"})
+
+    (profile,) = profiler.get_profiles()
+    assert profile["phases_ms"]["redis"] >= 5
+
+    from backend.app.src.main import app as main_app
+
+    # Outermost first (main imports the classes as core.*, so compare names)
+    order = [middleware.cls.__name__ for middleware in main_app.user_middleware]
+    assert order.index("ProfilingMiddleware") < order.index("RateLimitMiddleware")
@@ -0,0 +1,69 @@
+# test/backend/unit/test_ratelimit.py
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.app.src.core import ratelimit
+from backend.app.src.core.ratelimit import (
+    LoadShedder,
+    MemoryTokenBucket,
+    RateLimiter,
+    RateLimitMiddleware,
+    RateLimitRule,
+)
+
+LOGIN = RateLimitRule(name="login", path="/auth/login", rate=0.001, burst=2, per="ip")
+API = RateLimitRule(name="api", path="/", rate=1000, burst=1000)
+
+
+def _client(shedder=None):
+    app = FastAPI()
+
+    @app.post("/auth/login")
+    def login():
+        return {"ok": True}
+
+    @app.get("/health/liveness")
+    def liveness():
+        return {"status": "ok"}
+
+    limiter = RateLimiter(rules=[API, LOGIN], backend=MemoryTokenBucket())
+    app.add_middleware(
+        RateLimitMiddleware, limiter=limiter, shedder=shedder or LoadShedder()
+    )
+    return TestClient(app), limiter
+
+
+def test_token_bucket_limits_per_route_and_caches_denials():
+    client, limiter = _client()
+
+    statuses = [client.post("/auth/login").status_code for _ in range(4)]
+
+    assert statuses == [200, 200, 429, 429]
+    assert int(client.post("/auth/login").headers["retry-after"]) >= 1
+    assert limiter.metrics["limited"] == 1  # Later denials served locally
+    assert limiter.metrics["limited_local"] == 2
+
+
+def test_sheds_load_but_not_health_checks():
+    shedder = LoadShedder()
+    shedder.loop_lag_ms = 10_000.0
+    client, _ = _client(shedder)
+
+    assert client.post("/auth/login").status_code == 503
+    assert client.get("/health/liveness").status_code == 200
+    assert shedder.metrics["shed_loop_lag"] == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_buckets_evict_least_recently_used(monkeypatch):
+    monkeypatch.setattr(ratelimit.settings, "RATE_LIMIT_MEMORY_BUCKETS", 2)
+    buckets = MemoryTokenBucket()
+
+    assert (await buckets.acquire("hot", rate=0.001, burst=1))[0]
+    assert (await buckets.acquire("idle", rate=0.001, burst=1))[0]
+    assert not (await buckets.acquire("hot", rate=0.001, burst=1))[0]
+    await buckets.acquire("new", rate=0.001, burst=1)  # Evicts "idle" only
+
+    assert list(buckets._buckets) == ["hot", "new"]
+    assert not (await buckets.acquire("hot", rate=0.001, burst=1))[0]
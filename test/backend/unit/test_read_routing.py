@@ -0,0 +1,32 @@
+# test/backend/unit/test_read_routing.py
+import pytest
+from pymongo.read_preferences import Primary, SecondaryPreferred
+
+from backend.app.src.db import routing
+
+
+def test_read_classes_map_to_configured_preferences(monkeypatch):
+    """
+    Secondary reads carry the staleness bound; primary reads cannot.
+    """
+    monkeypatch.setattr(
+        routing.settings,
+        "MONGO_READ_ROUTING",
+        {"primary": "primary", "list": "secondaryPreferred"},
+    )
+    monkeypatch.setattr(routing.settings, "MONGO_MAX_STALENESS_SEC", 120)
+
+    assert routing.read_preference("primary") == Primary()
+    assert routing.read_preference("list") == SecondaryPreferred(max_staleness=120)
+    # Classes missing from the table default to the primary
+    assert routing.read_preference("analytics") == Primary()
+
+
+def test_invalid_routing_is_rejected(monkeypatch):
+    monkeypatch.setattr(routing.settings, "MONGO_READ_ROUTING", {"list": "secondary"})
+    monkeypatch.setattr(routing.settings, "MONGO_MAX_STALENESS_SEC", 30)
+
+    with pytest.raises(ValueError, match="MONGO_MAX_STALENESS_SEC"):
+        routing.read_preference("list")
+    with pytest.raises(ValueError, match="Unknown read class"):
+        routing.read_preference("reports")
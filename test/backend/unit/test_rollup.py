@@ -0,0 +1,79 @@
+# test/backend/unit/test_rollup.py
+import asyncio
+
+import pytest
+
+from backend.app.src.services import rollup as rollup_module
+from backend.app.src.services.rollup import RollupService
+
+
+class SlowCollection:
+    def __init__(self):
+        self.written = []
+
+    async def bulk_write(self, operations, ordered):
+        await asyncio.sleep(0.05)
+        self.written.extend(operations)
+
+
+@pytest.mark.asyncio
+async def test_stop_during_flush_loses_no_counters(monkeypatch):
+    collection = SlowCollection()
+    monkeypatch.setattr(
+        rollup_module.AnalyticsRollup, "get_motor_collection", lambda: collection
+    )
+    monkeypatch.setattr(rollup_module.settings, "ROLLUP_FLUSH_INTERVAL_SEC", 0.01)
+    service = RollupService()
+    await service.start()
+
+    service.record_user_created()
+    await asyncio.sleep(0.03)  # The periodic flush is now mid-write
+    service.record_alert_sent("push")
+    await service.stop()
+
+    incs = [op._doc["$inc"] for op in collection.written]
+    assert sum(inc.get("users_created", 0) for inc in incs) == 2  # hour + day
+    assert sum(inc.get("alerts_sent.push", 0) for inc in incs) == 2
+    assert not service._pending
+
+
+class TotalsCollection:
+    """Applies the $inc/$set of UpdateOne operations to in-memory documents."""
+
+    def __init__(self):
+        self.documents = {}
+
+    async def bulk_write(self, operations, ordered):
+        for op in operations:
+            document = self.documents.setdefault(op._filter["_id"], {})
+            for path, value in op._doc.get("$inc", {}).items():
+                field, key = path.split(".", 1) if "." in path else (path, None)
+                if key is None:
+                    document[field] = document.get(field, 0) + value
+                else:
+                    counts = document.setdefault(field, {})
+                    counts[key] = counts.get(key, 0) + value
+            document.update(op._doc.get("$set", {}))
+
+    async def find_one(self, filter, projection):
+        return self.documents.get(filter["_id"])
+
+
+@pytest.mark.asyncio
+async def test_buckets_hold_absolute_project_totals(monkeypatch):
+    collection = TotalsCollection()
+    collection.documents["totals"] = {"projects_by_status": {"Active": 5}}
+    monkeypatch.setattr(
+        rollup_module.AnalyticsRollup, "get_motor_collection", lambda: collection
+    )
+    service = RollupService()
+
+    service.record_project_status("Active")
+    service.record_project_status("Archived", "Active")
+    service.record_project_status("Draft", "Active")
+    await service.flush()
+
+    totals = {"Active": 4, "Archived": 1, "Draft": 1}
+    assert collection.documents["totals"]["projects_by_status"] == totals
+    buckets = [v for k, v in collection.documents.items() if k != "totals"]
+    assert [bucket["projects_by_status"] for bucket in buckets] == [totals, totals]
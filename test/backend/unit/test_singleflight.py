@@ -0,0 +1,60 @@
+# test/backend/unit/test_singleflight.py
+import asyncio
+
+import pytest
+
+from backend.app.src.services.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    """
+    Callers arriving while a query is in flight get its result; the next call
+    after it completes runs a fresh query.
+    """
+    flight = SingleFlight("test_shared")
+    executions = 0
+
+    async def query():
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.01)
+        return {"n": executions}
+
+    results = await asyncio.gather(*(flight.do("k", query) for _ in range(5)))
+
+    assert executions == 1
+    assert all(result is results[0] for result in results)
+    stats = flight.stats()
+    assert stats["executions"] == 1 and stats["collapsed"] == 4
+    assert stats["top_collapsed_keys"] == {"k": 4}
+    assert stats["in_flight"] == 0
+
+    assert await flight.do("k", query) == {"n": 2}
+    assert await flight.do("other", query) == {"n": 3}
+
+
+@pytest.mark.asyncio
+async def test_error_reaches_all_callers_and_cancelled_leader_does_not_abort():
+    flight = SingleFlight("test_errors")
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        *(flight.do("k", failing) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    leader = asyncio.ensure_future(flight.do("slow", slow))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do("slow", slow))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "done"
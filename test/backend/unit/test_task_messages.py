@@ -0,0 +1,58 @@
+# test/backend/unit/test_task_messages.py
+import pytest
+
+from backend.app.src.services import task as task_module
+from backend.app.src.services.task import TaskService
+from backend.app.src.tasks import claim_check
+
+
+class RecordingTask:
+    """Captures apply_async calls instead of publishing."""
+
+    def __init__(self):
+        self.calls = []
+
+    def apply_async(self, args, **options):
+        self.calls.append((args, options))
+        return type("AsyncResult", (), {"id": "task-1"})()
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(task_module.settings, "CELERY_SERIALIZER", "json")
+    monkeypatch.setattr(task_module.settings, "CELERY_COMPRESS_MIN_BYTES", 100)
+    monkeypatch.setattr(task_module.settings, "CELERY_CLAIM_CHECK_BYTES", 1000)
+    monkeypatch.setattr(
+        task_module.claim_check, "check_in", lambda value: {"__claim__": "claim:1"}
+    )
+
+
+def test_submit_encoding_depends_on_payload_size(limits):
+    task = RecordingTask()
+    small, medium, large = ["x"], ["x" * 200], ["x" * 2000]
+
+    TaskService.submit(task, small, may_be_large=True)
+    TaskService.submit(task, medium, may_be_large=True)
+    TaskService.submit(task, large, may_be_large=True)  # Compressed only
+    TaskService.submit(task, large, claim_check_allowed=True)
+    TaskService.submit(task, medium)  # Bounded payloads are not measured
+
+    assert task.calls == [
+        ((small,), {}),
+        ((medium,), {"compression": "zlib"}),
+        ((large,), {"compression": "zlib"}),
+        (({"__claim__": "claim:1"},), {}),
+        ((medium,), {}),
+    ]
+
+
+def test_claim_check_payload_round_trip(monkeypatch):
+    monkeypatch.setattr(claim_check.settings, "CELERY_SERIALIZER", "json")
+    payload = [{"features": [0.25] * 32} for _ in range(100)]
+
+    content_type, encoding, blob = claim_check.encode(payload)
+
+    assert len(blob) < len(str(payload))
+    assert claim_check.decode(content_type, encoding, blob) == payload
+    assert claim_check.is_claim({"__claim__": "claim:1"})
+    assert not claim_check.is_claim(payload)
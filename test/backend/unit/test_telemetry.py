@@ -0,0 +1,194 @@
+# test/backend/unit/test_telemetry.py
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.src.services import telemetry as telemetry_module
+from backend.app.src.services.telemetry import TelemetryService
+
+RESULT = {"prediction": "high", "score": 0.9, "model_version": "v1"}
+
+
+class RecordingCollection:
+    def __init__(self, delay=0.0, fail=0):
+        self.batches = []
+        self.delay = delay
+        self.fail = fail  # Number of calls that raise before succeeding
+
+    async def insert_many(self, batch, ordered):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError("mongod unreachable")
+        self.batches.append(batch)
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    collection = RecordingCollection()
+    monkeypatch.setattr(
+        telemetry_module.PredictionEvent, "get_motor_collection", lambda: collection
+    )
+    monkeypatch.setattr(telemetry_module.settings, "TELEMETRY_BATCH_SIZE", 2)
+    return collection
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_buffered_events_in_batches(collection):
+    service = TelemetryService()
+    for i in range(5):
+        service.record_prediction("car-1", RESULT, user_id="u1", features=[float(i)])
+
+    assert collection.batches == []  # Buffered, nothing written on record
+    assert await service.flush() == 5
+
+    assert [len(batch) for batch in collection.batches] == [2, 2, 1]
+    event = collection.batches[0][0]
+    assert event["meta"] == {"vehicle_id": "car-1", "user_id": "u1"}
+    assert event["prediction"] == "high"
+    assert service.metrics["written"] == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_kept_for_the_next_flush(collection):
+    service = TelemetryService()
+    collection.fail = 1
+    for _ in range(3):
+        service.record_prediction("car-1", RESULT)
+
+    assert await service.flush() == 0
+    assert service.metrics["failed_batches"] == 1
+    assert await service.flush() == 3
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_drops_oldest(collection, monkeypatch):
+    service = TelemetryService()
+    service._buffer = telemetry_module.deque(maxlen=2)
+    for score in (0.1, 0.2, 0.3):
+        service.record_prediction("car-1", {**RESULT, "score": score})
+
+    await service.flush()
+
+    assert [e["score"] for batch in collection.batches for e in batch] == [0.2, 0.3]
+    assert service.metrics["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_requeue_after_failed_write_counts_overflow(collection):
+    service = TelemetryService()
+    service._buffer = telemetry_module.deque(maxlen=3)
+    for _ in range(2):
+        service.record_prediction("car-1", RESULT)
+
+    async def fail_while_buffer_fills(batch, ordered):
+        for _ in range(3):
+            service.record_prediction("car-2", RESULT)  # Recorded meanwhile
+        raise ConnectionError("mongod unreachable")
+
+    collection.insert_many = fail_while_buffer_fills
+    await service.flush()
+
+    # 2 re-queued + 3 new in a buffer of 3: 2 events lost, all counted
+    assert len(service._buffer) == 3
+    assert service.metrics["dropped"] == 2
+
+
+def test_frame_time_is_kept_within_the_clock_skew(collection):
+    service = TelemetryService()
+    frame_time = datetime.utcnow() - timedelta(seconds=5)
+
+    service.record_prediction("car-1", RESULT, ts=frame_time)
+    service.record_prediction("car-1", RESULT, ts=datetime(2001, 1, 1))
+
+    assert service._buffer[0]["ts"] == frame_time
+    assert service._buffer[1]["ts"] > frame_time  # Implausible: receive time
+
+
+@pytest.mark.asyncio
+async def test_stop_during_flush_drains_everything(collection, monkeypatch):
+    monkeypatch.setattr(telemetry_module.settings, "TELEMETRY_FLUSH_INTERVAL_SEC", 0.01)
+    collection.delay = 0.05
+    service = TelemetryService()
+    await service.start()
+
+    service.record_prediction("car-1", RESULT)
+    await asyncio.sleep(0.03)  # The background flush is now mid-write
+    service.record_prediction("car-1", RESULT)
+    await service.stop()
+
+    assert sum(len(batch) for batch in collection.batches) == 2
+    assert not service._buffer
+
+
+class FakeFind:
+    def __init__(self, filter):
+        self.filter = filter
+
+    def sort(self, *args):
+        self.sort_args = args
+        return self
+
+    def limit(self, n):
+        self.limit_number = n
+        return self
+
+
+class FakeAggregation:
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+    async def to_list(self, length):
+        return [{"bucket_start": datetime(2025, 1, 1), "count": 3}]
+
+
+class FakeCollection:
+    def aggregate(self, pipeline):
+        self.pipeline = pipeline
+        return FakeAggregation(pipeline)
+
+
+@pytest.mark.asyncio
+async def test_get_history_filters_on_vehicle_and_time_range(monkeypatch):
+    end = datetime(2025, 1, 1)
+    start = end - timedelta(hours=1)
+    routed = []
+
+    async def find_routed(query, query_class):
+        routed.append((query, query_class))
+        return []
+
+    monkeypatch.setattr(telemetry_module.PredictionEvent, "find", FakeFind)
+    monkeypatch.setattr(telemetry_module, "find_routed", find_routed)
+
+    await TelemetryService().get_history("car-1", start, end, limit=50)
+
+    ((query, query_class),) = routed
+    assert query_class == "list"
+    assert query.filter == {
+        "meta.vehicle_id": "car-1",
+        "ts": {"$gte": start, "$lt": end},
+    }
+    assert query.sort_args == ("+ts",)
+    assert query.limit_number == 50
+
+
+@pytest.mark.asyncio
+async def test_get_timeline_matches_before_grouping(monkeypatch):
+    end = datetime(2025, 1, 1)
+    start = end - timedelta(hours=1)
+    collection = FakeCollection()
+    monkeypatch.setattr(
+        telemetry_module, "routed_collection", lambda model, query_class: collection
+    )
+
+    timeline = await TelemetryService().get_timeline("car-1", start, end, unit="hour")
+
+    assert timeline[0]["count"] == 3
+    assert collection.pipeline[0] == {
+        "$match": {"meta.vehicle_id": "car-1", "ts": {"$gte": start, "$lt": end}}
+    }
+    assert collection.pipeline[1]["$group"]["_id"] == {
+        "$dateTrunc": {"date": "$ts", "unit": "hour"}
+    }
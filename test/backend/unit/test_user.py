@@ -0,0 +1,34 @@
+# test/backend/unit/test_user.py
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.app.src.services import user as user_module
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_is_bounded(monkeypatch):
+    lock = threading.Lock()
+    running, peak = 0, 0
+
+    def slow_hash(password):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return "hashed:" + password
+
+    monkeypatch.setattr(user_module, "hash_password", slow_hash)
+    monkeypatch.setattr(user_module, "_hash_pool", None)
+    monkeypatch.setattr(user_module.settings, "PASSWORD_HASH_WORKERS", 2)
+
+    hashes = await asyncio.gather(*(user_module._hash(str(i)) for i in range(20)))
+
+    assert hashes == ["hashed:%d" % i for i in range(20)]
+    assert peak == 2
+    user_module._hash_pool.shutdown()
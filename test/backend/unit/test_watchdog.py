@@ -0,0 +1,117 @@
+# test/backend/unit/test_watchdog.py
+import sys
+
+import pytest
+
+from backend.app.src.services import watchdog
+from backend.app.src.services.watchdog import MB, ChildRecycleRecorder, MemoryWatchdog
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    events = []
+    monkeypatch.setattr(watchdog.settings, "WATCHDOG_API_MAX_RSS_MB", 100)
+    monkeypatch.setattr(watchdog.settings, "WATCHDOG_SUSTAINED_SAMPLES", 2)
+    monkeypatch.setattr(
+        watchdog,
+        "record_recycle",
+        lambda role, reason, rss, **details: events.append((role, reason, details)),
+    )
+    return events
+
+
+def test_rss_is_read_from_proc():
+    assert watchdog.rss_bytes() > 0
+    assert watchdog.rss_bytes(pid=2**22 + 1) == 0  # No such process
+
+
+@pytest.mark.asyncio
+async def test_recycles_only_after_sustained_excess(monkeypatch, recorded):
+    samples = iter([150, 50, 150, 150, 150])
+    monkeypatch.setattr(watchdog, "rss_bytes", lambda: next(samples) * MB)
+    monkeypatch.delitem(sys.modules, "gunicorn", raising=False)
+    dog = MemoryWatchdog()
+
+    for _ in range(4):
+        await dog.check()
+
+    # The spike at sample 1 was reset by sample 2; samples 3-4 trigger
+    assert dog.recycling
+    assert recorded == [
+        ("api", "max_memory", {"limit_mb": 100, "action": "none (unsupervised)"})
+    ]
+    await dog.check()
+    assert len(recorded) == 1  # Recorded once per process
+    assert dog.stats()["peak_rss_mb"] == 150
+
+
+@pytest.mark.asyncio
+async def test_supervised_worker_waits_for_drain_lock(monkeypatch, recorded):
+    monkeypatch.setattr(watchdog, "rss_bytes", lambda: 200 * MB)
+    monkeypatch.setitem(sys.modules, "gunicorn", object())
+    kills = []
+    monkeypatch.setattr(watchdog.os, "kill", lambda pid, sig: kills.append(sig))
+    lock_free = iter([False, True])
+    dog = MemoryWatchdog()
+    monkeypatch.setattr(dog, "_acquire_drain_lock", lambda: next(lock_free))
+
+    for _ in range(3):
+        await dog.check()
+
+    # Sample 2 found another worker draining; sample 3 got the lock
+    assert kills == [watchdog.signal.SIGTERM]
+    assert [event[2]["action"] for event in recorded] == ["drain"]
+
+
+def test_child_recycle_reason(monkeypatch):
+    events = []
+    monkeypatch.setattr(watchdog.settings, "WATCHDOG_WORKER_MAX_TASKS", 3)
+    monkeypatch.setattr(watchdog.settings, "WATCHDOG_WORKER_MAX_RSS_MB", 10**6)
+    monkeypatch.setattr(
+        watchdog,
+        "record_recycle",
+        lambda role, reason, rss, **details: events.append((role, reason)),
+    )
+    recorder = ChildRecycleRecorder()
+
+    for _ in range(3):
+        recorder.task_finished()
+    monkeypatch.setattr(watchdog.settings, "WATCHDOG_WORKER_MAX_RSS_MB", 1)
+    recorder.reset()
+    recorder.task_finished()
+
+    assert events == [("celery", "max_tasks"), ("celery", "max_memory")]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def set(self, key, value, nx, ex):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def eval(self, script, numkeys, key, token):
+        # What RELEASE_LOCK_LUA does: compare, then delete
+        if self.values.get(key) == token:
+            del self.values[key]
+            return 1
+        return 0
+
+
+def test_drain_lock_is_only_released_by_its_owner(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(watchdog, "_redis", lambda: fake)
+    first, second = MemoryWatchdog(), MemoryWatchdog()
+
+    assert first._acquire_drain_lock()
+    assert not second._acquire_drain_lock()
+    fake.values.clear()  # The first worker's lock expired mid-drain...
+    assert second._acquire_drain_lock()
+
+    first._release_drain_lock()  # ...so its release must not free the lock
+    assert not MemoryWatchdog()._acquire_drain_lock()
+    second._release_drain_lock()
+    assert watchdog.DRAIN_LOCK_KEY not in fake.values
@@ -0,0 +1,242 @@
+# test/benchmarks/api_load.py
+"""
+Load test for the hot API endpoints.
+
+Runs the FastAPI app in-process (httpx ASGI transport) or against a running
+server (--base-url), drives each scenario at a fixed concurrency and reports
+throughput and p50/p95/p99 latency. Results are compared with the previous
+baseline and then saved as the new one.
+
+Examples (from the repository root):
+    python -m test.benchmarks.api_load --fake-db --concurrency 32
+    python -m test.benchmarks.api_load --base-url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from test.benchmarks.baseline import (
+    BASELINE_DIR,
+    compare_results,
+    load_baseline,
+    save_baseline,
+    summarize_latencies,
+)
+
+SRC_DIR = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir, "backend", "app", "src"
+)
+API = "/api/v1"
+BENCH_USER = {
+    "email": "bench@example.com",
+    "username": "bench",
+    "password": "BenchPassword123",
+}
+SCENARIOS = [
+    "auth_login",
+    "ml_predict",
+    "projects_list",
+    "projects_create",
+    "projects_patch",
+    "notify_send",
+]
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+async def _setup_in_process(fake_db: bool):
+    """Imports the app and connects it to MongoDB (or mongomock) without Redis."""
+    sys.path.insert(0, os.path.abspath(SRC_DIR))
+    from core.config import settings
+    from main import app
+    from tasks.worker import celery_app
+
+    # Measure capacity, not the per-client limits (a single client IP here)
+    settings.RATE_LIMIT_ENABLED = False
+
+    # Run Celery tasks inline so /notify/send does not need a broker
+    celery_app.conf.task_always_eager = True
+
+    if fake_db:
+        from beanie import init_beanie
+        from db.client import DOCUMENT_MODELS
+        from mongomock_motor import AsyncMongoMockClient
+
+        # mongomock cannot create time-series collections; telemetry writes
+        # then just fail in the background writer, off the request path
+        models = [m for m in DOCUMENT_MODELS if not hasattr(m.Settings, "timeseries")]
+        client = AsyncMongoMockClient()
+        # mongomock has no replica set (nor motor-style with_options handles)
+        settings.MONGO_READ_ROUTING = {}
+        await init_beanie(database=client["v13_bench"], document_models=models)
+    else:
+        from db.client import mongo_client
+
+        await mongo_client.connect()
+    return app
+
+
+async def _seed(client: httpx.AsyncClient, projects: int) -> List[str]:
+    """Registers the benchmark user and creates projects to list and patch."""
+    await client.post(f"{API}/auth/register", json=BENCH_USER)
+    project_ids = []
+    for i in range(projects):
+        response = await client.post(
+            f"{API}/data/projects",
+            json={"name": f"bench-{i}", "details": {"seed": i}},
+        )
+        response.raise_for_status()
+        project_ids.append(response.json()["_id"])
+    return project_ids
+
+
+def _build_requests(project_ids: List[str], feature_count: int) -> Dict[str, Request]:
+    patch_ids = itertools.cycle(project_ids)
+
+    async def auth_login(client, i):
+        return await client.post(f"{API}/auth/login", json=BENCH_USER)
+
+    async def ml_predict(client, i):
+        features = [random.random() for _ in range(feature_count)]
+        return await client.post(f"{API}/ml/predict", json={"features": features})
+
+    async def projects_list(client, i):
+        return await client.get(f"{API}/data/projects")
+
+    async def projects_create(client, i):
+        return await client.post(
+            f"{API}/data/projects", json={"name": f"load-{i}", "details": {"i": i}}
+        )
+
+    async def projects_patch(client, i):
+        return await client.patch(
+            f"{API}/data/projects/{next(patch_ids)}",
+            json={"status": "Active", "details": {"last_patch": i}},
+        )
+
+    async def notify_send(client, i):
+        return await client.post(
+            f"{API}/notify/send",
+            json={"user_id": "ffffffffffffffffffffffff", "message": f"load {i}"},
+        )
+
+    return {
+        "auth_login": auth_login,
+        "ml_predict": ml_predict,
+        "projects_list": projects_list,
+        "projects_create": projects_create,
+        "projects_patch": projects_patch,
+        "notify_send": notify_send,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    request: Request,
+    concurrency: int,
+    total_requests: int,
+    warmup: int,
+) -> Dict[str, float]:
+    for i in range(warmup):
+        await request(client, i)
+
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while (i := next(counter)) < total_requests:
+            start = time.perf_counter()
+            try:
+                response = await request(client, i)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize_latencies(latencies, time.perf_counter() - start, errors)
+
+
+async def run(args) -> Dict[str, Dict[str, float]]:
+    if args.base_url:
+        transport, base_url = None, args.base_url
+    else:
+        app = await _setup_in_process(args.fake_db)
+        transport, base_url = httpx.ASGITransport(app=app), "http://bench"
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        transport=transport, base_url=base_url, limits=limits, timeout=30
+    ) as client:
+        project_ids = await _seed(client, args.seed_projects)
+        requests = _build_requests(project_ids, args.features)
+        results = {}
+        for name in args.scenarios:
+            results[name] = await run_scenario(
+                client, requests[name], args.concurrency, args.requests, args.warmup
+            )
+            print(
+                f"{name:<16} {results[name]['throughput_rps']:>9.1f} req/s  "
+                f"p50={results[name]['p50_ms']:.2f}ms  "
+                f"p95={results[name]['p95_ms']:.2f}ms  "
+                f"p99={results[name]['p99_ms']:.2f}ms  "
+                f"errors={results[name]['errors']}"
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--base-url", help="Target a running server instead.")
+    parser.add_argument(
+        "--fake-db", action="store_true", help="Use mongomock instead of MongoDB."
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="Per scenario.")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--features", type=int, default=32)
+    parser.add_argument("--seed-projects", type=int, default=50)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument(
+        "--baseline", default=os.path.join(BASELINE_DIR, "api_load.json")
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.15, help="Allowed fractional change."
+    )
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    previous = load_baseline(args.baseline)
+    regressions = []
+    if previous:
+        regressions = compare_results(
+            previous["results"],
+            results,
+            args.tolerance,
+            higher_is_better=["throughput_rps"],
+            lower_is_better=["p50_ms", "p95_ms", "p99_ms"],
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+    if not args.no_save:
+        config = {k: v for k, v in vars(args).items() if k not in ("baseline",)}
+        save_baseline(args.baseline, results, config)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# test/benchmarks/baseline.py
+import json
+import math
+import os
+import platform
+import subprocess
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+# Default location for JSON baselines (machine-specific, not committed)
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_latencies(
+    latencies_ms: List[float], elapsed_sec: float, errors: int = 0
+) -> Dict[str, float]:
+    """Throughput and latency distribution of one load-test scenario."""
+    values = sorted(latencies_ms)
+    count = len(values)
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": round(count / elapsed_sec, 2) if elapsed_sec else 0.0,
+        "mean_ms": round(sum(values) / count, 3) if count else 0.0,
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+            )
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return None
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, Any]], config: Dict):
+    """Writes results with enough context to judge whether runs are comparable."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    document = {
+        "created_at": datetime.utcnow().isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "config": config,
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(
+    previous: Dict[str, Dict[str, float]],
+    current: Dict[str, Dict[str, float]],
+    tolerance: float,
+    higher_is_better: Iterable[str] = (),
+    lower_is_better: Iterable[str] = (),
+) -> List[str]:
+    """
+    Returns human-readable regressions: metrics that moved in the wrong
+    direction by more than `tolerance` (a fraction, e.g. 0.10 for 10%).
+    """
+    regressions = []
+    for name, metrics in current.items():
+        before = previous.get(name)
+        if not before:
+            continue
+        for metric in higher_is_better:
+            old, new = before.get(metric), metrics.get(metric)
+            if old and new is not None and new < old * (1 - tolerance):
+                regressions.append(
+                    f"{name}.{metric}: {old} -> {new} ({(new / old - 1) * 100:+.1f}%)"
+                )
+        for metric in lower_is_better:
+            old, new = before.get(metric), metrics.get(metric)
+            if old and new is not None and new > old * (1 + tolerance):
+                regressions.append(
+                    f"{name}.{metric}: {old} -> {new} ({(new / old - 1) * 100:+.1f}%)"
+                )
+    return regressions
@@ -0,0 +1,207 @@
+# test/benchmarks/micro.py
+"""
+Microbenchmarks for hot functions: password hashing, JWT creation/verification,
+ML inference (single vs. batched) and response model serialization.
+
+Each benchmark is auto-calibrated so one repeat runs for at least --min-time
+seconds, then repeated --repeats times with GC disabled (as timeit does). The
+median per-call time is compared with the previous JSON baseline.
+
+Example (from the repository root):
+    python -m test.benchmarks.micro --filter serialize
+"""
+
+import argparse
+import gc
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from test.benchmarks.baseline import (
+    BASELINE_DIR,
+    compare_results,
+    load_baseline,
+    percentile,
+    save_baseline,
+)
+
+SRC_DIR = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir, "backend", "app", "src"
+)
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+BATCH_SIZE = 64
+FEATURE_COUNT = 32
+
+
+def _large_details(keys: int = 200) -> Dict:
+    """A realistic, nested project `details` payload."""
+    rng = random.Random(42)
+    return {
+        f"sensor_{i}": {
+            "readings": [rng.random() for _ in range(20)],
+            "label": f"camera-{i % 4}",
+            "calibrated": i % 2 == 0,
+            "meta": {"firmware": "2.3.1", "offset": rng.randint(0, 1000)},
+        }
+        for i in range(keys)
+    }
+
+
+def build_benchmarks() -> Dict[str, Callable[[], object]]:
+    from api.v1.data import ProjectResponse
+    from api.v1.user import UserProfile
+    from beanie import PydanticObjectId
+    from services.ml import ml_service
+    from utils import (
+        create_access_token,
+        decode_access_token,
+        hash_password,
+        verify_password,
+    )
+
+    password = "CorrectHorseBatteryStaple"
+    hashed = hash_password(password)
+    token = create_access_token({"sub": "ffffffffffffffffffffffff"})
+
+    rng = random.Random(7)
+    batch = [
+        {"features": [rng.random() for _ in range(FEATURE_COUNT)]}
+        for _ in range(BATCH_SIZE)
+    ]
+
+    now = datetime.utcnow()
+    project = {
+        "_id": PydanticObjectId(),
+        "owner_id": PydanticObjectId(),
+        "name": "fleet-telemetry",
+        "status": "Active",
+        "details": _large_details(),
+        "created_at": now,
+        "updated_at": now,
+    }
+    user = {
+        "id": PydanticObjectId(),
+        "email": "driver@example.com",
+        "username": "driver",
+        "preferences": {"theme": "dark", "notifications": True, **_large_details(50)},
+        "is_active": True,
+    }
+
+    def predict_single_x64():
+        for item in batch:
+            ml_service.get_prediction(item)
+
+    return {
+        "hash_password": lambda: hash_password(password),
+        "verify_password": lambda: verify_password(password, hashed),
+        "create_access_token": lambda: create_access_token({"sub": "user-id"}),
+        "decode_access_token": lambda: decode_access_token(token),
+        "predict_single_x64": predict_single_x64,
+        "predict_batched_x64": lambda: ml_service.get_batch_prediction(batch),
+        "serialize_project_response": lambda: ProjectResponse.model_validate(
+            project
+        ).model_dump_json(),
+        "serialize_user_profile": lambda: UserProfile.model_validate(
+            user
+        ).model_dump_json(),
+    }
+
+
+def _calibrate(func: Callable[[], object], min_time: float) -> int:
+    """Doubles the loop count until one repeat takes at least `min_time`."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - start >= min_time:
+            return loops
+        loops *= 2
+
+
+def measure(
+    func: Callable[[], object], repeats: int, min_time: float
+) -> Dict[str, float]:
+    loops = _calibrate(func, min_time)
+    samples: List[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(loops):
+                func()
+            samples.append((time.perf_counter() - start) / loops * 1e6)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    samples.sort()
+    median = statistics.median(samples)
+    return {
+        "loops": loops,
+        "repeats": repeats,
+        "min_us": round(samples[0], 3),
+        "median_us": round(median, 3),
+        "mean_us": round(statistics.fmean(samples), 3),
+        "stdev_us": round(statistics.stdev(samples), 3) if repeats > 1 else 0.0,
+        "iqr_us": round(percentile(samples, 75) - percentile(samples, 25), 3),
+        "ops_per_sec": round(1e6 / median, 2) if median else 0.0,
+    }
+
+
+def run(filters: List[str], repeats: int, min_time: float) -> Dict[str, Dict]:
+    results = {}
+    for name, func in build_benchmarks().items():
+        if filters and not any(f in name for f in filters):
+            continue
+        results[name] = stats = measure(func, repeats, min_time)
+        print(
+            f"{name:<28} median={stats['median_us']:>12.3f}us  "
+            f"iqr={stats['iqr_us']:>10.3f}us  ops/s={stats['ops_per_sec']:>12.1f}"
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--filter", nargs="*", default=[], help="Name substrings.")
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--baseline", default=os.path.join(BASELINE_DIR, "micro.json"))
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.filter, args.repeats, args.min_time)
+
+    previous = load_baseline(args.baseline)
+    regressions: List[str] = []
+    if previous:
+        regressions = compare_results(
+            previous["results"],
+            results,
+            args.tolerance,
+            lower_is_better=["median_us"],
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+    if not args.no_save:
+        # Merge so a filtered run does not discard other benchmarks' baselines
+        merged = dict(previous["results"]) if previous else {}
+        merged.update(results)
+        save_baseline(
+            args.baseline,
+            merged,
+            {"repeats": args.repeats, "min_time": args.min_time},
+        )
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# test/benchmarks/task_payloads.py
+"""
+Broker and result-backend bytes per Celery task, before and after compact
+messaging: JSON vs. msgpack, zlib compression of large messages, claim-check
+for large batch inputs and result storage/expiry per task.
+
+Tasks are published through TaskService to an in-memory broker and measured
+as the Redis transport stores them (the JSON envelope kombu pushes). Claim-
+checked payloads are stored in Redis at REDIS_URL (use --no-claim-check
+without Redis); their compressed size is reported separately.
+
+Example (from the repository root):
+    python -m test.benchmarks.task_payloads --batch-sizes 64 1000 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime
+from typing import Any, Dict, List
+
+SRC_DIR = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir, "backend", "app", "src"
+)
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+FEATURE_COUNT = 32
+
+# Settings per configuration; "before" is the previous default behaviour
+CONFIGS = {
+    "before": {
+        "CELERY_SERIALIZER": "json",
+        "CELERY_COMPRESS_MIN_BYTES": sys.maxsize,
+        "CELERY_CLAIM_CHECK_BYTES": sys.maxsize,
+        "store_all_results": True,
+        "result_ttl": "never",
+    },
+    "after": {"store_all_results": False},
+}
+
+
+def _apply(config: Dict[str, Any], defaults: Dict[str, Any], claim_check: bool):
+    from celery import current_app
+    from core.config import settings
+
+    for name, default in defaults.items():
+        setattr(settings, name, config.get(name, default))
+    if not claim_check:
+        settings.CELERY_CLAIM_CHECK_BYTES = sys.maxsize
+    current_app.conf.task_serializer = settings.CELERY_SERIALIZER
+    current_app.conf.result_serializer = settings.CELERY_SERIALIZER
+
+
+def _published_bytes() -> int:
+    """Drains the in-memory queues; returns the bytes Redis would hold."""
+    from kombu.transport.memory import Channel
+    from kombu.utils.json import dumps
+
+    total = 0
+    for queue in Channel.queues.values():
+        while not queue.empty():
+            total += len(dumps(queue.get()))
+    return total
+
+
+def _result_bytes(task, result: Any, store_all: bool) -> int:
+    from core.config import settings
+    from kombu.serialization import dumps
+
+    if task.ignore_result and not store_all:
+        return 0
+    meta = {
+        "status": "SUCCESS",
+        "result": result,
+        "traceback": None,
+        "children": [],
+        "date_done": datetime.utcnow().isoformat(),
+        "task_id": "0" * 36,
+    }
+    return len(dumps(meta, serializer=settings.CELERY_SERIALIZER)[2])
+
+
+def _claim_bytes() -> int:
+    from tasks import claim_check
+
+    client = claim_check._redis()
+    total = 0
+    for key in client.scan_iter("claim:*"):
+        total += client.strlen(key)
+        client.delete(key)
+    return total
+
+
+def run(batch_sizes: List[int], claim_check: bool) -> List[Dict[str, Any]]:
+    from core.config import settings
+    from services.ml import ml_service
+    from services.task import batch_predict, dispatch_notification, task_service
+    from tasks.worker import celery_app
+
+    # Nothing leaves the process; results are sized, not stored
+    celery_app.conf.broker_url = "memory://"
+    celery_app.conf.result_backend = "cache+memory://"
+    defaults = {
+        name: getattr(settings, name)
+        for name in (
+            "CELERY_SERIALIZER",
+            "CELERY_COMPRESS_MIN_BYTES",
+            "CELERY_CLAIM_CHECK_BYTES",
+        )
+    }
+    rng = random.Random(7)
+    batches = {
+        size: [
+            {"features": [rng.random() for _ in range(FEATURE_COUNT)]}
+            for _ in range(size)
+        ]
+        for size in batch_sizes
+    }
+    notification = {
+        "user_id": "ffffffffffffffffffffffff",
+        "message": "Drowsiness risk high for vehicle KA-01-1234",
+        "type": "in-app",
+    }
+
+    rows = []
+    for config_name, config in CONFIGS.items():
+        _apply(config, defaults, claim_check)
+        store_all = config["store_all_results"]
+        ttl = config.get("result_ttl", f"{settings.CELERY_RESULT_EXPIRES_SEC}s")
+
+        task_service.submit_notification_dispatch(notification)
+        rows.append(
+            {
+                "config": config_name,
+                "task": "dispatch_notification",
+                "broker_bytes": _published_bytes(),
+                "claim_bytes": 0,
+                "result_bytes": _result_bytes(dispatch_notification, None, store_all),
+                "result_ttl": ttl,
+            }
+        )
+        for size, inputs in batches.items():
+            task_service.submit_batch_prediction(inputs)
+            results = ml_service.get_batch_prediction(inputs)
+            rows.append(
+                {
+                    "config": config_name,
+                    "task": f"batch_predict[{size}]",
+                    "broker_bytes": _published_bytes(),
+                    "claim_bytes": _claim_bytes() if claim_check else 0,
+                    "result_bytes": _result_bytes(batch_predict, results, store_all),
+                    "result_ttl": ttl,
+                }
+            )
+    _apply({}, defaults, claim_check=True)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="*", default=[64, 1000])
+    parser.add_argument(
+        "--no-claim-check", action="store_true", help="Run without Redis."
+    )
+    args = parser.parse_args()
+
+    rows = run(args.batch_sizes, claim_check=not args.no_claim_check)
+    print(
+        f"{'config':<8} {'task':<22} {'broker B':>10} {'claim B':>9} "
+        f"{'result B':>10} {'result TTL':>11}"
+    )
+    for row in rows:
+        print(
+            f"{row['config']:<8} {row['task']:<22} {row['broker_bytes']:>10} "
+            f"{row['claim_bytes']:>9} {row['result_bytes']:>10} {row['result_ttl']:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()